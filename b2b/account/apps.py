@@ -7,3 +7,7 @@ class AccountConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "account"
+
+    def ready(self):
+        """Connect the account signal handlers."""
+        from . import signals  # noqa
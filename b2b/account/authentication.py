@@ -0,0 +1,111 @@
+"""Account app authentication."""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_KEY = "account:token:{}"
+
+# User fields kept in the caches, the password hash and the rest are deferred
+CACHED_USER_FIELDS = ("id", "email", "name", "is_active", "is_staff", "is_superuser")
+
+# Process local token cache of token digest -> (expiry, cached credentials)
+_local_tokens: dict = {}
+
+
+def _token_cache_key(key):
+    # Hash the token so raw credentials never end up in cache keys
+    return TOKEN_CACHE_KEY.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def invalidate_tokens(keys):
+    """Drop cached credentials of the given token keys."""
+    cache_keys = [_token_cache_key(key) for key in keys]
+    for cache_key in cache_keys:
+        _local_tokens.pop(cache_key, None)
+    cache.delete_many(cache_keys)
+
+
+def invalidate_user_tokens(user_id):
+    """Drop cached credentials of the user's tokens."""
+    invalidate_tokens(
+        Token.objects.filter(user_id=user_id).values_list("key", flat=True)
+    )
+
+
+def _dump_credentials(user, token):
+    """Return the cached fields of a user and their token."""
+    return {field: getattr(user, field) for field in CACHED_USER_FIELDS}, token.created
+
+
+def _from_db(model, values):
+    """Return a model instance loaded with {attname: value}, deferring the rest."""
+    field_names = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return model.from_db(
+        DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names]
+    )
+
+
+def _load_credentials(key, credentials):
+    """Rebuild a user and token from their cached fields."""
+    user_values, created = credentials
+    # Saving a user with deferred fields only updates the cached ones
+    user = _from_db(get_user_model(), user_values)
+    token = _from_db(Token, {"key": key, "user_id": user.pk, "created": created})
+    token.user = user
+    return user, token
+
+
+def _get_local_credentials(cache_key):
+    entry = _local_tokens.get(cache_key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _set_local_credentials(cache_key, credentials):
+    if len(_local_tokens) >= settings.ACCOUNT_TOKEN_LOCAL_CACHE_SIZE:
+        _local_tokens.clear()
+    _local_tokens[cache_key] = (
+        time.monotonic() + settings.ACCOUNT_TOKEN_LOCAL_CACHE_TIMEOUT,
+        credentials,
+    )
+
+
+def clear_local_tokens():
+    """Empty the process local token cache."""
+    _local_tokens.clear()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication with cached token lookups.
+
+    The ids, names, emails and active, staff and superuser flags of resolved
+    users are kept in a short lived process local cache and in the shared
+    cache, so only requests missing both query the database. Requests get a
+    fresh user rebuilt from those fields, deferring the rest.
+    """
+
+    def authenticate_credentials(self, key):
+        """Return the user and token of the key, from the caches if possible."""
+        cache_key = _token_cache_key(key)
+        credentials = _get_local_credentials(cache_key)
+        if credentials is not None:
+            return _load_credentials(key, credentials)
+
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            credentials = _dump_credentials(*super().authenticate_credentials(key))
+            cache.set(cache_key, credentials, settings.ACCOUNT_TOKEN_CACHE_TIMEOUT)
+
+        _set_local_credentials(cache_key, credentials)
+        return _load_credentials(key, credentials)
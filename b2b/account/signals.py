@@ -0,0 +1,28 @@
+"""Signal handlers for the account app."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_tokens, invalidate_user_tokens
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Stop accepting a deleted token from the caches."""
+    keys = [instance.key]
+    invalidate_tokens(keys)
+    transaction.on_commit(lambda: invalidate_tokens(keys))
+
+
+@receiver(post_save, sender=User)
+def invalidate_tokens_on_user_change(sender, instance, created, **kwargs):
+    """Drop cached credentials once a user is deactivated or otherwise changed."""
+    if created:
+        return
+    user_id = instance.pk
+    invalidate_user_tokens(user_id)
+    transaction.on_commit(lambda: invalidate_user_tokens(user_id))
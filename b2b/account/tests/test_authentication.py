@@ -0,0 +1,126 @@
+import pytest
+from account.authentication import (
+    CachedTokenAuthentication,
+    _token_cache_key,
+    clear_local_tokens,
+)
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+CLIENTS_URL = reverse("feedback:client-list")
+
+
+@pytest.fixture(autouse=True)
+def _clear_local_tokens():
+    """Start every test with an empty process local token cache."""
+    clear_local_tokens()
+    yield
+    clear_local_tokens()
+
+
+@pytest.fixture
+def token(sample_user):
+    """Return a token of the sample user."""
+    return Token.objects.create(user=sample_user)
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    """Tests on cached token authentication."""
+
+    def test_credentials_cached_locally(self, token, sample_user):
+        """Test repeated lookups of a token skip the database."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+
+        with CaptureQueriesContext(connection) as queries:
+            user, cached_token = auth.authenticate_credentials(token.key)
+
+        assert len(queries) == 0
+        assert user == sample_user
+        assert cached_token.key == token.key
+
+    def test_credentials_cached_across_processes(self, token):
+        """Test the shared cache serves lookups missing the local cache."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+        clear_local_tokens()
+
+        with CaptureQueriesContext(connection) as queries:
+            auth.authenticate_credentials(token.key)
+
+        assert len(queries) == 0
+
+    def test_deleted_token_rejected(self, token):
+        """Test deleting a token revokes it immediately."""
+        key = token.key
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(key)
+
+        token.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate_credentials(key)
+
+    def test_deactivated_user_rejected(self, token, sample_user):
+        """Test deactivating a user revokes their cached token."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+
+        sample_user.is_active = False
+        sample_user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate_credentials(token.key)
+
+    def test_password_change_invalidates_cached_user(self, token, sample_user):
+        """Test changing the password drops the cached credentials."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+
+        sample_user.set_password("new_pass123")
+        sample_user.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            user, _ = auth.authenticate_credentials(token.key)
+
+        assert len(queries) == 1
+        assert user.check_password("new_pass123")
+
+    def test_invalid_token_rejected(self):
+        """Test unknown tokens are rejected."""
+        with pytest.raises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate_credentials("invalid")
+
+    def test_requests_authenticated_with_cached_token(self, api_client, token):
+        """Test token requests authenticate through the cached class."""
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        api_client.get(CLIENTS_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(CLIENTS_URL)
+
+        assert not any("authtoken_token" in query["sql"] for query in queries)
+
+    def test_password_hash_not_cached(self, token, sample_user):
+        """Test the caches keep the user's fields without the password hash."""
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+        clear_local_tokens()
+
+        user, _ = auth.authenticate_credentials(token.key)
+
+        assert sample_user.password not in str(cache.get(_token_cache_key(token.key)))
+        assert "password" in user.get_deferred_fields()
+        assert (user.pk, user.email, user.name) == (
+            sample_user.pk,
+            sample_user.email,
+            sample_user.name,
+        )
+        user.save()
+        sample_user.refresh_from_db()
+        assert sample_user.check_password("test_pass123")
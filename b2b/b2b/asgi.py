@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "b2b.settings")
+os.environ.setdefault("FEEDBACK_ASYNC_VIEWS", "True")
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+from core.handlers import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
@@ -57,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "feedback.middleware.RequestMetricsMiddleware",
+    "feedback.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,10 +66,20 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "feedback.middleware.QueryBudgetMiddleware",
+    "feedback.middleware.ServerTimingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Serve the async read endpoints, set when running under ASGI
+FEEDBACK_ASYNC_VIEWS = env.bool("FEEDBACK_ASYNC_VIEWS", default=False)
+
+if FEEDBACK_ASYNC_VIEWS:
+    # Sync only middleware would run the whole ASGI chain in a worker thread,
+    # core.handlers.ASGIHandler serves the static files instead
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
 if DEBUG:
     # Configure django debug toolbar for development
     import socket
@@ -132,6 +144,16 @@ DATABASES = {
     "default": env.db(),
 }
 
+# Read replicas of the default database, as comma separated connection urls
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    DATABASES[f"replica{index}"] = {
+        **env.db_url_config(url),
+        # Tests read the replicas' data from the test database
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["feedback.routers.PrimaryReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -183,12 +205,71 @@ AUTH_USER_MODEL = "account.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
+        "account.authentication.CachedTokenAuthentication",
     ),
 }
 
 REDIS_URL = env("REDIS_URL")
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+}
+
+# Token authentication caching (timeouts in seconds)
+ACCOUNT_TOKEN_CACHE_TIMEOUT = 300
+ACCOUNT_TOKEN_LOCAL_CACHE_TIMEOUT = 5
+ACCOUNT_TOKEN_LOCAL_CACHE_SIZE = 10000
+
+# Feedback role resolution caching (timeouts in seconds)
+FEEDBACK_ROLE_CACHE_TIMEOUT = 300
+FEEDBACK_ROLE_LOCAL_CACHE_TIMEOUT = 5
+FEEDBACK_ROLE_LOCAL_CACHE_SIZE = 10000
+
+# Cached questionnaire detail payloads (in seconds)
+FEEDBACK_QUESTIONNAIRE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Compiled questionnaire schemas kept per process
+FEEDBACK_SCHEMA_CACHE_SIZE = 1024
+
+# Maximum number of responses per bulk submission
+FEEDBACK_BULK_RESPONSE_MAX_ITEMS = 500
+
+# Rows validated and inserted per client import batch, and row errors reported
+FEEDBACK_CLIENT_IMPORT_BATCH_SIZE = 500
+FEEDBACK_CLIENT_IMPORT_MAX_ERRORS = 1000
+
+# Share of requests timed with a Server-Timing header and log line
+FEEDBACK_SERVER_TIMING_SAMPLE_RATE = env.float(
+    "FEEDBACK_SERVER_TIMING_SAMPLE_RATE", default=0.01
+)
+
+# Bearer token required to scrape /metrics, which is not found while unset
+FEEDBACK_METRICS_TOKEN = env("FEEDBACK_METRICS_TOKEN", default="")
+
+# Replicas reads of safe requests and analytics are routed to
+FEEDBACK_REPLICA_DATABASES = [alias for alias in DATABASES if alias != "default"]
+
+# Seconds a client reads from the primary after writing
+FEEDBACK_READ_STICKINESS = 5
+
+# Replicas lagging further behind are skipped (in seconds)
+FEEDBACK_REPLICA_MAX_LAG = 10
+FEEDBACK_REPLICA_CHECK_INTERVAL = 5
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "feedback": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 CELERY_BROKER_URL = REDIS_URL
 CELERY_BEAT_SCHEDULE = {
     "send_reminder_emails": {
@@ -197,8 +278,15 @@ CELERY_BEAT_SCHEDULE = {
     }
 }
 
+# Number of questionnaires processed per reminder batch
+FEEDBACK_REMINDER_CHUNK_SIZE = 500
+
 EMAIL_HOST = env("EMAIL_HOST")
 EMAIL_HOST_USER = env("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 EMAIL_PORT = env("EMAIL_PORT")
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL")
+
+# Bulk email dispatch: parallel SMTP connections and messages sent per connection
+FEEDBACK_EMAIL_CONCURRENCY = 4
+FEEDBACK_EMAIL_MESSAGES_PER_CONNECTION = 100
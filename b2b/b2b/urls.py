@@ -18,10 +18,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
+from feedback.metrics import metrics_view
 
 urlpatterns = [
     path("", TemplateView.as_view(template_name="index.html")),
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("account/", include("account.urls")),
     path("feedback/", include("feedback.urls")),
     path(r"_nested_admin/", include("nested_admin.urls")),
@@ -1,11 +1,39 @@
 """Global project fixtures."""
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
+from b2b.celery import celery
+
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def _local_memory_cache(settings):
+    """Run tests against an isolated local memory cache instead of Redis."""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _primary_database(settings):
+    """Read from the primary, replicas cannot see uncommitted test data."""
+    settings.FEEDBACK_REPLICA_DATABASES = []
+
+
+@pytest.fixture(autouse=True)
+def _eager_celery():
+    """Run celery tasks synchronously in the test process."""
+    celery.conf.update(task_always_eager=True, task_eager_propagates=True)
+    yield
+    celery.conf.update(task_always_eager=False, task_eager_propagates=False)
+
+
 @pytest.fixture
 def api_client():
     """Return API client."""
@@ -0,0 +1,67 @@
+"""ASGI handler serving the project without blocking the event loop."""
+from asgiref.sync import sync_to_async
+from django.core.handlers import asgi
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """Django's ASGI handler, keeping sync work off the event loop.
+
+    WhiteNoise's middleware is sync only, and would have Django run the whole
+    middleware chain in a worker thread, so settings leave it out under ASGI
+    and this handler serves its files instead. Streamed content is read in
+    the request's sync thread, where Django 4.1 iterates it on the event
+    loop and streamed queries such as the response exports fail.
+    """
+
+    def __init__(self):
+        """Load the middleware and the static files."""
+        super().__init__()
+        self.static_files = WhiteNoiseMiddleware()
+
+    async def get_response_async(self, request):
+        """Return the static file at the request's path, or Django's response."""
+        if self.static_files.autorefresh:
+            static_file = await sync_to_async(self.static_files.find_file)(
+                request.path_info
+            )
+        else:
+            static_file = self.static_files.files.get(request.path_info)
+        if static_file is None:
+            return await super().get_response_async(request)
+        return await sync_to_async(self.static_files.serve)(static_file, request)
+
+    async def send_response(self, response, send):
+        """Send a response, reading streamed content in the request's thread."""
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        # Follows Django's send_response, with the streamed parts read through
+        # sync_to_async, which Django 4.2 does for async iterators only
+        response_headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode("ascii")
+            if isinstance(value, str):
+                value = value.encode("latin1")
+            response_headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            response_headers.append(
+                (b"Set-Cookie", cookie.output(header="").encode("ascii").strip())
+            )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": response_headers,
+            }
+        )
+        parts = iter(response)
+        read_part = sync_to_async(next, thread_sensitive=True)
+        while (part := await read_part(parts, None)) is not None:
+            for chunk, _ in self.chunk_bytes(part):
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
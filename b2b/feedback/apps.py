@@ -7,3 +7,7 @@ class FeedbackConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "feedback"
+
+    def ready(self):
+        """Connect the feedback signal handlers."""
+        from . import signals  # noqa
@@ -0,0 +1,88 @@
+"""Async read endpoints of the feedback viewsets for the ASGI stack.
+
+Viewsets list the actions with an async handler (``a`` + action name) in
+``async_actions``. ``as_async_urlpatterns`` swaps their routes for async
+views which run DRF's ``initial`` (authentication, permissions and
+throttling, served from their caches) in a worker thread and query through
+the async ORM and cache APIs. Other methods and actions are handed to the
+sync viewset.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.urls import URLPattern
+
+
+class AsyncReadMixin:
+    """Serve the ``async_actions`` of a viewset with async handlers."""
+
+    async_actions: tuple = ()
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Dispatch to the async handler of the action.
+
+        Follows ``dispatch``, awaiting DRF's own ``initial`` in a worker thread
+        and the handler in place of the sync ones.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def alist(self, request, *args, **kwargs):
+        """List the queryset like ``list``, without blocking."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+def as_async_view(view):
+    """Return an async view of a viewset view serving its async actions."""
+    viewset = view.cls
+    sync_view = sync_to_async(view)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        action = view.actions.get(request.method.lower())
+        if action not in viewset.async_actions:
+            return await sync_view(request, *args, **kwargs)
+
+        self = viewset(**view.initkwargs)
+        self.action_map = view.actions
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        return await self.adispatch(request, *args, **kwargs)
+
+    return async_view
+
+
+def as_async_urlpatterns(urlpatterns):
+    """Return the URL patterns with async views for viewsets' async actions."""
+    patterns = []
+    for pattern in urlpatterns:
+        actions = getattr(pattern.callback, "actions", {})
+        async_actions = getattr(
+            getattr(pattern.callback, "cls", None), "async_actions", ()
+        )
+        if set(actions.values()).intersection(async_actions):
+            pattern = URLPattern(
+                pattern.pattern,
+                as_async_view(pattern.callback),
+                pattern.default_args,
+                pattern.name,
+            )
+        patterns.append(pattern)
+    return patterns
@@ -0,0 +1,5 @@
+"""Endpoint benchmarks for the feedback and account apps.
+
+Run them with ``python manage.py benchmark``, which seeds a throwaway test
+database and writes latency percentiles and query counts as JSON.
+"""
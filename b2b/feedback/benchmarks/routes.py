@@ -0,0 +1,207 @@
+"""Benchmarked routes of the feedback and account apps, and tasks."""
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from feedback.tasks import send_reminder_emails
+
+# {benchmark name: function(client, dataset) returning a response or None}
+BENCHMARKS = {}
+
+IMPORT_ROWS = 100
+
+
+def benchmark(name):
+    """Register a benchmark named ``<url name>:<method>`` or ``task:<name>``."""
+
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def _consume(response):
+    """Read the whole body of a (streaming) response."""
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def _manager(dataset):
+    return {"HTTP_AUTHORIZATION": dataset.sales_manager_auth}
+
+
+def _client_rep(dataset):
+    return {"HTTP_AUTHORIZATION": dataset.client_rep_auth}
+
+
+@benchmark("api-root:get")
+def api_root(client, dataset):
+    """List the feedback API routes."""
+    return client.get(reverse("feedback:api-root"), **_manager(dataset))
+
+
+@benchmark("login:post")
+def login(client, dataset):
+    """Obtain a token with an email and password."""
+    return client.post(
+        reverse("account:login"),
+        {"email": dataset.sales_manager.email, "password": dataset.password},
+    )
+
+
+@benchmark("client-list:get")
+def client_list(client, dataset):
+    """List the sales manager's clients."""
+    return client.get(reverse("feedback:client-list"), **_manager(dataset))
+
+
+@benchmark("client-list:post")
+def client_create(client, dataset):
+    """Create a client."""
+    return client.post(
+        reverse("feedback:client-list"),
+        {"email": "new@bench.example.com", "name": "New client"},
+        format="json",
+        **_manager(dataset),
+    )
+
+
+@benchmark("client-detail:delete")
+def client_delete(client, dataset):
+    """Delete one of the sales manager's clients."""
+    url = reverse("feedback:client-detail", args=[next(dataset.deletable_client_ids)])
+    return client.delete(url, **_manager(dataset))
+
+
+@benchmark("client-import:post")
+def client_import(client, dataset):
+    """Import a CSV of clients."""
+    rows = "".join(
+        f"import{i}@bench.example.com,Imported {i},{dataset.client_rep.email}\n"
+        for i in range(IMPORT_ROWS)
+    )
+    upload = SimpleUploadedFile(
+        "clients.csv", f"email,name,client_rep\n{rows}".encode(), "text/csv"
+    )
+    return client.post(
+        reverse("feedback:client-import"),
+        {"file": upload},
+        format="multipart",
+        **_manager(dataset),
+    )
+
+
+@benchmark("questionnaire-list:get")
+def questionnaire_list(client, dataset):
+    """List the sales manager's questionnaires."""
+    return client.get(
+        reverse("feedback:questionnaire-list"),
+        {"sales_manager": 1},
+        **_manager(dataset),
+    )
+
+
+@benchmark("questionnaire-list:post")
+def questionnaire_create(client, dataset):
+    """Create a questionnaire with ten questions."""
+    payload = {
+        "title": "Benchmark questionnaire",
+        "description": "Created by the benchmark",
+        "due_at": "2030-01-01T00:00:00Z",
+        "client_rep": dataset.client_rep.id,
+        "questions": [
+            {
+                "question_type": "MULTIPLE_CHOICE",
+                "question_text": f"Question {order}?",
+                "order": order,
+                "choices": [
+                    {"value": f"Option {choice}", "order": choice}
+                    for choice in range(3)
+                ],
+            }
+            for order in range(10)
+        ],
+    }
+    return client.post(
+        reverse("feedback:questionnaire-list"),
+        payload,
+        format="json",
+        **_manager(dataset),
+    )
+
+
+@benchmark("questionnaire-detail:get")
+def questionnaire_detail(client, dataset):
+    """Retrieve a questionnaire with its questions."""
+    url = reverse("feedback:questionnaire-detail", args=[dataset.questionnaire_id])
+    return client.get(url, **_manager(dataset))
+
+
+@benchmark("questionnaire-results:get")
+def questionnaire_results(client, dataset):
+    """Aggregate the results of a questionnaire."""
+    url = reverse("feedback:questionnaire-results", args=[dataset.questionnaire_id])
+    return client.get(url, **_manager(dataset))
+
+
+@benchmark("questionnaire-responses-list:get")
+def response_list(client, dataset):
+    """List a page of a questionnaire's responses."""
+    url = reverse(
+        "feedback:questionnaire-responses-list", args=[dataset.questionnaire_id]
+    )
+    return client.get(url, {"page_size": 20}, **_manager(dataset))
+
+
+@benchmark("questionnaire-responses-list:post")
+def response_create(client, dataset):
+    """Submit a response to every question."""
+    url = reverse(
+        "feedback:questionnaire-responses-list", args=[dataset.questionnaire_id]
+    )
+    return client.post(
+        url, dataset.response_payload, format="json", **_client_rep(dataset)
+    )
+
+
+@benchmark("questionnaire-responses-bulk:post")
+def response_bulk(client, dataset):
+    """Submit ten responses at once."""
+    url = reverse(
+        "feedback:questionnaire-responses-bulk", args=[dataset.questionnaire_id]
+    )
+    return client.post(
+        url, [dataset.response_payload] * 10, format="json", **_client_rep(dataset)
+    )
+
+
+@benchmark("questionnaire-responses-export:get")
+def response_export(client, dataset):
+    """Export every response of a questionnaire as NDJSON."""
+    url = reverse(
+        "feedback:questionnaire-responses-export", args=[dataset.questionnaire_id]
+    )
+    return _consume(client.get(url, {"format": "ndjson"}, **_manager(dataset)))
+
+
+@benchmark("monthly-feedback-list:get")
+def monthly_feedback_list(client, dataset):
+    """List the monthly feedback of the sales manager's client reps."""
+    return client.get(reverse("feedback:monthly-feedback-list"), **_manager(dataset))
+
+
+@benchmark("monthly-feedback-list:post")
+def monthly_feedback_create(client, dataset):
+    """Submit monthly feedback."""
+    return client.post(
+        reverse("feedback:monthly-feedback-list"),
+        {"feedback": "Benchmark feedback"},
+        format="json",
+        **_client_rep(dataset),
+    )
+
+
+@benchmark("task:send_reminder_emails")
+def reminder_emails(client, dataset):
+    """Send the daily questionnaire reminders."""
+    send_reminder_emails()
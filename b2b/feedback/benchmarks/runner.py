@@ -0,0 +1,90 @@
+"""Measure benchmark latency and queries, and compare runs with a baseline."""
+import math
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .routes import BENCHMARKS
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class BenchmarkError(Exception):
+    """A benchmarked request failed."""
+
+
+def percentile(timings, percent):
+    """Return the nearest rank percentile of sorted timings."""
+    rank = math.ceil(percent / 100 * len(timings))
+    return timings[max(rank, 1) - 1]
+
+
+def _call(func, client, dataset):
+    response = func(client, dataset)
+    if response is not None and response.status_code >= 400:
+        raise BenchmarkError(f"{func.__name__} returned {response.status_code}")
+
+
+def run_benchmark(func, dataset, iterations, warmup):
+    """Return latency percentiles (in ms) and the query count of a benchmark."""
+    client = APIClient()
+    for _ in range(warmup):
+        _call(func, client, dataset)
+
+    # Count queries apart from the timed runs so query logging does not skew them
+    with CaptureQueriesContext(connection) as queries:
+        _call(func, client, dataset)
+    # Read the count now, as later requests reset the connection's query log
+    query_count = len(queries)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _call(func, client, dataset)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    result = {f"p{percent}": percentile(timings, percent) for percent in PERCENTILES}
+    result.update(
+        mean=sum(timings) / len(timings),
+        max=timings[-1],
+        queries=query_count,
+        iterations=iterations,
+    )
+    return {
+        key: round(value, 3) if isinstance(value, float) else value
+        for key, value in result.items()
+    }
+
+
+def run_benchmarks(dataset, iterations, warmup=3, names=None):
+    """Run the named (or all) benchmarks and return their results by name."""
+    return {
+        name: run_benchmark(func, dataset, iterations, warmup)
+        for name, func in BENCHMARKS.items()
+        if names is None or name in names
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return descriptions of results slower or chattier than the baseline.
+
+    A benchmark regresses when its p95 latency grows by more than tolerance
+    (a fraction of the baseline) or when it runs more queries.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result["p95"] > previous["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95']}ms > baseline {previous['p95']}ms"
+            )
+        if result["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries > baseline {previous['queries']}"
+            )
+    return regressions
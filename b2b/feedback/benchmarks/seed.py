@@ -0,0 +1,273 @@
+"""Bulk seeding of benchmark data at realistic volumes."""
+from datetime import timedelta
+from io import StringIO
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from feedback.models import (
+    CLIENT_REP_GROUP,
+    SALES_MANAGER_GROUP,
+    Answer,
+    AnswerChoice,
+    Client,
+    MonthlyFeedback,
+    Question,
+    QuestionChoice,
+    Questionnaire,
+    Response,
+)
+from feedback.utils import chunked
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+PASSWORD = "benchmark-pass123"
+QUESTION_TYPES = ("OPEN", "LOGICAL", "MULTIPLE_CHOICE", "DROPDOWN")
+
+
+class Scale(NamedTuple):
+    """Volumes of seeded benchmark data."""
+
+    clients: int
+    questionnaires: int
+    questions: int
+    answers: int
+    sales_managers: int
+    client_reps: int
+    months: int
+    deletable_clients: int
+
+
+SCALES = {
+    "full": Scale(10_000, 1_000, 50, 1_000_000, 20, 200, 24, 1_000),
+    "small": Scale(1_000, 100, 20, 20_000, 5, 20, 12, 200),
+    "tiny": Scale(20, 4, 4, 32, 2, 2, 2, 20),
+}
+
+
+class Dataset:
+    """The seeded objects benchmarks send requests about."""
+
+    def __init__(self, sales_manager, client_rep, questionnaire_id, deletable_ids):
+        """Store the benchmark users, questionnaire and deletable clients."""
+        self.sales_manager = sales_manager
+        self.client_rep = client_rep
+        self.password = PASSWORD
+        self.questionnaire_id = questionnaire_id
+        self.deletable_client_ids = iter(deletable_ids)
+        self.sales_manager_auth = ""
+        self.client_rep_auth = ""
+        self.response_payload = {}
+
+
+def _bulk_create(model, objs):
+    """Insert objs in batches and return the created objects."""
+    created = []
+    for batch in chunked(objs, BATCH_SIZE):
+        created.extend(model.objects.bulk_create(batch))
+    return created
+
+
+def _seed_users(scale):
+    password = make_password(PASSWORD)
+    users = _bulk_create(
+        User,
+        (
+            User(
+                email=f"{role}{i}@bench.example.com",
+                name=f"{role} {i}",
+                password=password,
+            )
+            for role, count in (
+                ("manager", scale.sales_managers),
+                ("rep", scale.client_reps),
+            )
+            for i in range(count)
+        ),
+    )
+    manager_count = scale.sales_managers
+    managers, reps = users[:manager_count], users[manager_count:]
+    memberships = User.groups.through
+    for group_name, members in (
+        (SALES_MANAGER_GROUP, managers),
+        (CLIENT_REP_GROUP, reps),
+    ):
+        group, _ = Group.objects.get_or_create(name=group_name)
+        _bulk_create(
+            memberships,
+            (memberships(user_id=user.id, group_id=group.id) for user in members),
+        )
+    return managers, reps
+
+
+def _seed_questionnaires(scale, managers, reps):
+    now = timezone.now()
+    questionnaires = _bulk_create(
+        Questionnaire,
+        (
+            Questionnaire(
+                title=f"Questionnaire {i}",
+                description="Benchmark questionnaire " * 20,
+                author=managers[i % len(managers)],
+                client_rep=reps[i % len(reps)],
+                is_active=i % 5 != 0,
+                due_at=now + timedelta(days=i % 30 - 10, hours=1),
+            )
+            for i in range(scale.questionnaires)
+        ),
+    )
+    questions = _bulk_create(
+        Question,
+        (
+            Question(
+                questionnaire=questionnaire,
+                question_type=QUESTION_TYPES[order % len(QUESTION_TYPES)],
+                question_text=f"Question {order}?",
+                required=order == 0,
+                order=order,
+            )
+            for questionnaire in questionnaires
+            for order in range(scale.questions)
+        ),
+    )
+    choices = _bulk_create(
+        QuestionChoice,
+        (
+            QuestionChoice(question=question, value=value, order=order)
+            for question in questions
+            if question.question_type != "OPEN"
+            for order, value in enumerate(
+                ("True", "False")
+                if question.question_type == "LOGICAL"
+                else ("Option 1", "Option 2", "Option 3")
+            )
+        ),
+    )
+
+    # {questionnaire id: [(question id, question type, [choice ids])]}
+    choice_ids = {}
+    for choice in choices:
+        choice_ids.setdefault(choice.question_id, []).append(choice.id)
+    schema = {}
+    for question in questions:
+        schema.setdefault(question.questionnaire_id, []).append(
+            (question.id, question.question_type, choice_ids.get(question.id, []))
+        )
+    return questionnaires, schema
+
+
+def _seed_responses(scale, questionnaires, schema):
+    response_count = scale.answers // scale.questions
+    for batch in chunked(range(response_count), BATCH_SIZE // scale.questions or 1):
+        responses = Response.objects.bulk_create(
+            Response(
+                questionnaire_id=questionnaires[i % len(questionnaires)].id,
+                respondent_id=questionnaires[i % len(questionnaires)].client_rep_id,
+            )
+            for i in batch
+        )
+        answer_choices = []
+        answers = []
+        for i, response in zip(batch, responses):
+            for question_id, question_type, choice_ids in schema[
+                response.questionnaire_id
+            ]:
+                answers.append(
+                    Answer(
+                        response=response,
+                        question_id=question_id,
+                        answer_text="Benchmark answer"
+                        if question_type == "OPEN"
+                        else "",
+                    )
+                )
+                answer_choices.append(
+                    choice_ids[i % len(choice_ids)] if choice_ids else None
+                )
+        answers = _bulk_create(Answer, answers)
+        _bulk_create(
+            AnswerChoice,
+            (
+                AnswerChoice(answer=answer, question_choice_id=choice_id)
+                for answer, choice_id in zip(answers, answer_choices)
+                if choice_id is not None
+            ),
+        )
+
+
+def seed(scale):
+    """Seed benchmark data at the given scale and return its dataset."""
+    managers, reps = _seed_users(scale)
+    _bulk_create(
+        Client,
+        (
+            Client(
+                email=f"client{i}@bench.example.com",
+                name=f"Client {i}",
+                client_rep=reps[i % len(reps)],
+                sales_manager=managers[i % len(managers)],
+            )
+            for i in range(scale.clients)
+        ),
+    )
+    deletable = _bulk_create(
+        Client,
+        (
+            Client(
+                email=f"deletable{i}@bench.example.com",
+                name=f"Deletable {i}",
+                sales_manager=managers[0],
+            )
+            for i in range(scale.deletable_clients)
+        ),
+    )
+    questionnaires, schema = _seed_questionnaires(scale, managers, reps)
+    _seed_responses(scale, questionnaires, schema)
+    _bulk_create(
+        MonthlyFeedback,
+        (
+            MonthlyFeedback(
+                client_rep=rep,
+                month=f"{2020 + month // 12}-{month % 12 + 1:02d}",
+                feedback="Benchmark feedback " * 50,
+            )
+            for rep in reps
+            for month in range(scale.months)
+        ),
+    )
+
+    call_command("rebuild_result_counters", stdout=StringIO())
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    dataset = Dataset(
+        managers[0], reps[0], questionnaires[0].id, [client.id for client in deletable]
+    )
+    dataset.sales_manager_auth = f"Token {Token.objects.create(user=managers[0])}"
+    dataset.client_rep_auth = f"Token {Token.objects.create(user=reps[0])}"
+    dataset.response_payload = _response_payload(dataset.questionnaire_id)
+    return dataset
+
+
+def _response_payload(questionnaire_id):
+    """Return a response answering every question of the questionnaire."""
+    answers = []
+    for question in Question.objects.filter(
+        questionnaire_id=questionnaire_id
+    ).prefetch_related("choices"):
+        choices = [choice.id for choice in question.choices.all()][:1]
+        answers.append(
+            {
+                "question_id": question.id,
+                "answer_text": "Benchmark answer" if not choices else "",
+                "choices": [{"question_choice_id": choice} for choice in choices],
+            }
+        )
+    return {"answers": answers}
@@ -0,0 +1,231 @@
+"""Load test the read endpoints under the gunicorn (WSGI) and uvicorn (ASGI) stacks.
+
+Servers are started as subprocesses against the benchmark database and
+loaded by a small asyncio HTTP/1.1 client keeping ``concurrency`` requests in
+flight, reconnecting whenever a server closes the connection as gunicorn's
+sync workers do after every response.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.urls import reverse
+
+from .runner import PERCENTILES, BenchmarkError, percentile
+
+HOST = "127.0.0.1"
+
+# {server name: (command line, extra environment)}
+SERVERS = {
+    "gunicorn": (
+        [
+            "-m",
+            "gunicorn",
+            "b2b.wsgi:application",
+            "--bind",
+            "{host}:{port}",
+            "--workers",
+            "{workers}",
+            "--log-level",
+            "warning",
+        ],
+        {"FEEDBACK_ASYNC_VIEWS": "False"},
+    ),
+    "uvicorn": (
+        [
+            "-m",
+            "uvicorn",
+            "b2b.asgi:application",
+            "--host",
+            "{host}",
+            "--port",
+            "{port}",
+            "--workers",
+            "{workers}",
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        {"FEEDBACK_ASYNC_VIEWS": "True"},
+    ),
+}
+
+
+def get_endpoints(dataset):
+    """Return the {name: (path, authorization)} of the async read endpoints."""
+    questionnaire_id = dataset.questionnaire_id
+    return {
+        "questionnaire-list:get": (
+            reverse("feedback:questionnaire-list") + "?client_rep=1",
+            dataset.client_rep_auth,
+        ),
+        "questionnaire-detail:get": (
+            reverse("feedback:questionnaire-detail", args=[questionnaire_id]),
+            dataset.client_rep_auth,
+        ),
+        "questionnaire-responses-list:get": (
+            reverse("feedback:questionnaire-responses-list", args=[questionnaire_id]),
+            dataset.sales_manager_auth,
+        ),
+        "monthly-feedback-list:get": (
+            reverse("feedback:monthly-feedback-list"),
+            dataset.sales_manager_auth,
+        ),
+    }
+
+
+def get_database_url(database_url, name):
+    """Return the database URL pointing at the named database."""
+    return urlsplit(database_url)._replace(path=f"/{name}").geturl()
+
+
+def get_free_port():
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, workers, env, cwd, timeout=30):
+    """Start a server, returning its process and port once it accepts requests."""
+    args, server_env = SERVERS[name]
+    port = get_free_port()
+    command = [sys.executable] + [
+        arg.format(host=HOST, port=port, workers=workers) for arg in args
+    ]
+    process = subprocess.Popen(command, cwd=cwd, env={**env, **server_env})
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise BenchmarkError(f"{name} exited with {process.returncode}")
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    stop_server(process)
+    raise BenchmarkError(f"{name} did not start within {timeout}s")
+
+
+def stop_server(process):
+    """Stop a server process."""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def _read_body(reader, headers):
+    """Read a response body delimited by its length or chunked encoding."""
+    if headers.get(b"transfer-encoding") == b"chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                return
+    await reader.readexactly(int(headers.get(b"content-length", 0)))
+
+
+async def _request(connection, port, request):
+    """Send a request, reusing the connection while the server keeps it alive."""
+    if connection is None:
+        connection = await asyncio.open_connection(HOST, port)
+    reader, writer = connection
+    writer.write(request)
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.split(b"\r\n")
+    headers = {}
+    for line in header_lines:
+        if line:
+            key, _, value = line.partition(b":")
+            headers[key.strip().lower()] = value.strip()
+    await _read_body(reader, headers)
+
+    if headers.get(b"connection", b"").lower() == b"close":
+        writer.close()
+        connection = None
+    return connection, int(status_line.split()[1])
+
+
+async def _load(port, request, concurrency, duration):
+    """Keep concurrency requests in flight, returning latencies and errors."""
+    latencies = []
+    # Failed requests by status, None for connection errors
+    errors = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        connection = None
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                connection, status = await _request(connection, port, request)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                connection, status = None, None
+            if status == 200:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors[status] += 1
+        if connection is not None:
+            connection[1].close()
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def run_load(port, path, authorization, concurrency, duration):
+    """Return the throughput and latency percentiles (in ms) of a load run."""
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {HOST}:{port}\r\n"
+        f"Authorization: {authorization}\r\nAccept: application/json\r\n\r\n"
+    ).encode()
+    latencies, errors = asyncio.run(_load(port, request, concurrency, duration))
+    if not latencies:
+        raise BenchmarkError(f"No successful requests to {path}: {dict(errors)}")
+    latencies.sort()
+
+    result = {f"p{percent}": percentile(latencies, percent) for percent in PERCENTILES}
+    result.update(
+        requests=len(latencies),
+        errors=sum(errors.values()),
+        throughput=len(latencies) / duration,
+        max=latencies[-1],
+    )
+    return {
+        key: round(value, 3) if isinstance(value, float) else value
+        for key, value in result.items()
+    }
+
+
+def run_servers(dataset, database_name, workers, concurrency, duration, warmup):
+    """Load every async read endpoint under each server, returning the results."""
+    env = {**os.environ}
+    env["DATABASE_URL"] = get_database_url(env["DATABASE_URL"], database_name)
+    env["ALLOWED_HOSTS"] = ",".join(filter(None, [env.get("ALLOWED_HOSTS"), HOST]))
+    cwd = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    endpoints = get_endpoints(dataset)
+
+    results = {}
+    for name in SERVERS:
+        process, port = start_server(name, workers, env, cwd)
+        try:
+            results[name] = {}
+            for endpoint, (path, authorization) in endpoints.items():
+                if warmup:
+                    run_load(port, path, authorization, concurrency, warmup)
+                results[name][endpoint] = run_load(
+                    port, path, authorization, concurrency, duration
+                )
+        finally:
+            stop_server(process)
+    return results
@@ -0,0 +1,42 @@
+"""Declarative per action query budgets for the feedback viewsets.
+
+Viewsets declare ``query_budgets = {action: max queries}``. Budgets cover a
+whole request with cold caches, token authentication included. Tests check
+them with ``assert_query_budget`` and ``QueryBudgetMiddleware`` logs
+requests exceeding them in production.
+"""
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def get_query_budget(viewset, action):
+    """Return the query budget of a viewset action, or None if it has none."""
+    return getattr(viewset, "query_budgets", {}).get(action)
+
+
+def get_view_query_budget(view_func, method):
+    """Return the ("Viewset.action", budget) of a resolved view and method."""
+    viewset = getattr(view_func, "cls", None)
+    actions = getattr(view_func, "actions", None)
+    if viewset is None or not actions:
+        return None, None
+    action = actions.get(method.lower())
+    if action is None:
+        return None, None
+    return f"{viewset.__name__}.{action}", get_query_budget(viewset, action)
+
+
+@contextmanager
+def assert_query_budget(viewset, action):
+    """Fail if the wrapped block runs more queries than the action's budget."""
+    budget = get_query_budget(viewset, action)
+    assert budget is not None, f"{viewset.__name__}.{action} has no query budget"
+    with CaptureQueriesContext(connection) as queries:
+        yield queries
+    count = len(queries)
+    assert count <= budget, (
+        f"{viewset.__name__}.{action} ran {count} queries over its budget "
+        f"of {budget}:\n" + "\n".join(query["sql"] for query in queries)
+    )
@@ -0,0 +1,79 @@
+"""Cached questionnaire payloads for the feedback app.
+
+Every questionnaire has a random version in the cache which is replaced
+whenever the questionnaire, its questions or its choices change. Cached
+payloads and ETags are keyed by that version, so bumping it invalidates them.
+Versions expire like the payloads, so ids of deleted or never existing
+questionnaires do not pile up in the cache.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+QUESTIONNAIRE_VERSION_KEY = "feedback:questionnaire:{}:version"
+QUESTIONNAIRE_DETAIL_KEY = "feedback:questionnaire:{}:{}:detail:{}"
+
+
+def get_questionnaire_version(questionnaire_id, create=True):
+    """Return the current version of the questionnaire.
+
+    Without ``create``, return None instead of starting a missing version.
+    """
+    key = QUESTIONNAIRE_VERSION_KEY.format(questionnaire_id)
+    version = cache.get(key)
+    if version is None and create:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, settings.FEEDBACK_QUESTIONNAIRE_CACHE_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_questionnaire_version(questionnaire_id):
+    """Give the questionnaire a new version."""
+    key = QUESTIONNAIRE_VERSION_KEY.format(questionnaire_id)
+    cache.set(key, uuid.uuid4().hex, settings.FEEDBACK_QUESTIONNAIRE_CACHE_TIMEOUT)
+
+
+def get_questionnaire_etag(questionnaire_id, version, variant=""):
+    """Return the strong ETag of a questionnaire version and field variant."""
+    if variant:
+        return f'"{questionnaire_id}-{version}-{variant}"'
+    return f'"{questionnaire_id}-{version}"'
+
+
+def get_cached_questionnaire(questionnaire_id, version, variant=""):
+    """Return the cached payload of a questionnaire version, if any."""
+    key = QUESTIONNAIRE_DETAIL_KEY.format(questionnaire_id, version, variant)
+    return cache.get(key)
+
+
+def cache_questionnaire(questionnaire_id, version, variant, data, timeout):
+    """Cache the payload of a questionnaire version and field variant."""
+    key = QUESTIONNAIRE_DETAIL_KEY.format(questionnaire_id, version, variant)
+    cache.set(key, data, timeout)
+
+
+async def aget_questionnaire_version(questionnaire_id):
+    """Return the current version of the questionnaire, without blocking."""
+    key = QUESTIONNAIRE_VERSION_KEY.format(questionnaire_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(
+            key, version, settings.FEEDBACK_QUESTIONNAIRE_CACHE_TIMEOUT
+        ):
+            version = await cache.aget(key, version)
+    return version
+
+
+async def aget_cached_questionnaire(questionnaire_id, version, variant=""):
+    """Return the cached payload of a questionnaire version, without blocking."""
+    key = QUESTIONNAIRE_DETAIL_KEY.format(questionnaire_id, version, variant)
+    return await cache.aget(key)
+
+
+async def acache_questionnaire(questionnaire_id, version, variant, data, timeout):
+    """Cache the payload of a questionnaire version, without blocking."""
+    key = QUESTIONNAIRE_DETAIL_KEY.format(questionnaire_id, version, variant)
+    await cache.aset(key, data, timeout)
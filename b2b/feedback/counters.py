@@ -0,0 +1,178 @@
+"""Denormalized result counters for the feedback app.
+
+Questionnaires count their responses, questions the responses answering them
+and question choices the answers choosing them. The counters are incremented
+in the same transaction as the responses are created, and the counters of a
+questionnaire losing responses or choices are recounted once the deletion
+commits. Answers and answer choices deleted on their own, like writes
+bypassing the ORM, are only caught by the ``rebuild_result_counters`` command.
+"""
+import threading
+from collections import Counter
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Question, QuestionChoice, Questionnaire
+
+# Answers with text or at least one chosen choice count as answered
+ANSWERED = Q(choices__isnull=False) | ~Q(answer_text="") & ~Q(answer_text=None)
+
+
+def _increment(model, field, counts):
+    """Add counts of {pk: count} to the field of model rows in one UPDATE."""
+    if not counts:
+        return
+    model.objects.filter(pk__in=counts).update(
+        **{
+            field: F(field)
+            + Case(
+                *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+                default=Value(0),
+            )
+        }
+    )
+
+
+def increment_result_counters(responses, answers, answer_choices):
+    """Count newly created responses, answers and answer choices."""
+    chosen_answer_ids = {choice.answer_id for choice in answer_choices}
+    answered = {
+        (answer.response_id, answer.question_id)
+        for answer in answers
+        if answer.answer_text or answer.id in chosen_answer_ids
+    }
+
+    _increment(
+        Questionnaire,
+        "response_count",
+        Counter(response.questionnaire_id for response in responses),
+    )
+    _increment(
+        Question,
+        "answered_count",
+        Counter(question_id for _, question_id in answered),
+    )
+    _increment(
+        QuestionChoice,
+        "answer_count",
+        Counter(choice.question_choice_id for choice in answer_choices),
+    )
+
+
+def _count(queryset, group_field, count_field="pk", distinct=False):
+    """Return a subquery counting queryset rows grouped by group_field."""
+    counts = (
+        queryset.values(group_field)
+        .annotate(count=Count(count_field, distinct=distinct))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def get_result_counters(apps=global_apps):
+    """Return (model, counter field, actual count expression) triples.
+
+    Models are looked up in ``apps``, so migrations can pass their own.
+    """
+    Answer = apps.get_model("feedback", "Answer")
+    AnswerChoice = apps.get_model("feedback", "AnswerChoice")
+    Question = apps.get_model("feedback", "Question")
+    QuestionChoice = apps.get_model("feedback", "QuestionChoice")
+    Questionnaire = apps.get_model("feedback", "Questionnaire")
+    Response = apps.get_model("feedback", "Response")
+    return [
+        (
+            Questionnaire,
+            "response_count",
+            _count(
+                Response.objects.filter(questionnaire=OuterRef("pk")),
+                "questionnaire",
+            ),
+        ),
+        (
+            Question,
+            "answered_count",
+            _count(
+                Answer.objects.filter(ANSWERED, question=OuterRef("pk")),
+                "question",
+                count_field="response_id",
+                distinct=True,
+            ),
+        ),
+        (
+            QuestionChoice,
+            "answer_count",
+            _count(
+                AnswerChoice.objects.filter(question_choice=OuterRef("pk")),
+                "question_choice",
+            ),
+        ),
+    ]
+
+
+def get_drifted_counters(model, field, actual):
+    """Return the model rows whose counter differs from its actual count."""
+    return model.objects.annotate(actual=actual).exclude(**{field: F("actual")})
+
+
+def rebuild_result_counters(apps=global_apps, pks=None):
+    """Recount drifted counters, returning (model, field, rebuilt) triples.
+
+    ``pks`` of {model: ids} limits the recount to those rows.
+    """
+    rebuilt = []
+    for model, field, actual in get_result_counters(apps):
+        drifted = get_drifted_counters(model, field, actual)
+        if pks is not None:
+            drifted = drifted.filter(pk__in=pks.get(model._meta.model_name, ()))
+        count = model.objects.filter(pk__in=drifted.values("pk")).update(
+            **{field: actual}
+        )
+        rebuilt.append((model, field, count))
+    return rebuilt
+
+
+# Ids of the questionnaires whose responses the thread deleted, recounted on commit
+_recount = threading.local()
+
+
+def _recount_deleted():
+    """Recount the counters of the questionnaires with committed deletions."""
+    questionnaire_ids = getattr(_recount, "questionnaire_ids", None)
+    _recount.questionnaire_ids = None
+    if not questionnaire_ids:
+        return
+    rebuild_result_counters(
+        pks={
+            "questionnaire": questionnaire_ids,
+            "question": Question.objects.filter(
+                questionnaire__in=questionnaire_ids
+            ).values("pk"),
+            "questionchoice": QuestionChoice.objects.filter(
+                question__questionnaire__in=questionnaire_ids
+            ).values("pk"),
+        }
+    )
+
+
+def _is_recount_pending(connection):
+    """Return whether the recount is still registered to run on commit."""
+    return any(entry[1] is _recount_deleted for entry in connection.run_on_commit)
+
+
+def recount_on_commit(questionnaire_id):
+    """Recount a questionnaire's counters once the current deletion commits.
+
+    The recount is registered once per transaction and covers every
+    questionnaire deleted from until it commits. Ids left over by a rolled
+    back transaction are recounted with the next deletion, which is harmless.
+    """
+    connection = transaction.get_connection()
+    if getattr(_recount, "questionnaire_ids", None) is None:
+        _recount.questionnaire_ids = set()
+    _recount.questionnaire_ids.add(questionnaire_id)
+    if not connection.in_atomic_block or not _is_recount_pending(connection):
+        transaction.on_commit(_recount_deleted)
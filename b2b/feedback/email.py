@@ -1,6 +1,17 @@
 """Email classes for the feedback app."""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import get_connection
 from templated_mail.mail import BaseEmailMessage
 
+from .metrics import record_email
+from .utils import chunked
+
+logger = logging.getLogger(__name__)
+
 
 class QuestionnaireReminderEmail(BaseEmailMessage):
     """Email for questionnaire is due reminders."""
@@ -24,11 +35,14 @@ class ResponseAlertEmail(BaseEmailMessage):
 
     template_name = "email/response_alert.html"
 
-    def __init__(self, questionnaire_title, recipient, respondent, **kwargs):
+    def __init__(
+        self, questionnaire_title, recipient, respondent, response_count=1, **kwargs
+    ):
         """Get email information."""
         self.questionnaire_title = questionnaire_title
         self.recipient = recipient
         self.respondent = respondent
+        self.response_count = response_count
         super().__init__(**kwargs)
 
     def get_context_data(self):
@@ -37,4 +51,89 @@ class ResponseAlertEmail(BaseEmailMessage):
             "questionnaire_title": self.questionnaire_title,
             "recipient": self.recipient,
             "respondent": self.respondent,
+            "response_count": self.response_count,
         }
+
+
+class BulkEmailDispatcher:
+    """Send templated emails over a small pool of reused SMTP connections.
+
+    Each worker thread renders its batch of messages and sends them over its
+    own connection, which is reopened after ``messages_per_connection``
+    messages or after a failure.
+    """
+
+    def __init__(self, concurrency=None, messages_per_connection=None):
+        """Get the pool configuration, defaulting to the project settings."""
+        self.concurrency = concurrency or settings.FEEDBACK_EMAIL_CONCURRENCY
+        self.messages_per_connection = (
+            messages_per_connection or settings.FEEDBACK_EMAIL_MESSAGES_PER_CONNECTION
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _get_connection(self):
+        """Return the current thread's connection, reopening it when used up."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.sent >= self.messages_per_connection:
+            self._close_connection()
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self._local.connection = connection
+            self._local.sent = 0
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _close_connection(self):
+        """Close the current thread's connection if it has one."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        self._local.connection = None
+        with self._lock:
+            self._connections.remove(connection)
+        try:
+            connection.close()
+        except Exception:
+            logger.exception("Failed to close email connection")
+
+    def _send_batch(self, batch):
+        """Render and send a batch of messages, returning (sent, failed)."""
+        sent = failed = 0
+        for message, to in batch:
+            try:
+                message.render()
+                message.to = to
+                message.from_email = settings.DEFAULT_FROM_EMAIL
+                self._get_connection().send_messages([message])
+            except Exception:
+                logger.exception("Failed to send email to %s", to)
+                record_email(message, "failed")
+                self._close_connection()
+                failed += 1
+            else:
+                record_email(message, "sent")
+                self._local.sent += 1
+                sent += 1
+        return sent, failed
+
+    def send(self, messages):
+        """Send (message, recipients) pairs and return (sent, failed) counts."""
+        sent = failed = 0
+        batches = chunked(messages, self.messages_per_connection)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            # Only keep a bounded number of batches in flight at a time
+            for window in chunked(batches, self.concurrency):
+                for batch_sent, batch_failed in executor.map(self._send_batch, window):
+                    sent += batch_sent
+                    failed += batch_failed
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                logger.exception("Failed to close email connection")
+        return sent, failed
@@ -0,0 +1,76 @@
+"""Streaming exports for the feedback app."""
+import csv
+import json
+
+EXPORT_CHUNK_SIZE = 2000
+
+CSV_HEADER = [
+    "response_id",
+    "respondent",
+    "submitted_at",
+    "question_id",
+    "answer_text",
+    "choices",
+]
+
+
+class _Echo:
+    """File-like object returning what is written to it."""
+
+    def write(self, value):
+        """Return the value instead of storing it."""
+        return value
+
+
+def _iter_responses(responses):
+    """Iterate responses over a server side cursor with their answers."""
+    return responses.prefetch_related("answers__choices__question_choice").iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+
+def _choice_values(answer):
+    return [choice.question_choice.value for choice in answer.choices.all()]
+
+
+def export_csv(responses):
+    """Yield CSV lines with one row per answer of the responses."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for response in _iter_responses(responses):
+        for answer in response.answers.all():
+            yield writer.writerow(
+                [
+                    response.id,
+                    response.respondent_id,
+                    response.submitted_at.isoformat(),
+                    answer.question_id,
+                    answer.answer_text,
+                    "; ".join(_choice_values(answer)),
+                ]
+            )
+
+
+def export_ndjson(responses):
+    """Yield one JSON line per response with its answers."""
+    for response in _iter_responses(responses):
+        line = {
+            "id": response.id,
+            "respondent": response.respondent_id,
+            "submitted_at": response.submitted_at.isoformat(),
+            "answers": [
+                {
+                    "question_id": answer.question_id,
+                    "answer_text": answer.answer_text,
+                    "choices": _choice_values(answer),
+                }
+                for answer in response.answers.all()
+            ],
+        }
+        yield json.dumps(line) + "\n"
+
+
+EXPORTERS = {
+    "csv": export_csv,
+    "ndjson": export_ndjson,
+}
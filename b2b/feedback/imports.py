@@ -0,0 +1,111 @@
+"""Bulk client imports for the feedback app."""
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from feedback.models import CLIENT_REP_GROUP, Client
+from rest_framework.exceptions import ValidationError
+
+from .serializers import ClientImportSerializer
+from .utils import chunked
+
+User = get_user_model()
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+
+
+def _iter_csv(file):
+    """Yield (line number, row) pairs of a CSV file with a header row."""
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    if not {"email", "name"}.issubset(reader.fieldnames or ()):
+        raise ValidationError(
+            {"file": ["CSV files need a header row with email and name columns."]}
+        )
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_ndjson(file):
+    """Yield (line number, row) pairs of a newline delimited JSON file."""
+    for line_number, line in enumerate(
+        io.TextIOWrapper(file, encoding="utf-8-sig"), start=1
+    ):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row
+
+
+def iter_rows(upload):
+    """Yield (line number, row) pairs of an uploaded CSV or NDJSON file."""
+    name = (upload.name or "").lower()
+    if name.endswith(NDJSON_EXTENSIONS) or upload.content_type in NDJSON_CONTENT_TYPES:
+        return _iter_ndjson(upload.file)
+    return _iter_csv(upload.file)
+
+
+def _client_reps_by_email(emails):
+    """Return {email: user id} of the client representatives with the emails."""
+    if not emails:
+        return {}
+    return dict(
+        User.objects.filter(
+            email__in=emails, groups__name=CLIENT_REP_GROUP
+        ).values_list("email", "id")
+    )
+
+
+def _import_batch(batch, sales_manager, report, max_errors):
+    """Validate a batch of rows and create its valid clients."""
+
+    def add_error(line, errors):
+        report["error_count"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"line": line, "errors": errors})
+
+    valid_rows = []
+    for line, row in batch:
+        if not isinstance(row, dict):
+            add_error(line, {"non_field_errors": ["Expected a JSON object."]})
+            continue
+        serializer = ClientImportSerializer(data=row)
+        if serializer.is_valid():
+            valid_rows.append((line, serializer.validated_data))
+        else:
+            add_error(line, serializer.errors)
+
+    client_reps = _client_reps_by_email(
+        {data["client_rep"] for _, data in valid_rows if data.get("client_rep")}
+    )
+    clients = []
+    for line, data in valid_rows:
+        client_rep_email = data.pop("client_rep", "")
+        client_rep_id = client_reps.get(client_rep_email)
+        if client_rep_email and client_rep_id is None:
+            add_error(
+                line, {"client_rep": ["No client representative with this email."]}
+            )
+            continue
+        clients.append(
+            Client(**data, client_rep_id=client_rep_id, sales_manager=sales_manager)
+        )
+
+    Client.objects.bulk_create(clients)
+    report["created"] += len(clients)
+
+
+def import_clients(rows, sales_manager, batch_size, max_errors):
+    """Create clients from (line number, row) pairs in batches.
+
+    Only one batch of rows is held in memory at a time, and only the first
+    max_errors row errors are reported, next to the total error count.
+    """
+    report = {"created": 0, "error_count": 0, "errors": []}
+    for batch in chunked(rows, batch_size):
+        _import_batch(batch, sales_manager, report, max_errors)
+    return report
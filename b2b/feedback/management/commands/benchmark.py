@@ -0,0 +1,132 @@
+"""Benchmark the feedback and account endpoints at realistic data volumes."""
+import json
+import platform
+import time
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+from feedback.benchmarks.routes import BENCHMARKS
+from feedback.benchmarks.runner import compare, run_benchmarks
+from feedback.benchmarks.seed import SCALES, seed
+
+from b2b.celery import celery
+
+
+class Command(BaseCommand):
+    """Command to seed a test database and benchmark every route against it."""
+
+    help = (
+        "Seed a throwaway test database, measure latency percentiles and query "
+        "counts of every route and task, and compare them with a baseline."
+    )
+
+    def add_arguments(self, parser):
+        """Add the benchmark options."""
+        parser.add_argument("--scale", choices=SCALES, default="full")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--benchmark",
+            action="append",
+            choices=BENCHMARKS,
+            dest="names",
+            help="Only run the given benchmark. Can be repeated.",
+        )
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument(
+            "--baseline",
+            help="Results JSON to compare with, failing on regressions.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed p95 latency growth over the baseline, as a fraction.",
+        )
+        parser.add_argument(
+            "--locmem-cache",
+            action="store_true",
+            help="Use a local memory cache instead of the configured one.",
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        scale = SCALES[options["scale"]]
+        runs = options["warmup"] + options["iterations"] + 1
+        if "client-detail:delete" in (options["names"] or BENCHMARKS) and (
+            runs > scale.deletable_clients
+        ):
+            raise CommandError(
+                f"The {options['scale']} scale only seeds "
+                f"{scale.deletable_clients} deletable clients for {runs} runs."
+            )
+
+        baseline = None
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            if baseline.get("scale") != options["scale"]:
+                raise CommandError(
+                    f"The baseline was measured at the {baseline.get('scale')} scale."
+                )
+
+        overrides = {}
+        if options["locmem_cache"]:
+            overrides["CACHES"] = {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+
+        setup_test_environment(debug=False)
+        celery.conf.update(task_always_eager=True)
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(**overrides):
+                started = time.monotonic()
+                dataset = seed(scale)
+                self.stdout.write(
+                    f"Seeded the {options['scale']} scale in "
+                    f"{time.monotonic() - started:.0f}s"
+                )
+                results = run_benchmarks(
+                    dataset, options["iterations"], options["warmup"], options["names"]
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            celery.conf.update(task_always_eager=False)
+            teardown_test_environment()
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:40} p50 {result['p50']:9.3f}ms  p95 {result['p95']:9.3f}ms  "
+                f"{result['queries']:3} queries"
+            )
+
+        report = {
+            "scale": options["scale"],
+            "iterations": options["iterations"],
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline["results"], options["tolerance"])
+            for regression in regressions:
+                self.stderr.write(regression)
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark regressions.")
+            self.stdout.write(
+                self.style.SUCCESS("No regressions against the baseline.")
+            )
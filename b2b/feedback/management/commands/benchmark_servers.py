@@ -0,0 +1,86 @@
+"""Compare the read endpoints under gunicorn (WSGI) and uvicorn (ASGI)."""
+import json
+import platform
+import time
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from feedback.benchmarks.seed import SCALES, seed
+from feedback.benchmarks.servers import run_servers
+
+
+class Command(BaseCommand):
+    """Command to load test the read endpoints under both server stacks."""
+
+    help = (
+        "Seed a throwaway test database, serve it with gunicorn and uvicorn and "
+        "compare the throughput and tail latency of the async read endpoints."
+    )
+
+    def add_arguments(self, parser):
+        """Add the load test options."""
+        parser.add_argument("--scale", choices=SCALES, default="small")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=200,
+            help="Requests kept in flight at once.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=20, help="Seconds per endpoint."
+        )
+        parser.add_argument(
+            "--warmup", type=float, default=2, help="Warmup seconds per endpoint."
+        )
+        parser.add_argument("--output", default="benchmark-servers.json")
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        old_name = connection.settings_dict["NAME"]
+        database_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        try:
+            started = time.monotonic()
+            dataset = seed(SCALES[options["scale"]])
+            self.stdout.write(
+                f"Seeded the {options['scale']} scale in "
+                f"{time.monotonic() - started:.0f}s"
+            )
+            # Let the servers' connections see the seeded data
+            connection.close()
+            results = run_servers(
+                dataset,
+                database_name,
+                options["workers"],
+                options["concurrency"],
+                options["duration"],
+                options["warmup"],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        for server, endpoints in results.items():
+            for name, result in endpoints.items():
+                self.stdout.write(
+                    f"{server:9} {name:34} {result['throughput']:8.1f} req/s  "
+                    f"p50 {result['p50']:8.2f}ms  p99 {result['p99']:8.2f}ms  "
+                    f"{result['errors']} errors"
+                )
+
+        report = {
+            "scale": options["scale"],
+            "workers": options["workers"],
+            "concurrency": options["concurrency"],
+            "duration": options["duration"],
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,49 @@
+"""Rebuild the denormalized result counters."""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from feedback.counters import (
+    get_drifted_counters,
+    get_result_counters,
+    rebuild_result_counters,
+)
+
+
+class Command(BaseCommand):
+    """Command to rebuild or check the questionnaire result counters."""
+
+    help = (
+        "Recompute the result counters from the stored answers. Submissions and "
+        "response deletions keep them current, so only answers deleted on their "
+        "own and writes bypassing the ORM, such as raw SQL or restored backups, "
+        "leave counters to rebuild."
+    )
+
+    def add_arguments(self, parser):
+        """Add the check option."""
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report counters that drifted, failing if there are any.",
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        drift = 0
+        if options["check"]:
+            for model, field, actual in get_result_counters():
+                count = get_drifted_counters(model, field, actual).count()
+                self.stdout.write(
+                    f"{model._meta.verbose_name} {field}: {count} drifted"
+                )
+                drift += count
+        else:
+            with transaction.atomic():
+                rebuilt = rebuild_result_counters()
+            for model, field, count in rebuilt:
+                self.stdout.write(
+                    f"{model._meta.verbose_name} {field}: {count} rebuilt"
+                )
+
+        if options["check"] and drift:
+            raise CommandError(f"{drift} result counters drifted.")
+        self.stdout.write(self.style.SUCCESS("Result counters SUCCESS!"))
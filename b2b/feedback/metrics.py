@@ -0,0 +1,95 @@
+"""Prometheus metrics of the API and Celery workloads.
+
+Metrics are exported by ``metrics_view`` in the Prometheus text format, to
+scrapers presenting ``FEEDBACK_METRICS_TOKEN``. When
+``PROMETHEUS_MULTIPROC_DIR`` names a directory shared by the gunicorn and
+Celery workers, every process writes its samples there and the view aggregates
+them all. The image sets it, compose mounts one volume there for the web and
+worker services, and ``gunicorn.conf.py`` empties it when gunicorn starts.
+"""
+import os
+import socket
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    values,
+)
+
+if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+    # Containers sharing the directory reuse pids, so sample files are named
+    # after the host as well
+    values.ValueClass = values.MultiProcessValue(
+        lambda: f"{socket.gethostname()}-{os.getpid()}"
+    )
+
+QUERY_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800)
+
+REQUEST_LATENCY = Histogram(
+    "b2b_http_request_duration_seconds",
+    "Request latency by route and viewset action.",
+    ["route", "action", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "b2b_http_request_db_queries",
+    "Database queries per request by route and viewset action.",
+    ["route", "action", "method"],
+    buckets=QUERY_BUCKETS,
+)
+RESPONSES_SUBMITTED = Counter(
+    "b2b_feedback_responses_submitted",
+    "Questionnaire responses submitted.",
+)
+TASK_DURATION = Histogram(
+    "b2b_celery_task_duration_seconds",
+    "Celery task run time by task and outcome.",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+EMAILS = Counter(
+    "b2b_emails",
+    "Emails sent or failed by email class.",
+    ["email", "outcome"],
+)
+
+
+def record_responses_submitted(count):
+    """Count submitted questionnaire responses."""
+    RESPONSES_SUBMITTED.inc(count)
+
+
+def record_email(message, outcome):
+    """Count an email message as "sent" or "failed"."""
+    EMAILS.labels(email=type(message).__name__, outcome=outcome).inc()
+
+
+def get_registry():
+    """Return the registry to export, aggregating worker processes if shared."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """Export the metrics, hidden until ``FEEDBACK_METRICS_TOKEN`` is set."""
+    token = settings.FEEDBACK_METRICS_TOKEN
+    if not token:
+        raise Http404()
+    if not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -0,0 +1,232 @@
+"""Middleware for the feedback app."""
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .budgets import get_view_query_budget
+from .metrics import REQUEST_LATENCY, REQUEST_QUERIES
+from .routers import get_request_database, read_from, stick_to_primary
+from .timing import RequestTimer
+
+logger = logging.getLogger(__name__)
+
+
+class _QueryCounter:
+    """Database execute wrapper counting the queries it runs."""
+
+    def __init__(self):
+        """Start counting from zero."""
+        self.started = time.perf_counter()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count and run a query."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _wrap_connections(stack, wrapper):
+    """Install the execute wrapper on every connection of the current thread."""
+    for conn in connections.all():
+        stack.enter_context(conn.execute_wrapper(wrapper))
+
+
+class _ExecuteWrapperMiddleware:
+    """Run requests with a database execute wrapper on every connection.
+
+    Subclasses return the wrapper of a request from ``get_wrapper``, or None to
+    leave it alone, and inspect it in ``process_wrapped``. Under ASGI the
+    queries of a request run in its own thread, so the wrapper is installed
+    on that thread's connections.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Store the next handler."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Run the request with the wrapper installed."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        wrapper = self.get_wrapper(request)
+        if wrapper is None:
+            return self.get_response(request)
+        with ExitStack() as stack:
+            _wrap_connections(stack, wrapper)
+            response = self.get_response(request)
+        return self.process_wrapped(request, response, wrapper)
+
+    async def __acall__(self, request):
+        """Run the request with the wrapper installed, without blocking."""
+        wrapper = self.get_wrapper(request)
+        if wrapper is None:
+            return await self.get_response(request)
+        stack = ExitStack()
+        await sync_to_async(_wrap_connections)(stack, wrapper)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.process_wrapped(request, response, wrapper)
+
+    def get_wrapper(self, request):
+        """Return the execute wrapper of the request, or None."""
+        raise NotImplementedError
+
+    def process_wrapped(self, request, response, wrapper):
+        """Return the response once the wrapper has seen the request's queries."""
+        return response
+
+
+class QueryBudgetMiddleware(_ExecuteWrapperMiddleware):
+    """Log requests running more queries than their viewset action's budget.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    def get_wrapper(self, request):
+        """Count the request's queries."""
+        return _QueryCounter()
+
+    def process_wrapped(self, request, response, counter):
+        """Log a budget violation."""
+        match = request.resolver_match
+        view, budget = get_view_query_budget(
+            match.func if match else None, request.method
+        )
+        if budget is not None and counter.count > budget:
+            logger.warning(
+                "Query budget exceeded by %s: %d queries, budget %d",
+                view,
+                counter.count,
+                budget,
+                extra={
+                    "view": view,
+                    "queries": counter.count,
+                    "budget": budget,
+                    "path": request.path,
+                    "method": request.method,
+                },
+            )
+        return response
+
+
+class ServerTimingMiddleware(_ExecuteWrapperMiddleware):
+    """Break sampled requests' time down into a ``Server-Timing`` header and log.
+
+    ``FEEDBACK_SERVER_TIMING_SAMPLE_RATE`` of the requests are timed, the rest
+    pass through untouched.
+    """
+
+    def get_wrapper(self, request):
+        """Attach a timer to a sampled request."""
+        if random.random() >= settings.FEEDBACK_SERVER_TIMING_SAMPLE_RATE:
+            return None
+        timer = RequestTimer()
+        request._server_timer = timer
+        return timer
+
+    def process_wrapped(self, request, response, timer):
+        """Report the request's timings."""
+        timings = timer.get_timings()
+        response["Server-Timing"] = timer.get_header(timings)
+        match = request.resolver_match
+        logger.info(
+            "Server timing of %s %s: %.2fms, %d queries",
+            request.method,
+            request.path,
+            timings["total"],
+            timer.queries,
+            extra={
+                "view": match.view_name if match else None,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": timer.queries,
+                "timings": timings,
+            },
+        )
+        return response
+
+
+class RequestMetricsMiddleware(_ExecuteWrapperMiddleware):
+    """Record request latency and query count metrics by route and action.
+
+    Routes are labelled by URL name, so unresolved paths share one label.
+    """
+
+    def get_wrapper(self, request):
+        """Time and count the queries of the request."""
+        return _QueryCounter()
+
+    def process_wrapped(self, request, response, counter):
+        """Observe the request's latency and query count."""
+        duration = time.perf_counter() - counter.started
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else "unresolved"
+        actions = getattr(match.func, "actions", None) if match else None
+        action = (actions or {}).get(request.method.lower(), "")
+        REQUEST_LATENCY.labels(
+            route=route,
+            action=action,
+            method=request.method,
+            status=response.status_code,
+        ).observe(duration)
+        REQUEST_QUERIES.labels(
+            route=route, action=action, method=request.method
+        ).observe(counter.count)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Route the reads of safe requests to a replica, and pin writers to the primary.
+
+    A client whose unsafe request succeeded reads from the primary for
+    ``FEEDBACK_READ_STICKINESS`` seconds. Must come before any middleware
+    reading from the database.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Store the next handler."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Run the request reading from its database."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with read_from(get_request_database(request)):
+            response = self.get_response(request)
+        if self.wrote(request, response):
+            stick_to_primary(request)
+        return response
+
+    async def __acall__(self, request):
+        """Run the request reading from its database, without blocking."""
+        alias = await sync_to_async(get_request_database)(request)
+        with read_from(alias):
+            response = await self.get_response(request)
+        if self.wrote(request, response):
+            await sync_to_async(stick_to_primary)(request)
+        return response
+
+    def wrote(self, request, response):
+        """Return whether the request may have written to the primary."""
+        return request.method not in SAFE_METHODS and response.status_code < 400
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.7 on 2023-03-20 10:12
+
+from django.db import migrations
+
+ROLE_GROUPS = ["Sales Managers", "Corporate Client Representatives"]
+
+
+def create_role_groups(apps, schema_editor):
+    Group = apps.get_model("auth", "Group")
+    for name in ROLE_GROUPS:
+        Group.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("feedback", "0006_monthlyfeedback"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_role_groups, migrations.RunPython.noop),
+    ]
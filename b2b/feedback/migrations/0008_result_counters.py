@@ -0,0 +1,27 @@
+# Generated by Django 4.1.7 on 2023-03-21 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feedback", "0007_create_role_groups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="answered_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="questionchoice",
+            name="answer_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="questionnaire",
+            name="response_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
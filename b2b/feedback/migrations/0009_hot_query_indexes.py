@@ -0,0 +1,51 @@
+# Generated by Django 4.1.7 on 2023-03-22 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feedback", "0008_result_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(
+                fields=["sales_manager", "-created_at"],
+                name="client_manager_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="monthlyfeedback",
+            index=models.Index(
+                fields=["client_rep", "-month"], name="monthly_feedback_rep_month_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="questionnaire",
+            index=models.Index(
+                fields=["client_rep", "-created_at"], name="qnr_client_rep_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="questionnaire",
+            index=models.Index(
+                fields=["author", "-created_at"], name="qnr_author_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="questionnaire",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["due_at"],
+                name="qnr_active_due_at_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="response",
+            index=models.Index(
+                fields=["questionnaire", "id"], name="response_questionnaire_id_idx"
+            ),
+        ),
+    ]
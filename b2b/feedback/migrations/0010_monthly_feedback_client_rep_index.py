@@ -0,0 +1,28 @@
+# Generated by Django 4.1.7 on 2023-03-23 10:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("feedback", "0009_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="monthlyfeedback",
+            name="client_rep",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                limit_choices_to={"groups__name": "Corporate Client Representatives"},
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="monthly_feedback",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_field, count_field="pk", distinct=False):
+    counts = (
+        queryset.values(group_field)
+        .annotate(count=Count(count_field, distinct=distinct))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def backfill_result_counters(apps, schema_editor):
+    Answer = apps.get_model("feedback", "Answer")
+    AnswerChoice = apps.get_model("feedback", "AnswerChoice")
+    Question = apps.get_model("feedback", "Question")
+    QuestionChoice = apps.get_model("feedback", "QuestionChoice")
+    Questionnaire = apps.get_model("feedback", "Questionnaire")
+    Response = apps.get_model("feedback", "Response")
+
+    Questionnaire.objects.update(
+        response_count=_count(
+            Response.objects.filter(questionnaire=OuterRef("pk")), "questionnaire"
+        )
+    )
+    # Answers with text or at least one chosen choice count as answered
+    answered = Q(choices__isnull=False) | ~Q(answer_text="") & ~Q(answer_text=None)
+    Question.objects.update(
+        answered_count=_count(
+            Answer.objects.filter(answered, question=OuterRef("pk")),
+            "question",
+            count_field="response_id",
+            distinct=True,
+        )
+    )
+    QuestionChoice.objects.update(
+        answer_count=_count(
+            AnswerChoice.objects.filter(question_choice=OuterRef("pk")),
+            "question_choice",
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feedback", "0010_monthly_feedback_client_rep_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_result_counters, migrations.RunPython.noop),
+    ]
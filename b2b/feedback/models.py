@@ -35,6 +35,16 @@ class Client(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        """Client meta class."""
+
+        indexes = [
+            models.Index(
+                fields=["sales_manager", "-created_at"],
+                name="client_manager_created_idx",
+            ),
+        ]
+
     def __str__(self):
         """Return the name."""
         return self.name
@@ -64,6 +74,26 @@ class Questionnaire(models.Model):
     is_active = models.BooleanField(default=True)
     due_at = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    response_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        """Questionnaire meta class."""
+
+        indexes = [
+            models.Index(
+                fields=["client_rep", "-created_at"],
+                name="qnr_client_rep_created_idx",
+            ),
+            models.Index(
+                fields=["author", "-created_at"],
+                name="qnr_author_created_idx",
+            ),
+            models.Index(
+                fields=["due_at"],
+                condition=models.Q(is_active=True),
+                name="qnr_active_due_at_idx",
+            ),
+        ]
 
     def __str__(self):
         """Return the title."""
@@ -86,6 +116,7 @@ class Question(models.Model):
     question_text = models.TextField()
     required = models.BooleanField(default=False)
     order = models.PositiveSmallIntegerField()
+    answered_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         """Return the question_text."""
@@ -100,6 +131,7 @@ class QuestionChoice(models.Model):
     )
     value = models.TextField()
     order = models.PositiveSmallIntegerField()
+    answer_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         """Return the value."""
@@ -121,6 +153,16 @@ class Response(models.Model):
     )
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """Response meta class."""
+
+        indexes = [
+            models.Index(
+                fields=["questionnaire", "id"],
+                name="response_questionnaire_id_idx",
+            ),
+        ]
+
     def __str__(self):
         """Return response summary."""
         return f"{self.respondent}'s response to {self.questionnaire}"
@@ -162,6 +204,8 @@ class MonthlyFeedback(models.Model):
         related_name="monthly_feedback",
         blank=True,
         null=True,
+        # Covered by the client_rep, -month index
+        db_index=False,
         limit_choices_to={"groups__name": CLIENT_REP_GROUP},
     )
     month = models.CharField(
@@ -175,6 +219,12 @@ class MonthlyFeedback(models.Model):
         """Monthly feedback meta class."""
 
         verbose_name_plural = "Monthly feedback"
+        indexes = [
+            models.Index(
+                fields=["client_rep", "-month"],
+                name="monthly_feedback_rep_month_idx",
+            ),
+        ]
 
     def __str__(self):
         """Return a string representation of the MonthlyFeedback."""
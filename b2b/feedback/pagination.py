@@ -1,30 +1,114 @@
 """Feedback app pagination."""
-from rest_framework.pagination import PageNumberPagination
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
-class _PageNumberPagination10(PageNumberPagination):
-    page_size = 10
+class _KeysetPagination(CursorPagination):
+    """Keyset pagination with a page number fallback.
+
+    Requests with a ``cursor`` query parameter (empty for the first page) are
+    paginated with opaque keyset cursors over ``ordering``. Other requests keep
+    the page number pagination with counts.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def __init__(self):
+        """Start without a page number paginator."""
+        self.page_number_paginator = None
+
+    def _get_page_number_paginator(self):
+        paginator = PageNumberPagination()
+        paginator.page_size = self.page_size
+        paginator.page_size_query_param = self.page_size_query_param
+        paginator.max_page_size = self.max_page_size
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate with keyset cursors or page numbers."""
+        if self.cursor_query_param in request.query_params:
+            self.page_number_paginator = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.page_number_paginator = self._get_page_number_paginator()
+        page = self.page_number_paginator.paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.page_number_paginator.display_page_controls
+        return page
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Paginate like ``paginate_queryset``, without blocking."""
+        if self.cursor_query_param in request.query_params:
+            # Keyset pages are fetched by a single query in the request's thread
+            self.page_number_paginator = None
+            return await sync_to_async(super().paginate_queryset)(
+                queryset, request, view
+            )
 
-class ClientPagination(PageNumberPagination):
+        paginator = self._get_page_number_paginator()
+        paginator.request = request
+        django_paginator = paginator.django_paginator_class(
+            queryset, paginator.get_page_size(request)
+        )
+        # Count up front so the paginator never counts synchronously
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                paginator.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        page.object_list = [obj async for obj in page.object_list]
+        paginator.page = page
+        paginator.display_page_controls = (
+            django_paginator.num_pages > 1 and paginator.template is not None
+        )
+
+        self.page_number_paginator = paginator
+        self.display_page_controls = paginator.display_page_controls
+        return page.object_list
+
+    def get_paginated_response(self, data):
+        """Return the response of the pagination mode in use."""
+        if self.page_number_paginator is not None:
+            return self.page_number_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        """Return the page controls of the pagination mode in use."""
+        if self.page_number_paginator is not None:
+            return self.page_number_paginator.to_html()
+        return super().to_html()
+
+
+class ClientPagination(_KeysetPagination):
     """Client pagination class."""
 
     page_size = 20
+    ordering = ("-created_at", "-id")
 
 
-class QuestionnairePagination(_PageNumberPagination10):
+class QuestionnairePagination(_KeysetPagination):
     """Questionnaire pagination class."""
 
-    pass
+    page_size = 10
+    ordering = ("-created_at", "-id")
 
 
-class ResponsePagination(PageNumberPagination):
+class ResponsePagination(_KeysetPagination):
     """Response pagination class."""
 
     page_size = 1
+    ordering = "id"
 
 
-class MonthlyFeedbackPagination(_PageNumberPagination10):
+class MonthlyFeedbackPagination(_KeysetPagination):
     """Monthly feedback pagination."""
 
-    pass
+    page_size = 10
+    ordering = ("-month", "-id")
@@ -1,35 +1,99 @@
 """Custom permissions for the feedback app."""
-from django.contrib.auth.models import Group
+import time
+
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.permissions import BasePermission
 
 from .models import CLIENT_REP_GROUP, SALES_MANAGER_GROUP
+from .routers import read_from
 
+ROLE_GROUPS = (SALES_MANAGER_GROUP, CLIENT_REP_GROUP)
+ROLE_CACHE_KEY = "feedback:roles:{}"
+
+# Process local role cache of user id -> (expiry, roles)
+_local_roles: dict = {}
+
+
+def _role_cache_key(user_id):
+    return ROLE_CACHE_KEY.format(user_id)
+
+
+def get_user_roles(user):
+    """Return the names of the role groups the user belongs to.
+
+    Roles are looked up in a short lived process local cache, then in the
+    shared cache and only hit the primary database when both miss.
+    """
+    if user is None or not user.is_authenticated:
+        return frozenset()
+
+    now = time.monotonic()
+    entry = _local_roles.get(user.pk)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    key = _role_cache_key(user.pk)
+    roles = cache.get(key)
+    if roles is None:
+        # Read the primary, the roles were invalidated by a commit a replica may lag
+        with read_from(None):
+            roles = frozenset(
+                user.groups.filter(name__in=ROLE_GROUPS).values_list("name", flat=True)
+            )
+        cache.set(key, roles, settings.FEEDBACK_ROLE_CACHE_TIMEOUT)
+
+    if len(_local_roles) >= settings.FEEDBACK_ROLE_LOCAL_CACHE_SIZE:
+        _local_roles.clear()
+    _local_roles[user.pk] = (now + settings.FEEDBACK_ROLE_LOCAL_CACHE_TIMEOUT, roles)
+    return roles
+
+
+def invalidate_user_roles(user_ids):
+    """Drop cached roles of the given users."""
+    user_ids = list(user_ids)
+    for user_id in user_ids:
+        _local_roles.pop(user_id, None)
+    cache.delete_many([_role_cache_key(user_id) for user_id in user_ids])
 
-class IsSalesManager(BasePermission):
-    """Permission class to check if a user is in the Sales Managers group."""
+
+def clear_local_roles():
+    """Empty the process local role cache."""
+    _local_roles.clear()
+
+
+def get_request_roles(request):
+    """Return the current user's roles, resolving them once per request."""
+    roles = getattr(request, "_feedback_roles", None)
+    if roles is None:
+        roles = get_user_roles(request.user)
+        request._feedback_roles = roles
+    return roles
+
+
+class _RolePermission(BasePermission):
+    """Grant access to users in any of the given role groups."""
+
+    roles: tuple = ()
 
     def has_permission(self, request, view):
-        """Return true if current user is in the Sales Mangers group."""
-        sales_manager_group, _ = Group.objects.get_or_create(name=SALES_MANAGER_GROUP)
-        return sales_manager_group in request.user.groups.all()
+        """Return true if current user is in any of the role groups."""
+        return not get_request_roles(request).isdisjoint(self.roles)
 
 
-class IsClientRepresentative(BasePermission):
+class IsSalesManager(_RolePermission):
+    """Permission class to check if a user is in the Sales Managers group."""
+
+    roles = (SALES_MANAGER_GROUP,)
+
+
+class IsClientRepresentative(_RolePermission):
     """Permission class to check if a user is in the Client Representatives group."""
 
-    def has_permission(self, request, view):
-        """Return true if current user is in the Client Representatives group."""
-        client_rep_group, _ = Group.objects.get_or_create(name=CLIENT_REP_GROUP)
-        return client_rep_group in request.user.groups.all()
+    roles = (CLIENT_REP_GROUP,)
 
 
-class IsSalesManagerOrClientRep(BasePermission):
+class IsSalesManagerOrClientRep(_RolePermission):
     """Sales Managers or Client Representatives permission class."""
 
-    def has_permission(self, request, view):
-        """Return true if current user is in either group."""
-        sales_manager_group, _ = Group.objects.get_or_create(name=SALES_MANAGER_GROUP)
-        client_rep_group, _ = Group.objects.get_or_create(name=CLIENT_REP_GROUP)
-
-        user_groups = request.user.groups.all()
-        return sales_manager_group in user_groups or client_rep_group in user_groups
+    roles = (SALES_MANAGER_GROUP, CLIENT_REP_GROUP)
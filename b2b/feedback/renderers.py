@@ -0,0 +1,33 @@
+"""Renderers for the feedback app."""
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class _ExportRenderer(BaseRenderer):
+    """Renderer selecting an export format.
+
+    Exports are streamed by the view, so only error payloads are rendered here.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render error payloads as JSON text."""
+        if data is None:
+            return b""
+        return json.dumps(data).encode(self.charset)
+
+
+class CSVRenderer(_ExportRenderer):
+    """CSV export renderer."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(_ExportRenderer):
+    """Newline delimited JSON export renderer."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
@@ -0,0 +1,50 @@
+"""Aggregate questionnaire results for the feedback app."""
+
+CHOICE_QUESTION_TYPES = ("MULTIPLE_CHOICE", "DROPDOWN")
+LOGICAL_QUESTION_TYPE = "LOGICAL"
+
+
+def _completion_rate(count, total):
+    return round(count / total, 4) if total else 0.0
+
+
+def get_questionnaire_results(questionnaire):
+    """Return per question results of a questionnaire.
+
+    Results are read from the questionnaire's result counters, so they only
+    need its questions and choices, which are expected to be prefetched.
+    """
+    response_count = questionnaire.response_count
+    questions = []
+    for question in sorted(questionnaire.questions.all(), key=lambda q: q.order):
+        result = {
+            "id": question.id,
+            "question_type": question.question_type,
+            "question_text": question.question_text,
+            "order": question.order,
+            "answered_count": question.answered_count,
+            "completion_rate": _completion_rate(
+                question.answered_count, response_count
+            ),
+        }
+        choices = sorted(question.choices.all(), key=lambda c: c.order)
+        if question.question_type in CHOICE_QUESTION_TYPES:
+            result["choices"] = [
+                {"id": choice.id, "value": choice.value, "count": choice.answer_count}
+                for choice in choices
+            ]
+        elif question.question_type == LOGICAL_QUESTION_TYPE:
+            split = {"true": 0, "false": 0}
+            for choice in choices:
+                value = choice.value.strip().lower()
+                if value in split:
+                    split[value] += choice.answer_count
+            result["split"] = split
+        questions.append(result)
+
+    return {
+        "id": questionnaire.id,
+        "title": questionnaire.title,
+        "response_count": response_count,
+        "questions": questions,
+    }
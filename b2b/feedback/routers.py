@@ -0,0 +1,168 @@
+"""Route reads to read replicas and writes to the primary database.
+
+Reads go to the replica chosen for the current request by
+``ReplicaRoutingMiddleware``, or for a block by ``use_replica``, and to the
+primary otherwise. Safe requests read from a random healthy replica unless
+their client wrote within ``FEEDBACK_READ_STICKINESS`` seconds, so users see
+their own writes. Replicas lagging more than ``FEEDBACK_REPLICA_MAX_LAG``
+seconds or failing their lag check are skipped until they are checked again.
+"""
+import hashlib
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY = "feedback:db:sticky:{}"
+
+# Seconds the replica's replayed data is behind the primary, 0 when caught up
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Database alias reads are routed to, None for the primary
+_read_database = ContextVar("feedback_read_database", default=None)
+
+# {replica alias: (monotonic time of the next check, healthy)}
+_replica_health = {}
+
+
+def get_replica_lag(alias):
+    """Return the replication lag of a replica in seconds."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(REPLICA_LAG_SQL)
+        lag = cursor.fetchone()[0]
+    return float(lag or 0)
+
+
+def is_replica_healthy(alias):
+    """Return whether a replica is reachable and caught up, checking it sparingly."""
+    now = time.monotonic()
+    checked = _replica_health.get(alias)
+    if checked is not None and checked[0] > now:
+        return checked[1]
+
+    try:
+        lag = get_replica_lag(alias)
+    except DatabaseError:
+        logger.warning("Replica %s is unreachable", alias, exc_info=True)
+        healthy = False
+    else:
+        healthy = lag <= settings.FEEDBACK_REPLICA_MAX_LAG
+        if not healthy:
+            logger.warning("Replica %s lags by %.1fs", alias, lag)
+    _replica_health[alias] = (now + settings.FEEDBACK_REPLICA_CHECK_INTERVAL, healthy)
+    return healthy
+
+
+def clear_replica_health():
+    """Forget the replicas' health, checking them again on their next use."""
+    _replica_health.clear()
+
+
+def choose_replica():
+    """Return a random healthy replica, or None to read from the primary."""
+    replicas = [
+        alias
+        for alias in settings.FEEDBACK_REPLICA_DATABASES
+        if is_replica_healthy(alias)
+    ]
+    return random.choice(replicas) if replicas else None
+
+
+def _get_sticky_key(request):
+    """Return the cache key pinning the request's client to the primary, or None."""
+    credentials = request.headers.get("Authorization") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credentials:
+        return None
+    return STICKY_KEY.format(hashlib.sha256(credentials.encode()).hexdigest())
+
+
+def stick_to_primary(request):
+    """Keep the reads of the request's client on the primary for a while."""
+    key = _get_sticky_key(request)
+    if key is not None:
+        cache.set(key, True, settings.FEEDBACK_READ_STICKINESS)
+
+
+def is_sticky(request):
+    """Return whether the request's client wrote recently."""
+    key = _get_sticky_key(request)
+    return key is not None and cache.get(key, False)
+
+
+def get_request_database(request):
+    """Return the replica a request reads from, or None for the primary."""
+    if (
+        request.method not in SAFE_METHODS
+        or not settings.FEEDBACK_REPLICA_DATABASES
+        or is_sticky(request)
+    ):
+        return None
+    return choose_replica()
+
+
+def get_read_database():
+    """Return the database alias reads are currently routed to."""
+    return _read_database.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def read_from(alias):
+    """Route reads within the block to a database alias, None for the primary."""
+    token = _read_database.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_database.reset(token)
+
+
+def use_replica():
+    """Route reads within the block to a healthy replica, as for analytics."""
+    return read_from(choose_replica())
+
+
+class PrimaryReplicaRouter:
+    """Send writes to the primary and reads to the current read database.
+
+    Reads outside a replica block return None, so related objects are read
+    from the database their instance came from.
+    """
+
+    # Models read right after they are written, such as a token after login
+    primary_models = {"authtoken.token", "sessions.session"}
+
+    def db_for_read(self, model, **hints):
+        """Return the replica chosen for the current reads."""
+        if model._meta.label_lower in self.primary_models:
+            return DEFAULT_DB_ALIAS
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        """Write to the primary."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations, the replicas hold the primary's data."""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Only migrate the primary, the replicas follow it."""
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,145 @@
+"""Compiled questionnaire schemas for validating responses in memory."""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from .cache import get_questionnaire_version
+from .models import Question, QuestionChoice, Questionnaire
+from .routers import read_from
+
+# Question types taking at most one chosen choice, and no choices at all
+SINGLE_CHOICE_TYPES = ("LOGICAL", "DROPDOWN")
+NO_CHOICE_TYPES = ("OPEN",)
+
+# Process local LRU of questionnaire id -> (version, schema)
+_schemas: OrderedDict = OrderedDict()
+_schemas_lock = threading.Lock()
+
+
+class QuestionnaireSchema:
+    """What a response to a questionnaire may contain."""
+
+    def __init__(self, questionnaire_id, client_rep_id, questions, choice_questions):
+        """Store {question id: (type, required)} and {choice id: question id}."""
+        self.questionnaire_id = questionnaire_id
+        self.client_rep_id = client_rep_id
+        self.questions = questions
+        self.choice_questions = choice_questions
+        self.required_question_ids = {
+            question_id for question_id, (_, required) in questions.items() if required
+        }
+
+    def _answer_errors(self, answer, answered_ids):
+        question_id = answer["question_id"]
+        if question_id not in self.questions:
+            return {"question_id": ["Not a question of this questionnaire."]}
+        if question_id in answered_ids:
+            return {"question_id": ["This question is answered more than once."]}
+        answered_ids.add(question_id)
+
+        question_type, _ = self.questions[question_id]
+        choices = answer.get("choices", [])
+        if any(
+            self.choice_questions.get(choice["question_choice_id"]) != question_id
+            for choice in choices
+        ):
+            return {"choices": ["Not a choice of this question."]}
+        if choices and question_type in NO_CHOICE_TYPES:
+            return {"choices": ["This question does not take choices."]}
+        if len(choices) > 1 and question_type in SINGLE_CHOICE_TYPES:
+            return {"choices": ["This question takes a single choice."]}
+        return {}
+
+    def validate_answers(self, answers):
+        """Raise a validation error unless the answers fit the questionnaire."""
+        answered_ids: set = set()
+        errors = [self._answer_errors(answer, answered_ids) for answer in answers]
+        if any(errors):
+            raise ValidationError({"answers": errors})
+
+        answered = {
+            answer["question_id"]
+            for answer in answers
+            if answer.get("answer_text") or answer.get("choices")
+        }
+        missing = sorted(self.required_question_ids - answered)
+        if missing:
+            raise ValidationError(
+                {
+                    "answers": [
+                        "Answer the required questions: {}.".format(
+                            ", ".join(map(str, missing))
+                        )
+                    ]
+                }
+            )
+
+
+def compile_questionnaire_schema(questionnaire_id):
+    """Return the schema of a questionnaire, or None if it does not exist."""
+    client_rep_ids = list(
+        Questionnaire.objects.filter(pk=questionnaire_id).values_list(
+            "client_rep_id", flat=True
+        )
+    )
+    if not client_rep_ids:
+        return None
+    (client_rep_id,) = client_rep_ids
+
+    questions = {
+        question_id: (question_type, required)
+        for question_id, question_type, required in Question.objects.filter(
+            questionnaire_id=questionnaire_id
+        ).values_list("id", "question_type", "required")
+    }
+    choice_questions = dict(
+        QuestionChoice.objects.filter(
+            question__questionnaire_id=questionnaire_id
+        ).values_list("id", "question_id")
+    )
+    return QuestionnaireSchema(
+        questionnaire_id, client_rep_id, questions, choice_questions
+    )
+
+
+def get_questionnaire_schema(questionnaire_id):
+    """Return the questionnaire's schema, compiling it when it changed.
+
+    Schemas are kept in a process local LRU and recompiled once the
+    questionnaire version moves on, so cached lookups run no queries. A
+    version is only started for questionnaires which exist.
+    """
+    try:
+        questionnaire_id = int(questionnaire_id)
+    except (TypeError, ValueError):
+        return None
+
+    version = get_questionnaire_version(questionnaire_id, create=False)
+    if version is None:
+        if not Questionnaire.objects.filter(pk=questionnaire_id).exists():
+            return None
+        version = get_questionnaire_version(questionnaire_id)
+    with _schemas_lock:
+        entry = _schemas.get(questionnaire_id)
+        if entry is not None and entry[0] == version:
+            _schemas.move_to_end(questionnaire_id)
+            return entry[1]
+
+    # Compile from the primary, a lagging replica may miss the new version
+    with read_from(None):
+        schema = compile_questionnaire_schema(questionnaire_id)
+    if schema is not None:
+        with _schemas_lock:
+            _schemas[questionnaire_id] = (version, schema)
+            _schemas.move_to_end(questionnaire_id)
+            while len(_schemas) > settings.FEEDBACK_SCHEMA_CACHE_SIZE:
+                _schemas.popitem(last=False)
+    return schema
+
+
+def clear_schemas():
+    """Empty the process local schema cache."""
+    with _schemas_lock:
+        _schemas.clear()
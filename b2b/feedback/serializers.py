@@ -1,9 +1,11 @@
 """Serializers for the feedback app."""
 from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.http import Http404
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
+from .counters import increment_result_counters
+from .metrics import record_responses_submitted
 from .models import (
     Answer,
     AnswerChoice,
@@ -14,9 +16,31 @@ from .models import (
     Questionnaire,
     Response,
 )
+from .schema import get_questionnaire_schema
 
 
-class ClientSerializer(serializers.ModelSerializer):
+def get_questions_prefetch():
+    """Return the prefetch of questionnaire questions and choices in creation order."""
+    return Prefetch(
+        "questions",
+        queryset=Question.objects.order_by("pk").prefetch_related(
+            Prefetch("choices", queryset=QuestionChoice.objects.order_by("pk"))
+        ),
+    )
+
+
+class SparseFieldsModelSerializer(serializers.ModelSerializer):
+    """Model serializer limited to the field names in the ``fields`` argument."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """Drop the fields not in ``fields``, if given."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class ClientSerializer(SparseFieldsModelSerializer):
     """The client serializer."""
 
     class Meta:
@@ -37,6 +61,14 @@ class ClientSerializer(serializers.ModelSerializer):
         ]
 
 
+class ClientImportSerializer(serializers.Serializer):
+    """Serializer of imported client rows."""
+
+    email = serializers.EmailField()
+    name = serializers.CharField(max_length=255)
+    client_rep = serializers.EmailField(required=False, allow_blank=True)
+
+
 class QuestionChoiceSerializer(serializers.ModelSerializer):
     """The question choice serializer."""
 
@@ -70,7 +102,7 @@ class QuestionSerializer(serializers.ModelSerializer):
         ]
 
 
-class QuestionnaireListSerializer(serializers.ModelSerializer):
+class QuestionnaireListSerializer(SparseFieldsModelSerializer):
     """The questionnaire list serializer."""
 
     class Meta:
@@ -107,17 +139,23 @@ class QuestionnaireSerializer(QuestionnaireListSerializer):
             questions = validated_data.pop("questions", [])
             questionnaire = Questionnaire.objects.create(**validated_data)
 
-            for question in questions:
-                choices = question.pop("choices", [])
-                question = Question.objects.create(
-                    **question, questionnaire=questionnaire
-                )
-                choice_objs = [
-                    QuestionChoice(**choice, question=question) for choice in choices
+            question_choices = [question.pop("choices", []) for question in questions]
+            question_objs = Question.objects.bulk_create(
+                [
+                    Question(**question, questionnaire=questionnaire)
+                    for question in questions
                 ]
-                QuestionChoice.objects.bulk_create(choice_objs)
+            )
+            QuestionChoice.objects.bulk_create(
+                [
+                    QuestionChoice(**choice, question=question)
+                    for question, choices in zip(question_objs, question_choices)
+                    for choice in choices
+                ]
+            )
 
-            return questionnaire
+        prefetch_related_objects([questionnaire], get_questions_prefetch())
+        return questionnaire
 
     def validate_questions(self, value):
         """Raise error if there are no questions."""
@@ -159,7 +197,7 @@ class AnswerSerializer(serializers.ModelSerializer):
         ]
 
 
-class ResponseSerializer(serializers.ModelSerializer):
+class ResponseSerializer(SparseFieldsModelSerializer):
     """The response serializer."""
 
     answers = AnswerSerializer(many=True, required=True)
@@ -180,31 +218,49 @@ class ResponseSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create a response."""
-        with transaction.atomic():
-            answers = validated_data.pop("answers", [])
-            response = Response.objects.create(**validated_data)
-
-            for answer in answers:
-                choices = answer.pop("choices", [])
-                answer = Answer.objects.create(**answer, response=response)
-                choice_objs = [
-                    AnswerChoice(**choice, answer=answer) for choice in choices
-                ]
-                AnswerChoice.objects.bulk_create(choice_objs)
-
-            return response
+        (response,) = create_responses([validated_data])
+        prefetch_related_objects([response], "answers__choices")
+        return response
 
     def validate(self, attrs):
-        """Validate that current user is assigned to the questionnaire."""
-        questionnaire = get_object_or_404(
-            Questionnaire, pk=self.context["questionnaire_id"]
+        """Validate the user is assigned to the questionnaire and the answers fit it."""
+        schema = self.context.get("schema") or get_questionnaire_schema(
+            self.context["questionnaire_id"]
         )
-        if questionnaire.client_rep != self.context["user"]:
+        if schema is None or schema.client_rep_id != self.context["user"].pk:
             raise Http404()
+        schema.validate_answers(attrs["answers"])
         return super().validate(attrs)
 
 
-class MonthlyFeedbackSerializer(serializers.ModelSerializer):
+def create_responses(responses_data):
+    """Create responses from validated data in a few bulk statements."""
+    with transaction.atomic():
+        answers_data = [data.pop("answers", []) for data in responses_data]
+        responses = Response.objects.bulk_create(
+            [Response(**data) for data in responses_data]
+        )
+
+        answer_objs = []
+        answer_choices = []
+        for response, answers in zip(responses, answers_data):
+            for answer in answers:
+                answer_choices.append(answer.pop("choices", []))
+                answer_objs.append(Answer(**answer, response=response))
+        answer_objs = Answer.objects.bulk_create(answer_objs)
+        answer_choice_objs = AnswerChoice.objects.bulk_create(
+            [
+                AnswerChoice(**choice, answer=answer)
+                for answer, choices in zip(answer_objs, answer_choices)
+                for choice in choices
+            ]
+        )
+        increment_result_counters(responses, answer_objs, answer_choice_objs)
+    record_responses_submitted(len(responses))
+    return responses
+
+
+class MonthlyFeedbackSerializer(SparseFieldsModelSerializer):
     """Monthly feedback serializer model."""
 
     class Meta:
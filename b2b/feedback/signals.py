@@ -0,0 +1,115 @@
+"""Signal handlers for the feedback app."""
+import time
+
+from celery.signals import task_postrun, task_prerun
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_questionnaire_version
+from .counters import recount_on_commit
+from .metrics import TASK_DURATION
+from .models import Question, QuestionChoice, Questionnaire, Response
+from .permissions import invalidate_user_roles
+
+User = get_user_model()
+
+
+def _invalidate_roles(user_ids):
+    """Invalidate roles now and again once the change is committed."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    invalidate_user_roles(user_ids)
+    transaction.on_commit(lambda: invalidate_user_roles(user_ids))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_membership_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate cached roles when group memberships change."""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        _invalidate_roles([instance.pk])
+    elif action == "pre_clear":
+        _invalidate_roles(instance.user_set.values_list("pk", flat=True))
+    else:
+        _invalidate_roles(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, instance, **kwargs):
+    """Invalidate cached roles of group members when a group is renamed or deleted."""
+    if kwargs.get("created"):
+        return
+    _invalidate_roles(instance.user_set.values_list("pk", flat=True))
+
+
+def _bump_version(questionnaire_id):
+    """Bump the questionnaire version now and again once the change is committed."""
+    if questionnaire_id is None:
+        return
+    bump_questionnaire_version(questionnaire_id)
+    transaction.on_commit(lambda: bump_questionnaire_version(questionnaire_id))
+
+
+@receiver(post_save, sender=Questionnaire)
+@receiver(post_delete, sender=Questionnaire)
+def bump_version_on_questionnaire_change(sender, instance, **kwargs):
+    """Invalidate cached payloads of a changed questionnaire."""
+    _bump_version(instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def bump_version_on_question_change(sender, instance, **kwargs):
+    """Invalidate cached payloads of a changed question's questionnaire."""
+    _bump_version(instance.questionnaire_id)
+
+
+@receiver(post_save, sender=QuestionChoice)
+@receiver(post_delete, sender=QuestionChoice)
+def bump_version_on_choice_change(sender, instance, **kwargs):
+    """Invalidate a changed choice's questionnaire and recount it on deletion."""
+    if QuestionChoice.question.is_cached(instance):
+        questionnaire_id = instance.question.questionnaire_id
+    else:
+        questionnaire_id = (
+            Question.objects.filter(pk=instance.question_id)
+            .values_list("questionnaire_id", flat=True)
+            .first()
+        )
+    _bump_version(questionnaire_id)
+    if kwargs["signal"] is post_delete and questionnaire_id is not None:
+        recount_on_commit(questionnaire_id)
+
+
+@receiver(post_delete, sender=Response)
+def recount_on_response_delete(sender, instance, **kwargs):
+    """Recount the counters of a deleted response's questionnaire."""
+    recount_on_commit(instance.questionnaire_id)
+
+
+# Start times of the Celery tasks running in this process by task id
+_task_started: dict = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    """Note when a Celery task starts running."""
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task_duration(task_id=None, task=None, state=None, **kwargs):
+    """Record a finished Celery task's run time and outcome."""
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
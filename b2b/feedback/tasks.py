@@ -1,30 +1,84 @@
 """Celery tasks for the feedback app."""
+from collections import defaultdict
 from datetime import timedelta
+from smtplib import SMTPException
 
 from celery import shared_task
+from django.conf import settings
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 from feedback.models import Client, Questionnaire, Response
 
-from .email import QuestionnaireReminderEmail
+from .email import BulkEmailDispatcher, QuestionnaireReminderEmail, ResponseAlertEmail
+from .metrics import record_email
+from .routers import use_replica
+from .utils import chunked
+
+
+def _reminder_messages(due_questionnaires, chunk_size):
+    """Yield reminder messages and recipients for (title, client_rep_id) rows."""
+    for questionnaires in chunked(due_questionnaires, chunk_size):
+        client_rep_ids = {client_rep_id for _, client_rep_id in questionnaires}
+        client_emails = defaultdict(list)
+        for client_rep_id, email in Client.objects.filter(
+            client_rep_id__in=client_rep_ids
+        ).values_list("client_rep_id", "email"):
+            client_emails[client_rep_id].append(email)
+
+        for title, client_rep_id in questionnaires:
+            if client_emails[client_rep_id]:
+                message = QuestionnaireReminderEmail(questionnaire_title=title)
+                yield message, client_emails[client_rep_id]
 
 
 @shared_task
 def send_reminder_emails():
     """Send emails to clients whose questionnaires are due in 3 days."""
-    three_days_from_now = timezone.now() + timedelta(days=3)
-    due_questionnaires = Questionnaire.objects.filter(
-        is_active=True,
-        due_at__lte=three_days_from_now,
+    now = timezone.now()
+    chunk_size = settings.FEEDBACK_REMINDER_CHUNK_SIZE
+    due_questionnaires = (
+        Questionnaire.objects.filter(
+            ~Exists(Response.objects.filter(questionnaire=OuterRef("pk"))),
+            is_active=True,
+            client_rep__isnull=False,
+            due_at__gt=now,
+            due_at__lte=now + timedelta(days=3),
+        )
+        .values_list("title", "client_rep_id")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    dispatcher = BulkEmailDispatcher()
+    with use_replica():
+        return dispatcher.send(_reminder_messages(due_questionnaires, chunk_size))
+
+
+@shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_kwargs={"max_retries": 5},
+)
+def send_response_alert_email(questionnaire_id, respondent_name, response_count=1):
+    """Alert a questionnaire's author that it received responses."""
+    questionnaire = (
+        Questionnaire.objects.select_related("author")
+        .filter(pk=questionnaire_id)
+        .first()
     )
+    if questionnaire is None or questionnaire.author is None:
+        return
 
-    for questionnaire in due_questionnaires:
-        responded = Response.objects.filter(questionnaire=questionnaire).exists()
-        if not responded:
-            client_rep = questionnaire.client_rep
-            clients = Client.objects.filter(client_rep=client_rep)
-            client_emails = [client.email for client in clients]
-
-            message = QuestionnaireReminderEmail(
-                questionnaire_title=questionnaire.title,
-            )
-            message.send(client_emails)
+    author = questionnaire.author
+    message = ResponseAlertEmail(
+        questionnaire_title=questionnaire.title,
+        recipient=author,
+        respondent=respondent_name,
+        response_count=response_count,
+    )
+    try:
+        message.send([author.email])
+    except Exception:
+        record_email(message, "failed")
+        raise
+    record_email(message, "sent")
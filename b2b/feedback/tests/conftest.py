@@ -3,11 +3,29 @@ import pytest
 from django.contrib.auth.models import Group
 from django.urls import reverse
 from feedback.models import CLIENT_REP_GROUP, SALES_MANAGER_GROUP, MonthlyFeedback
+from feedback.permissions import clear_local_roles
+from feedback.schema import clear_schemas
 from model_bakery import baker
 
 from .test_feedback_api import QUESTIONNAIRES_URL
 
 
+@pytest.fixture(autouse=True)
+def _clear_local_roles():
+    """Start every test with an empty process local role cache."""
+    clear_local_roles()
+    yield
+    clear_local_roles()
+
+
+@pytest.fixture(autouse=True)
+def _clear_schemas():
+    """Start every test with an empty process local schema cache."""
+    clear_schemas()
+    yield
+    clear_schemas()
+
+
 @pytest.fixture
 def client_payload(client_rep):
     """Return sample payload of client information."""
@@ -21,7 +39,7 @@ def client_payload(client_rep):
 @pytest.fixture
 def sales_manager(sample_user):
     """Return a sales manager user."""
-    sales_managers = baker.make(Group, name=SALES_MANAGER_GROUP)
+    sales_managers, _ = Group.objects.get_or_create(name=SALES_MANAGER_GROUP)
     sample_user.groups.add(sales_managers)
     return sample_user
 
@@ -29,7 +47,7 @@ def sales_manager(sample_user):
 @pytest.fixture
 def client_rep(sample_user):
     """Return a client representative user."""
-    client_reps = baker.make(Group, name=CLIENT_REP_GROUP)
+    client_reps, _ = Group.objects.get_or_create(name=CLIENT_REP_GROUP)
     sample_user.groups.add(client_reps)
     return sample_user
 
@@ -64,6 +82,28 @@ def response_list_url():
     return _get_url
 
 
+@pytest.fixture
+def response_export_url():
+    """Return a questionnaire's response export url."""
+
+    def _get_url(questionnaire_id):
+        return reverse(
+            "feedback:questionnaire-responses-export", args=[questionnaire_id]
+        )
+
+    return _get_url
+
+
+@pytest.fixture
+def response_bulk_url():
+    """Return a questionnaire's bulk response url."""
+
+    def _get_url(questionnaire_id):
+        return reverse("feedback:questionnaire-responses-bulk", args=[questionnaire_id])
+
+    return _get_url
+
+
 @pytest.fixture
 def questionnaire_payload(client_rep):
     """Return a sample questionnaire."""
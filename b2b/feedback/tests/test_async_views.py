@@ -0,0 +1,256 @@
+import asyncio
+import json
+import subprocess
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync
+from core.handlers import ASGIHandler
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, resolve, reverse
+from feedback import urls as feedback_urls
+from feedback.async_views import as_async_urlpatterns
+from feedback.budgets import get_query_budget
+from feedback.models import (
+    Client,
+    MonthlyFeedback,
+    Question,
+    QuestionChoice,
+    Questionnaire,
+    Response,
+)
+from feedback.views import QuestionnaireViewSet
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from .test_feedback_api import MONTHLY_FEEDBACK_URL, QUESTIONNAIRES_URL
+
+ASYNC_URLCONF = __name__
+
+urlpatterns = [
+    path(
+        "feedback/",
+        include((as_async_urlpatterns(feedback_urls.urlpatterns), "feedback")),
+    ),
+]
+
+
+@pytest.fixture
+def questionnaire(sales_manager, client_rep):
+    """Seed questionnaires, responses and feedback, returning a questionnaire."""
+    questionnaires = baker.make(
+        Questionnaire, author=sales_manager, client_rep=client_rep, _quantity=12
+    )
+    questionnaire = questionnaires[0]
+    for order in range(2):
+        question = baker.make(
+            Question,
+            questionnaire=questionnaire,
+            question_type="MULTIPLE_CHOICE",
+            order=order,
+        )
+        baker.make(QuestionChoice, question=question, order=0)
+        baker.make(QuestionChoice, question=question, order=1)
+    baker.make(Response, questionnaire=questionnaire, _quantity=3)
+    baker.make(Client, sales_manager=sales_manager, client_rep=client_rep)
+    for month in ("2023-01", "2023-02", "2023-03"):
+        baker.make(MonthlyFeedback, client_rep=client_rep, month=month)
+    return questionnaire
+
+
+@pytest.fixture
+def token_client(api_client, sales_manager, client_rep):
+    """Return an API client authenticated with a token."""
+    token = Token.objects.create(user=sales_manager)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return api_client
+
+
+def _read_urls(questionnaire):
+    detail_url = reverse("feedback:questionnaire-detail", args=[questionnaire.id])
+    responses_url = reverse(
+        "feedback:questionnaire-responses-list", args=[questionnaire.id]
+    )
+    return [
+        (QUESTIONNAIRES_URL, {}),
+        (QUESTIONNAIRES_URL, {"client_rep": 1, "page": 2}),
+        (QUESTIONNAIRES_URL, {"cursor": "", "fields": "id,title"}),
+        (detail_url, {}),
+        (detail_url, {"fields": "id,questions"}),
+        (responses_url, {"page": 2}),
+        (MONTHLY_FEEDBACK_URL, {"month_from": "2023-02"}),
+    ]
+
+
+def _asgi_get(handler, path, headers=()):
+    """Send a GET request through an ASGI handler, returning status and body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(handler)(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], body
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    """Tests on the async read endpoints."""
+
+    def test_read_routes_are_async(self):
+        """Test only the read routes are served by async views."""
+        detail = resolve("/feedback/questionnaires/1/", urlconf=ASYNC_URLCONF)
+        clients = resolve("/feedback/clients/", urlconf=ASYNC_URLCONF)
+
+        assert asyncio.iscoroutinefunction(detail.func)
+        assert detail.view_name == "feedback:questionnaire-detail"
+        assert detail.func.actions["get"] == "retrieve"
+        assert not asyncio.iscoroutinefunction(clients.func)
+
+    def test_same_payloads_as_sync_views(self, token_client, questionnaire, settings):
+        """Test the async views respond exactly like the sync viewsets."""
+        urls = _read_urls(questionnaire)
+        expected = [token_client.get(url, params).data for url, params in urls]
+        settings.ROOT_URLCONF = ASYNC_URLCONF
+
+        for (url, params), data in zip(urls, expected):
+            response = token_client.get(url, params)
+
+            assert response.status_code == status.HTTP_200_OK, (url, response.data)
+            assert response.data == data, url
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_cold_queries_within_budget(self, token_client, questionnaire):
+        """Test the async detail stays within the retrieve query budget."""
+        url = reverse("feedback:questionnaire-detail", args=[questionnaire.id])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = token_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) <= get_query_budget(QuestionnaireViewSet, "retrieve")
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_unchanged_detail_not_modified(self, token_client, questionnaire):
+        """Test the async detail honours the questionnaire ETag."""
+        url = reverse("feedback:questionnaire-detail", args=[questionnaire.id])
+        etag = token_client.get(url)["ETag"]
+
+        response = token_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    @pytest.mark.parametrize("pk", [0, "abc"])
+    def test_missing_questionnaire_not_found(self, token_client, pk):
+        """Test unknown questionnaires are not found."""
+        url = reverse("feedback:questionnaire-detail", args=[pk])
+
+        response = token_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_invalid_page_not_found(self, token_client, questionnaire):
+        """Test pages past the end are not found."""
+        response = token_client.get(QUESTIONNAIRES_URL, {"page": 3})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_invalid_token_rejected(self, api_client):
+        """Test unknown tokens fail authentication."""
+        api_client.credentials(HTTP_AUTHORIZATION="Token unknown")
+
+        response = api_client.get(QUESTIONNAIRES_URL)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_permissions_checked(self, api_client, django_user_model, questionnaire):
+        """Test users outside the role groups are forbidden."""
+        user = django_user_model.objects.create_user(email="other@example.com")
+        token = Token.objects.create(user=user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        response = api_client.get(MONTHLY_FEEDBACK_URL)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_writes_served_by_sync_viewset(self, token_client, questionnaire_payload):
+        """Test other methods on async routes are handed to the sync viewset."""
+        response = token_client.post(
+            QUESTIONNAIRES_URL, questionnaire_payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+class TestASGIHandler:
+    """Tests on the project's ASGI handler."""
+
+    def test_middleware_chain_is_async(self):
+        """Test the ASGI application runs its middleware on the event loop."""
+        code = (
+            "from asgiref.sync import SyncToAsync\n"
+            "from b2b.asgi import application\n"
+            "print(isinstance(application._middleware_chain, SyncToAsync))\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+
+        assert result.stdout.strip() == "False"
+
+    @pytest.mark.django_db
+    def test_static_files_served(self, settings, tmp_path):
+        """Test static files are served ahead of the middleware chain."""
+        (tmp_path / "app.css").write_text("body {}")
+        settings.STATIC_ROOT = str(tmp_path)
+
+        status_code, body = _asgi_get(ASGIHandler(), "/static/app.css")
+
+        assert status_code == status.HTTP_200_OK
+        assert body == b"body {}"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_streamed(self, questionnaire, sales_manager, response_export_url):
+        """Test exports stream their queries outside the event loop."""
+        token = Token.objects.create(user=sales_manager)
+        headers = [
+            (b"authorization", f"Token {token.key}".encode()),
+            (b"accept", b"application/x-ndjson"),
+        ]
+
+        status_code, body = _asgi_get(
+            ASGIHandler(), response_export_url(questionnaire.id), headers
+        )
+
+        assert status_code == status.HTTP_200_OK
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        assert len(lines) == questionnaire.questionnaire_responses.count()
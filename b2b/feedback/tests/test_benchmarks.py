@@ -0,0 +1,99 @@
+import pytest
+from account import urls as account_urls
+from feedback import urls as feedback_urls
+from feedback.benchmarks.routes import BENCHMARKS
+from feedback.benchmarks.runner import compare, percentile, run_benchmarks
+from feedback.benchmarks.seed import SCALES, seed
+from feedback.benchmarks.servers import get_database_url, run_load
+from feedback.models import Answer, Client, Questionnaire
+
+
+def _route_names():
+    """Return the benchmark names every route needs."""
+    names = set()
+    for pattern in feedback_urls.urlpatterns + account_urls.urlpatterns:
+        actions = getattr(pattern.callback, "actions", None)
+        if actions is None:
+            methods = ["post"] if pattern.name == "login" else ["get"]
+        else:
+            methods = set(actions) - {"head"}
+        names.update(f"{pattern.name}:{method}" for method in methods)
+    return names
+
+
+class TestBenchmarkSuite:
+    """Tests on the benchmark suite."""
+
+    def test_every_route_benchmarked(self):
+        """Test every feedback and account route has a benchmark."""
+        assert _route_names() <= set(BENCHMARKS)
+
+    def test_percentile_uses_nearest_rank(self):
+        """Test percentiles pick the nearest ranked timing."""
+        timings = list(range(1, 101))
+
+        assert percentile(timings, 50) == 50
+        assert percentile(timings, 99) == 99
+        assert percentile([7], 95) == 7
+
+    def test_compare_flags_slower_and_chattier_results(self):
+        """Test regressions are reported against the baseline."""
+        baseline = {
+            "a:get": {"p95": 10.0, "queries": 2},
+            "b:get": {"p95": 10.0, "queries": 2},
+            "c:get": {"p95": 10.0, "queries": 2},
+        }
+        results = {
+            "a:get": {"p95": 11.0, "queries": 2},
+            "b:get": {"p95": 13.0, "queries": 2},
+            "c:get": {"p95": 9.0, "queries": 3},
+            "d:get": {"p95": 99.0, "queries": 9},
+        }
+
+        regressions = compare(results, baseline, tolerance=0.2)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("b:get: p95")
+        assert regressions[1].startswith("c:get: 3 queries")
+
+    @pytest.mark.django_db
+    def test_suite_runs_at_tiny_scale(self):
+        """Test seeding and every benchmark succeed on a tiny dataset."""
+        scale = SCALES["tiny"]
+        dataset = seed(scale)
+
+        assert Client.objects.count() == scale.clients + scale.deletable_clients
+        assert Questionnaire.objects.count() == scale.questionnaires
+        assert Answer.objects.count() == scale.answers
+
+        results = run_benchmarks(dataset, iterations=2, warmup=0)
+
+        assert set(results) == set(BENCHMARKS)
+        for result in results.values():
+            assert result["p50"] <= result["p95"] <= result["max"]
+            assert result["queries"] >= 0
+        assert results["client-list:get"]["queries"] > 0
+
+
+class TestServerBenchmark:
+    """Tests on the server load test."""
+
+    def test_database_url_points_at_benchmark_database(self):
+        """Test servers are pointed at the benchmark database."""
+        url = get_database_url(
+            "postgres://user:pass@db:5432/feedback?sslmode=require", "test_feedback"
+        )
+
+        assert url == "postgres://user:pass@db:5432/test_feedback?sslmode=require"
+
+    def test_load_run_measures_throughput(self, live_server, settings):
+        """Test a load run measures successful requests against a live server."""
+        settings.ALLOWED_HOSTS = ["127.0.0.1"]
+        port = int(live_server.url.rsplit(":", 1)[1])
+
+        result = run_load(port, "/", "Token none", concurrency=4, duration=0.5)
+
+        assert result["requests"] > 0
+        assert result["errors"] == 0
+        assert result["p50"] <= result["p99"] <= result["max"]
+        assert result["throughput"] == pytest.approx(result["requests"] / 0.5)
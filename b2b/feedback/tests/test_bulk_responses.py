@@ -0,0 +1,138 @@
+import copy
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from feedback.models import Answer, AnswerChoice, Questionnaire, Response
+from feedback.permissions import get_user_roles
+from model_bakery import baker
+from rest_framework import status
+
+
+@pytest.mark.django_db
+class TestBulkResponses:
+    """Tests on bulk response submission."""
+
+    def test_bulk_creates_responses_with_one_alert(
+        self,
+        api_client,
+        client_rep,
+        django_capture_on_commit_callbacks,
+        response_bulk_url,
+        response_payload,
+    ):
+        """Test a batch is created with its answers and a single alert."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                response_bulk_url(questionnaire.id),
+                [response_payload] * 3,
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [item["index"] for item in response.data["created"]] == [0, 1, 2]
+        assert response.data["errors"] == []
+        assert Response.objects.filter(respondent=client_rep).count() == 3
+        assert Answer.objects.count() == 12
+        assert AnswerChoice.objects.count() == 12
+        questionnaire.refresh_from_db()
+        assert questionnaire.response_count == 3
+        assert len(mail.outbox) == 1
+        assert "3 responses" in mail.outbox[0].body
+
+    def test_invalid_items_reported_without_aborting(
+        self, api_client, client_rep, response_bulk_url, response_payload
+    ):
+        """Test invalid items are reported while valid ones are created."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+        missing_question = {"answers": [{"answer_text": "No question"}]}
+        foreign_question = copy.deepcopy(response_payload)
+        foreign_question["answers"][0]["question_id"] = baker.make(
+            "feedback.Question"
+        ).id
+        foreign_choice = copy.deepcopy(response_payload)
+        foreign_choice["answers"][1]["choices"] = [
+            {"question_choice_id": baker.make("feedback.QuestionChoice").id}
+        ]
+
+        response = api_client.post(
+            response_bulk_url(questionnaire.id),
+            [missing_question, response_payload, foreign_question, foreign_choice],
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [item["index"] for item in response.data["created"]] == [1]
+        errors = {item["index"]: item["errors"] for item in response.data["errors"]}
+        assert list(errors) == [0, 2, 3]
+        assert "question_id" in errors[2]["answers"][0]
+        assert "choices" in errors[3]["answers"][1]
+        assert Response.objects.count() == 1
+
+    def test_bulk_query_count_independent_of_batch_size(
+        self, api_client, client_rep, response_bulk_url, response_payload
+    ):
+        """Test a batch runs the same number of queries whatever its size."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+        url = response_bulk_url(questionnaire.id)
+        # Warm the role and schema caches
+        api_client.post(url, [response_payload], format="json")
+        get_user_roles(client_rep)
+
+        query_counts = []
+        for size in (1, 10):
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(
+                    url, [response_payload] * size, format="json"
+                )
+            assert response.status_code == status.HTTP_201_CREATED
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+    @pytest.mark.parametrize("payload", [[], {"answers": []}])
+    def test_bulk_requires_list_of_responses(
+        self, api_client, client_rep, response_bulk_url, response_payload, payload
+    ):
+        """Test the payload must be a non empty list."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+
+        response = api_client.post(
+            response_bulk_url(questionnaire.id), payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_to_unassigned_questionnaire_not_found(
+        self, api_client, client_rep, response_bulk_url, response_payload
+    ):
+        """Test client reps cannot respond to questionnaires of others."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = baker.make(Questionnaire, client_rep=None)
+
+        response = api_client.post(
+            response_bulk_url(questionnaire.id), [response_payload], format="json"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert Response.objects.count() == 0
+
+    def test_sales_manager_cannot_bulk_respond(
+        self, api_client, sample_user, response_bulk_url
+    ):
+        """Test only client reps may submit responses in bulk."""
+        api_client.force_authenticate(user=sample_user)
+        questionnaire = baker.make(Questionnaire, client_rep=sample_user)
+
+        response = api_client.post(
+            response_bulk_url(questionnaire.id), [{"answers": []}], format="json"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,124 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from feedback.models import Question, QuestionChoice, Questionnaire
+from feedback.permissions import get_user_roles
+from model_bakery import baker
+from rest_framework import status
+
+from .test_feedback_api import QUESTIONNAIRES_URL
+
+
+@pytest.fixture
+def questionnaire(api_client, sales_manager, questionnaire_payload):
+    """Create a questionnaire through the API."""
+    api_client.force_authenticate(user=sales_manager)
+    response = api_client.post(QUESTIONNAIRES_URL, questionnaire_payload, format="json")
+    return Questionnaire.objects.get(pk=response.data["id"])
+
+
+@pytest.mark.django_db
+class TestQuestionnaireDetailCache:
+    """Tests on cached questionnaire details."""
+
+    def test_detail_served_from_cache(
+        self, api_client, sales_manager, questionnaire, questionnaire_detail_url
+    ):
+        """Test repeated retrievals skip loading the questions."""
+        url = questionnaire_detail_url(questionnaire.id)
+        first = api_client.get(url)
+        get_user_roles(sales_manager)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = api_client.get(url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert second["ETag"] == first["ETag"]
+        assert len(queries) == 1
+
+    @pytest.mark.parametrize("questionnaire_id", [0, "abc"])
+    def test_missing_questionnaire_not_found(
+        self, api_client, sales_manager, questionnaire_detail_url, questionnaire_id
+    ):
+        """Test retrieving an unknown or malformed questionnaire id is not found."""
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(questionnaire_detail_url(questionnaire_id))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unchanged_detail_not_modified(
+        self, api_client, questionnaire, questionnaire_detail_url
+    ):
+        """Test a matching If-None-Match returns 304 without a body."""
+        url = questionnaire_detail_url(questionnaire.id)
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda questionnaire: Questionnaire.objects.get(pk=questionnaire.pk).save(),
+            lambda questionnaire: Question.objects.filter(questionnaire=questionnaire)
+            .first()
+            .save(),
+            lambda questionnaire: QuestionChoice.objects.filter(
+                question__questionnaire=questionnaire
+            )
+            .first()
+            .delete(),
+        ],
+        ids=["questionnaire", "question", "choice"],
+    )
+    def test_changes_invalidate_cached_detail(
+        self,
+        api_client,
+        questionnaire,
+        questionnaire_detail_url,
+        django_capture_on_commit_callbacks,
+        change,
+    ):
+        """Test saving the questionnaire or its parts changes the ETag."""
+        url = questionnaire_detail_url(questionnaire.id)
+        etag = api_client.get(url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            change(questionnaire)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_edited_question_served_fresh(
+        self, api_client, questionnaire, questionnaire_detail_url
+    ):
+        """Test edits are visible right after they are saved."""
+        url = questionnaire_detail_url(questionnaire.id)
+        api_client.get(url)
+        question = questionnaire.questions.get(order=1)
+        question.question_text = "What is your full name?"
+        question.save()
+
+        response = api_client.get(url)
+
+        texts = [q["question_text"] for q in response.data["questions"]]
+        assert "What is your full name?" in texts
+
+    def test_cached_detail_respects_filters(
+        self, api_client, sales_manager, questionnaire_detail_url
+    ):
+        """Test cached details are only served for the filtered queryset."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire, client_rep=None)
+        url = questionnaire_detail_url(questionnaire.id)
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+        response = api_client.get(url, {"client_rep": 1})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,145 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from feedback.models import Client
+from feedback.permissions import get_user_roles
+from rest_framework import status
+
+User = get_user_model()
+
+CLIENT_IMPORT_URL = reverse("feedback:client-import")
+
+
+def _csv_file(rows, header="email,name,client_rep"):
+    """Return an uploaded CSV file with the rows."""
+    content = "\n".join([header, *rows]) + "\n"
+    return SimpleUploadedFile("clients.csv", content.encode(), "text/csv")
+
+
+@pytest.mark.django_db
+class TestClientImport:
+    """Tests on bulk client imports."""
+
+    def test_csv_import_creates_clients(self, api_client, sales_manager, client_rep):
+        """Test CSV rows are created for the current sales manager."""
+        api_client.force_authenticate(user=sales_manager)
+        upload = _csv_file(
+            [
+                f"one@example.com,Client One,{client_rep.email}",
+                "two@example.com,Client Two,",
+            ]
+        )
+
+        response = api_client.post(CLIENT_IMPORT_URL, {"file": upload})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {"created": 2, "error_count": 0, "errors": []}
+        clients = Client.objects.order_by("email")
+        assert [client.sales_manager for client in clients] == [sales_manager] * 2
+        assert [client.client_rep for client in clients] == [client_rep, None]
+
+    def test_ndjson_import_creates_clients(self, api_client, sales_manager):
+        """Test NDJSON rows are imported too."""
+        api_client.force_authenticate(user=sales_manager)
+        content = "\n".join(
+            json.dumps({"email": f"client{i}@example.com", "name": f"Client {i}"})
+            for i in range(3)
+        )
+        upload = SimpleUploadedFile(
+            "clients.ndjson", content.encode(), "application/x-ndjson"
+        )
+
+        response = api_client.post(CLIENT_IMPORT_URL, {"file": upload})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Client.objects.filter(sales_manager=sales_manager).count() == 3
+
+    def test_invalid_rows_reported_by_line(self, api_client, sales_manager):
+        """Test invalid rows are reported without aborting the import."""
+        api_client.force_authenticate(user=sales_manager)
+        other_user = User.objects.create_user(email="other@example.com")
+        upload = _csv_file(
+            [
+                "not-an-email,Client One,",
+                "two@example.com,Client Two,",
+                "three@example.com,,",
+                f"four@example.com,Client Four,{other_user.email}",
+            ]
+        )
+
+        response = api_client.post(CLIENT_IMPORT_URL, {"file": upload})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 1
+        assert response.data["error_count"] == 3
+        errors = {error["line"]: error["errors"] for error in response.data["errors"]}
+        assert list(errors) == [2, 4, 5]
+        assert "email" in errors[2]
+        assert "name" in errors[4]
+        assert "client_rep" in errors[5]
+
+    def test_reported_errors_capped(self, api_client, sales_manager, settings):
+        """Test only the first row errors are kept in the report."""
+        settings.FEEDBACK_CLIENT_IMPORT_MAX_ERRORS = 2
+        api_client.force_authenticate(user=sales_manager)
+        upload = _csv_file([f"bad{i},Client," for i in range(5)])
+
+        response = api_client.post(CLIENT_IMPORT_URL, {"file": upload})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["error_count"] == 5
+        assert len(response.data["errors"]) == 2
+
+    def test_import_queries_per_batch(
+        self, api_client, sales_manager, client_rep, settings
+    ):
+        """Test each batch runs a fixed number of queries whatever its size."""
+        settings.FEEDBACK_CLIENT_IMPORT_BATCH_SIZE = 100
+        api_client.force_authenticate(user=sales_manager)
+        get_user_roles(sales_manager)
+
+        query_counts = []
+        for size in (5, 50):
+            upload = _csv_file(
+                [
+                    f"client{i}@example.com,Client {i},{client_rep.email}"
+                    for i in range(size)
+                ]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(CLIENT_IMPORT_URL, {"file": upload})
+            assert response.status_code == status.HTTP_201_CREATED
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+    @pytest.mark.parametrize(
+        "upload",
+        [
+            SimpleUploadedFile("clients.csv", b"email\nx@example.com\n", "text/csv"),
+            SimpleUploadedFile("clients.csv", "é".encode("latin-1"), "text/csv"),
+        ],
+        ids=["missing-header", "not-utf8"],
+    )
+    def test_unreadable_files_rejected(self, api_client, sales_manager, upload):
+        """Test files without the expected header or encoding are rejected."""
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.post(CLIENT_IMPORT_URL, {"file": upload})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "file" in response.data
+        assert not Client.objects.exists()
+
+    def test_client_rep_cannot_import(self, api_client, client_rep):
+        """Test only sales managers may import clients."""
+        api_client.force_authenticate(user=client_rep)
+
+        response = api_client.post(CLIENT_IMPORT_URL, {"file": _csv_file([])})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,124 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from feedback.models import (
+    Answer,
+    AnswerChoice,
+    Question,
+    QuestionChoice,
+    Questionnaire,
+    Response,
+)
+from model_bakery import baker
+from rest_framework import status
+
+
+@pytest.mark.django_db
+class TestResultCounters:
+    """Tests on the denormalized result counters."""
+
+    def test_submission_increments_counters_in_batched_updates(
+        self, api_client, client_rep, response_list_url, response_payload
+    ):
+        """Test a submission updates each counter table with one UPDATE."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                response_list_url(questionnaire.id), response_payload, format="json"
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        assert len(updates) == 3
+        questionnaire.refresh_from_db()
+        assert questionnaire.response_count == 1
+        answered_counts = questionnaire.questions.values_list(
+            "answered_count", flat=True
+        )
+        assert list(answered_counts) == [1, 1, 1, 1]
+        assert QuestionChoice.objects.filter(answer_count=1).count() == 4
+
+    def test_rebuild_fixes_drifted_counters(self):
+        """Test the rebuild command recomputes counters from the answers."""
+        questionnaire = baker.make(Questionnaire, response_count=5)
+        question = baker.make(Question, questionnaire=questionnaire)
+        unanswered = baker.make(Question, questionnaire=questionnaire)
+        choice = baker.make(QuestionChoice, question=question, answer_count=7)
+        for response in baker.make(Response, questionnaire=questionnaire, _quantity=2):
+            answer = baker.make(
+                Answer, response=response, question=question, answer_text=""
+            )
+            baker.make(AnswerChoice, answer=answer, question_choice=choice)
+            baker.make(Answer, response=response, question=unanswered, answer_text="")
+
+        with pytest.raises(CommandError):
+            call_command("rebuild_result_counters", check=True)
+
+        call_command("rebuild_result_counters")
+
+        questionnaire.refresh_from_db()
+        question.refresh_from_db()
+        unanswered.refresh_from_db()
+        choice.refresh_from_db()
+        assert questionnaire.response_count == 2
+        assert question.answered_count == 2
+        assert unanswered.answered_count == 0
+        assert choice.answer_count == 2
+        call_command("rebuild_result_counters", check=True)
+
+    def test_deletions_recount_counters_on_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        """Test deleting responses and choices recounts their counters once."""
+        questionnaire = baker.make(Questionnaire)
+        question = baker.make(Question, questionnaire=questionnaire)
+        choice, removed = baker.make(QuestionChoice, question=question, _quantity=2)
+        responses = baker.make(Response, questionnaire=questionnaire, _quantity=3)
+        for response in responses:
+            answer = baker.make(
+                Answer, response=response, question=question, answer_text=""
+            )
+            baker.make(AnswerChoice, answer=answer, question_choice=choice)
+        answer = baker.make(Answer, question=question, answer_text="")
+        baker.make(AnswerChoice, answer=answer, question_choice=removed)
+        call_command("rebuild_result_counters")
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            Response.objects.filter(
+                pk__in=[response.pk for response in responses[:2]]
+            ).delete()
+            removed.delete()
+
+        questionnaire.refresh_from_db()
+        question.refresh_from_db()
+        choice.refresh_from_db()
+        assert questionnaire.response_count == 1
+        assert question.answered_count == 1
+        assert choice.answer_count == 1
+        recounts = [c for c in callbacks if c.__name__ == "_recount_deleted"]
+        assert len(recounts) == 1
+        call_command("rebuild_result_counters", check=True)
+
+    def test_questionnaire_deletion_fast_deletes_answers(self):
+        """Test answers are deleted by id and answer choices without loading them."""
+        questionnaire = baker.make(Questionnaire)
+        question = baker.make(Question, questionnaire=questionnaire)
+        choice = baker.make(QuestionChoice, question=question)
+        for response in baker.make(Response, questionnaire=questionnaire, _quantity=3):
+            answer = baker.make(Answer, response=response, question=question)
+            baker.make(AnswerChoice, answer=answer, question_choice=choice)
+
+        with CaptureQueriesContext(connection) as queries:
+            questionnaire.delete()
+
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        answer_selects = [sql for sql in selects if 'FROM "feedback_answer' in sql]
+        assert len(answer_selects) == 2
+        assert all(
+            sql.startswith('SELECT "feedback_answer"."id" FROM "feedback_answer"')
+            for sql in answer_selects
+        )
@@ -0,0 +1,88 @@
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+from django.core import mail
+from feedback.email import BulkEmailDispatcher, QuestionnaireReminderEmail
+
+
+class RecordingHandler:
+    """SMTP handler recording received messages and their sessions."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture
+def smtp_server(settings):
+    """Run a local SMTP server and point the email settings at it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST = "127.0.0.1"
+    settings.EMAIL_PORT = port
+    settings.EMAIL_HOST_USER = ""
+    settings.EMAIL_HOST_PASSWORD = ""
+    settings.EMAIL_USE_TLS = False
+    yield handler
+    controller.stop()
+
+
+def _messages(count):
+    return [
+        (
+            QuestionnaireReminderEmail(questionnaire_title=f"Questionnaire {i}"),
+            [f"client{i}@example.com"],
+        )
+        for i in range(count)
+    ]
+
+
+class TestBulkEmailDispatcher:
+    """Tests on the bulk email dispatcher."""
+
+    def test_messages_rendered_and_sent(self):
+        """Test every message is rendered and delivered."""
+        dispatcher = BulkEmailDispatcher(concurrency=2, messages_per_connection=3)
+
+        sent, failed = dispatcher.send(_messages(10))
+
+        assert (sent, failed) == (10, 0)
+        assert len(mail.outbox) == 10
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        assert recipients == sorted(f"client{i}@example.com" for i in range(10))
+        assert all("Questionnaire" in message.body for message in mail.outbox)
+
+    def test_connections_reused_over_smtp(self, smtp_server):
+        """Test messages share a bounded number of SMTP connections."""
+        dispatcher = BulkEmailDispatcher(concurrency=2, messages_per_connection=5)
+
+        sent, failed = dispatcher.send(_messages(20))
+
+        assert (sent, failed) == (20, 0)
+        assert len(smtp_server.messages) == 20
+        assert 4 <= len(smtp_server.sessions) <= 5
+
+    def test_failures_counted_without_aborting(self, settings):
+        """Test failed deliveries are reported and do not stop the run."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST = "127.0.0.1"
+        settings.EMAIL_PORT = port
+        dispatcher = BulkEmailDispatcher(concurrency=2, messages_per_connection=5)
+
+        sent, failed = dispatcher.send(_messages(3))
+
+        assert (sent, failed) == (0, 3)
@@ -1,17 +1,27 @@
+import csv
+import io
+import json
+
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from feedback.models import (
     CLIENT_REP_GROUP,
+    Answer,
     AnswerChoice,
     Client,
     MonthlyFeedback,
+    Question,
+    QuestionChoice,
     Questionnaire,
     Response,
 )
+from feedback.permissions import get_user_roles
 from feedback.serializers import (
     ClientSerializer,
     QuestionnaireListSerializer,
@@ -151,6 +161,36 @@ class TestManageQuestionnaires:
         assert questions[0].required == questions[1].required is True
         assert questions[2].required == questions[3].required is False
 
+    def test_create_questionnaire_query_count_is_constant(
+        self, api_client, questionnaire_payload, sales_manager
+    ):
+        """Test questionnaire creation costs the same queries for any size."""
+        api_client.force_authenticate(user=sales_manager)
+        get_user_roles(sales_manager)
+        query_counts = []
+
+        for size in (1, 25):
+            payload = {
+                **questionnaire_payload,
+                "questions": questionnaire_payload["questions"] * size,
+            }
+
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(QUESTIONNAIRES_URL, payload, format="json")
+
+            assert response.status_code == status.HTTP_201_CREATED
+            questionnaire = Questionnaire.objects.get(pk=response.data["id"])
+            assert questionnaire.questions.count() == 4 * size
+            assert (
+                QuestionChoice.objects.filter(
+                    question__questionnaire=questionnaire
+                ).count()
+                == 8 * size
+            )
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
     def test_only_sales_manager_can_create_questionnaire(
         self, api_client, questionnaire_payload, sample_user
     ):
@@ -213,14 +253,20 @@ class TestManageResponses:
     """Tests on questionnaire management."""
 
     def test_client_rep_create_response_returns_201(
-        self, api_client, client_rep, response_list_url, response_payload
+        self,
+        api_client,
+        client_rep,
+        django_capture_on_commit_callbacks,
+        response_list_url,
+        response_payload,
     ):
         """Test creating a questionnaire is successful."""
         api_client.force_authenticate(user=client_rep)
         questionnaire = Questionnaire.objects.get(client_rep=client_rep)
         url = response_list_url(questionnaire.id)
 
-        response = api_client.post(url, response_payload, format="json")
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(url, response_payload, format="json")
 
         assert response.status_code == status.HTTP_201_CREATED
         responses = Response.objects.filter(respondent=response.data["respondent"])
@@ -238,6 +284,52 @@ class TestManageResponses:
         assert mail.outbox[0].to[0] == questionnaire.author.email
         assert mail.outbox[0].from_email == settings.DEFAULT_FROM_EMAIL
 
+    def test_create_response_query_count_is_constant(
+        self, api_client, client_rep, response_list_url
+    ):
+        """Test response creation costs the same queries for any questionnaire size."""
+        api_client.force_authenticate(user=client_rep)
+        get_user_roles(client_rep)
+        query_counts = []
+
+        for size in (5, 50):
+            questionnaire = baker.make(
+                Questionnaire, client_rep=client_rep, author=baker.make(User)
+            )
+            questions = baker.make(
+                Question,
+                questionnaire=questionnaire,
+                question_type="MULTIPLE_CHOICE",
+                _quantity=size,
+            )
+            choices = [baker.make(QuestionChoice, question=q) for q in questions]
+            payload = {
+                "answers": [
+                    {
+                        "question_id": question.id,
+                        "answer_text": "",
+                        "choices": [{"question_choice_id": choice.id}],
+                    }
+                    for question, choice in zip(questions, choices)
+                ]
+            }
+            url = response_list_url(questionnaire.id)
+
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.post(url, payload, format="json")
+
+            assert response.status_code == status.HTTP_201_CREATED
+            assert len(response.data["answers"]) == size
+            assert (
+                AnswerChoice.objects.filter(
+                    answer__response_id=response.data["id"]
+                ).count()
+                == size
+            )
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
     def test_client_reps_cannot_respond_unassigned_questionnaires(
         self, api_client, client_rep, response_list_url, response_payload
     ):
@@ -284,6 +376,74 @@ class TestManageResponses:
         assert response.data["count"] == 2
         assert len(response.data["results"]) == 1
 
+    def test_list_responses_query_count_is_constant(
+        self, api_client, response_list_url, sales_manager
+    ):
+        """Test listing responses costs the same queries for any page size."""
+        api_client.force_authenticate(user=sales_manager)
+        get_user_roles(sales_manager)
+        questionnaire = baker.make(Questionnaire)
+        question = baker.make(Question, questionnaire=questionnaire)
+        choice = baker.make(QuestionChoice, question=question)
+        for response in baker.make(Response, questionnaire=questionnaire, _quantity=10):
+            answers = baker.make(
+                Answer, response=response, question=question, _quantity=3
+            )
+            for answer in answers:
+                baker.make(AnswerChoice, answer=answer, question_choice=choice)
+        url = response_list_url(questionnaire.id)
+        query_counts = []
+
+        for page_size in (1, 10):
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(url, {"page_size": page_size})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data["results"]) == page_size
+            assert all(
+                len(answer["choices"]) == 1
+                for item in response.data["results"]
+                for answer in item["answers"]
+            )
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+    def test_sales_manager_pages_responses_with_cursor(
+        self, api_client, response_list_url, sales_manager
+    ):
+        """Test responses can be paged with keyset cursors."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire)
+        responses = baker.make(Response, questionnaire=questionnaire, _quantity=5)
+        url = response_list_url(questionnaire.id)
+
+        response = api_client.get(url, {"cursor": "", "page_size": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        ids = [item["id"] for item in response.data["results"]]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            ids += [item["id"] for item in response.data["results"]]
+        assert ids == sorted(obj.id for obj in responses)
+
+    def test_sales_manager_sets_response_page_size(
+        self, api_client, response_list_url, sales_manager
+    ):
+        """Test page number pagination accepts a page size."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire)
+        baker.make(Response, questionnaire=questionnaire, _quantity=3)
+        url = response_list_url(questionnaire.id)
+
+        response = api_client.get(url, {"page": 2, "page_size": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        assert len(response.data["results"]) == 1
+
     def test_client_rep_cannot_list_responses_403(
         self, api_client, client_rep, response_list_url
     ):
@@ -297,6 +457,174 @@ class TestManageResponses:
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+@pytest.mark.django_db
+class TestQuestionnaireResults:
+    """Tests on aggregated questionnaire results."""
+
+    def _submit(self, api_client, client_rep, response_payload, count):
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+        url = reverse("feedback:questionnaire-responses-list", args=[questionnaire.id])
+        for _ in range(count):
+            response = api_client.post(url, response_payload, format="json")
+            assert response.status_code == status.HTTP_201_CREATED
+        return questionnaire
+
+    def test_sales_manager_get_results_200(
+        self, api_client, client_rep, response_payload, sales_manager
+    ):
+        """Test results aggregate the questionnaire's responses."""
+        self._submit(api_client, client_rep, response_payload, 2)
+        response_payload["answers"][2]["choices"] = []
+        questionnaire = self._submit(api_client, client_rep, response_payload, 1)
+        url = reverse("feedback:questionnaire-results", args=[questionnaire.id])
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["response_count"] == 3
+        open_question, logical, multiple_choice, dropdown = response.data["questions"]
+        assert open_question["answered_count"] == 3
+        assert open_question["completion_rate"] == 1.0
+        assert "choices" not in open_question
+        assert logical["split"] == {"true": 3, "false": 0}
+        assert multiple_choice["answered_count"] == 2
+        assert multiple_choice["completion_rate"] == round(2 / 3, 4)
+        assert [c["count"] for c in multiple_choice["choices"]] == [2, 2, 0]
+        assert [c["count"] for c in dropdown["choices"]] == [0, 0, 3]
+
+    def test_results_query_count_is_constant(
+        self, api_client, client_rep, response_payload, sales_manager
+    ):
+        """Test results cost the same queries for any number of responses."""
+        questionnaire = self._submit(api_client, client_rep, response_payload, 1)
+        url = reverse("feedback:questionnaire-results", args=[questionnaire.id])
+        api_client.force_authenticate(user=sales_manager)
+        query_counts = []
+
+        for count in (1, 10):
+            self._submit(api_client, client_rep, response_payload, count)
+            api_client.force_authenticate(user=sales_manager)
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(url)
+
+            assert response.status_code == status.HTTP_200_OK
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+    def test_client_rep_cannot_get_results_403(self, api_client, client_rep):
+        """Test client reps cannot see questionnaire results."""
+        questionnaire = baker.make(Questionnaire, client_rep=client_rep)
+        url = reverse("feedback:questionnaire-results", args=[questionnaire.id])
+        api_client.force_authenticate(user=client_rep)
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestExportResponses:
+    """Tests on questionnaire response exports."""
+
+    def _make_responses(self, questionnaire, count):
+        question = baker.make(Question, questionnaire=questionnaire)
+        choices = baker.make(QuestionChoice, question=question, _quantity=2)
+        for response in baker.make(
+            Response, questionnaire=questionnaire, _quantity=count
+        ):
+            answer = baker.make(
+                Answer, response=response, question=question, answer_text="Text"
+            )
+            for choice in choices:
+                baker.make(AnswerChoice, answer=answer, question_choice=choice)
+        return question, choices
+
+    def test_export_responses_as_csv(
+        self, api_client, response_export_url, sales_manager
+    ):
+        """Test responses are streamed as CSV rows."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire)
+        question, choices = self._make_responses(questionnaire, 3)
+        self._make_responses(baker.make(Questionnaire), 1)
+
+        response = api_client.get(
+            response_export_url(questionnaire.id), {"format": "csv"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"].startswith("text/csv")
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 3
+        assert {row["question_id"] for row in rows} == {str(question.id)}
+        assert rows[0]["answer_text"] == "Text"
+        assert rows[0]["choices"] == "; ".join(choice.value for choice in choices)
+
+    def test_export_responses_as_ndjson(
+        self, api_client, response_export_url, sales_manager
+    ):
+        """Test responses are streamed as JSON lines."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire)
+        question, choices = self._make_responses(questionnaire, 2)
+
+        response = api_client.get(
+            response_export_url(questionnaire.id), {"format": "ndjson"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        content = b"".join(response.streaming_content).decode()
+        lines = [json.loads(line) for line in content.splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["answers"] == [
+            {
+                "question_id": question.id,
+                "answer_text": "Text",
+                "choices": [choice.value for choice in choices],
+            }
+        ]
+
+    def test_export_unknown_format_returns_404(
+        self, api_client, response_export_url, sales_manager
+    ):
+        """Test unsupported export formats are rejected."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire)
+
+        response = api_client.get(
+            response_export_url(questionnaire.id), {"format": "xml"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize("questionnaire_id", [0, "abc"])
+    def test_export_unknown_questionnaire_returns_404(
+        self, api_client, response_export_url, sales_manager, questionnaire_id
+    ):
+        """Test exporting a missing questionnaire's responses is not found."""
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(response_export_url(questionnaire_id))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_client_rep_cannot_export_responses_403(
+        self, api_client, client_rep, response_export_url
+    ):
+        """Test client reps cannot export responses."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = baker.make(Questionnaire)
+
+        response = api_client.get(response_export_url(questionnaire.id))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.django_db
 class TestManageMonthlyFeedback:
     """Tests on monthly feedback management."""
@@ -343,6 +671,34 @@ class TestManageMonthlyFeedback:
         assert MonthlyFeedback.objects.count() == 2
         assert response.data["count"] == 1
 
+    def test_sales_manager_filter_monthly_feedback_by_month_200(
+        self, api_client, client_rep, sales_manager
+    ):
+        """Test sales manager can list monthly feedback in a month range."""
+        baker.make(Client, client_rep=client_rep, sales_manager=sales_manager)
+        baker.make(Client, client_rep=None, sales_manager=sales_manager)
+        for month in ("2022-12", "2023-01", "2023-02", "2023-03"):
+            baker.make(MonthlyFeedback, client_rep=client_rep, month=month)
+        baker.make(MonthlyFeedback, month="2023-02")
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(
+            MONTHLY_FEEDBACK_URL, {"month_from": "2023-01", "month_to": "2023-02"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        months = [feedback["month"] for feedback in response.data["results"]]
+        assert months == ["2023-02", "2023-01"]
+
+    def test_invalid_month_filter_returns_400(self, api_client, sales_manager):
+        """Test month range filters must be in the YYYY-MM format."""
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(MONTHLY_FEEDBACK_URL, {"month_from": "January"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "month_from" in response.data
+
     def test_only_sales_managers_can_list_monthly_feedback_403(
         self, api_client, client_rep, sample_user
     ):
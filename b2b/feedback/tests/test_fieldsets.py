@@ -0,0 +1,156 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from feedback.models import MonthlyFeedback, Questionnaire
+from feedback.permissions import get_user_roles
+from model_bakery import baker
+from rest_framework import status
+
+from .test_feedback_api import CLIENTS_URL, MONTHLY_FEEDBACK_URL, QUESTIONNAIRES_URL
+
+
+def _selects(queries, table):
+    """Return the select queries on the table."""
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests on the fields query parameter and lean read querysets."""
+
+    def test_questionnaire_list_skips_questions_and_description(
+        self, api_client, sales_manager, questionnaire_payload
+    ):
+        """Test listing questionnaires loads neither questions nor descriptions."""
+        api_client.force_authenticate(user=sales_manager)
+        api_client.post(QUESTIONNAIRES_URL, questionnaire_payload, format="json")
+        get_user_roles(sales_manager)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(QUESTIONNAIRES_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "title", "due_at"}
+        assert _selects(queries, "feedback_question") == []
+        select = _selects(queries, "feedback_questionnaire")[-1]
+        assert '"description"' not in select
+
+    def test_fields_limit_list_output_and_columns(self, api_client, sales_manager):
+        """Test requested fields limit both the output and the loaded columns."""
+        api_client.force_authenticate(user=sales_manager)
+        baker.make(Questionnaire, _quantity=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(QUESTIONNAIRES_URL, {"fields": "title"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [set(item) for item in response.data["results"]] == [{"title"}] * 3
+        select = _selects(queries, "feedback_questionnaire")[-1]
+        assert '"due_at"' not in select
+
+    def test_fields_limit_detail_output(
+        self, api_client, sales_manager, questionnaire_payload, questionnaire_detail_url
+    ):
+        """Test sparse details skip the questions and get their own ETag."""
+        api_client.force_authenticate(user=sales_manager)
+        created = api_client.post(
+            QUESTIONNAIRES_URL, questionnaire_payload, format="json"
+        )
+        url = questionnaire_detail_url(created.data["id"])
+        full = api_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,description"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "id": created.data["id"],
+            "description": "Sample description",
+        }
+        assert response["ETag"] != full["ETag"]
+        assert _selects(queries, "feedback_question") == []
+        assert api_client.get(url).data == full.data
+
+    def test_detail_questions_and_choices_ordered(
+        self, api_client, sales_manager, questionnaire_payload, questionnaire_detail_url
+    ):
+        """Test sparse details prefetch questions and choices in creation order."""
+        api_client.force_authenticate(user=sales_manager)
+        created = api_client.post(
+            QUESTIONNAIRES_URL, questionnaire_payload, format="json"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                questionnaire_detail_url(created.data["id"]), {"fields": "questions"}
+            )
+
+        questions = response.data["questions"]
+        assert [question["id"] for question in questions] == sorted(
+            question["id"] for question in questions
+        )
+        for question in questions:
+            choice_ids = [choice["id"] for choice in question["choices"]]
+            assert choice_ids == sorted(choice_ids)
+        assert "ORDER BY" in _selects(queries, "feedback_question")[-1]
+        assert "ORDER BY" in _selects(queries, "feedback_questionchoice")[-1]
+
+    def test_monthly_feedback_text_loaded_only_when_requested(
+        self, api_client, sales_manager, client_rep
+    ):
+        """Test feedback text is not loaded unless it is requested."""
+        api_client.force_authenticate(user=sales_manager)
+        baker.make(
+            "feedback.Client", sales_manager=sales_manager, client_rep=client_rep
+        )
+        baker.make(MonthlyFeedback, client_rep=client_rep, month="2023-01")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(MONTHLY_FEEDBACK_URL, {"fields": "id,month"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "month"}
+        select = _selects(queries, "feedback_monthlyfeedback")[-1]
+        assert '"feedback"' not in select
+
+    def test_response_list_skips_unrequested_answers(
+        self, api_client, sales_manager, response_list_url
+    ):
+        """Test answers are only prefetched when they are requested."""
+        api_client.force_authenticate(user=sales_manager)
+        questionnaire = baker.make(Questionnaire)
+        baker.make("feedback.Response", questionnaire=questionnaire)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                response_list_url(questionnaire.id), {"fields": "id,submitted_at"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "submitted_at"}
+        assert _selects(queries, "feedback_answer") == []
+
+    @pytest.mark.parametrize("fields", ["", "id,nope", "questions"])
+    def test_unknown_fields_rejected(self, api_client, sales_manager, fields):
+        """Test unknown or empty field selections return 400."""
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(QUESTIONNAIRES_URL, {"fields": fields})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "fields" in response.data
+
+    def test_fields_ignored_on_create(self, api_client, sales_manager, client_payload):
+        """Test the fields parameter does not limit writes."""
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.post(
+            f"{CLIENTS_URL}?fields=id", client_payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["email"] == client_payload["email"]
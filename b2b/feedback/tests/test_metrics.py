@@ -0,0 +1,128 @@
+import pytest
+from django.core import mail
+from django.urls import reverse
+from feedback.email import BulkEmailDispatcher, QuestionnaireReminderEmail
+from feedback.models import Questionnaire
+from feedback.tasks import send_reminder_emails, send_response_alert_email
+from model_bakery import baker
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from .test_feedback_api import CLIENTS_URL
+
+METRICS_URL = reverse("metrics")
+
+
+def _sample(name, **labels):
+    """Return the current value of a metric sample, zero if not yet recorded."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests on exporting the metrics."""
+
+    def test_metrics_exported(self, client, settings):
+        """Test the metrics are exported in the Prometheus text format."""
+        settings.FEEDBACK_METRICS_TOKEN = "secret"
+
+        response = client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert "# TYPE b2b_http_request_duration_seconds histogram" in body
+        assert "# TYPE b2b_feedback_responses_submitted_total counter" in body
+
+    def test_token_required_when_set(self, client, settings):
+        """Test scraping requires the bearer token when one is configured."""
+        settings.FEEDBACK_METRICS_TOKEN = "secret"
+
+        assert client.get(METRICS_URL).status_code == status.HTTP_401_UNAUTHORIZED
+        response = client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_metrics_hidden_without_token(self, client, settings):
+        """Test the metrics are not exported until a token is configured."""
+        settings.FEEDBACK_METRICS_TOKEN = ""
+
+        response = client.get(METRICS_URL)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    """Tests on request latency and query count metrics."""
+
+    def test_request_observed_by_route_and_action(self, api_client, sales_manager):
+        """Test requests are observed under their route and viewset action."""
+        labels = {"route": "feedback:client-list", "action": "list", "method": "GET"}
+        requests = _sample(
+            "b2b_http_request_duration_seconds_count", status="200", **labels
+        )
+        queries = _sample("b2b_http_request_db_queries_sum", **labels)
+        api_client.force_authenticate(user=sales_manager)
+
+        response = api_client.get(CLIENTS_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (
+            _sample("b2b_http_request_duration_seconds_count", status="200", **labels)
+            == requests + 1
+        )
+        assert _sample("b2b_http_request_db_queries_sum", **labels) > queries
+
+
+@pytest.mark.django_db
+class TestWorkloadMetrics:
+    """Tests on response, task and email metrics."""
+
+    def test_submitted_responses_counted(
+        self, api_client, client_rep, response_list_url, response_payload
+    ):
+        """Test submitted responses are counted."""
+        submitted = _sample("b2b_feedback_responses_submitted_total")
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+
+        response = api_client.post(
+            response_list_url(questionnaire.id), response_payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert _sample("b2b_feedback_responses_submitted_total") == submitted + 1
+
+    def test_task_duration_observed(self):
+        """Test Celery task runs are observed with their outcome."""
+        labels = {"task": send_reminder_emails.name, "state": "SUCCESS"}
+        runs = _sample("b2b_celery_task_duration_seconds_count", **labels)
+
+        send_reminder_emails.delay()
+
+        assert _sample("b2b_celery_task_duration_seconds_count", **labels) == runs + 1
+
+    def test_sent_alert_counted(self, sales_manager):
+        """Test sent alert emails are counted."""
+        labels = {"email": "ResponseAlertEmail", "outcome": "sent"}
+        sent = _sample("b2b_emails_total", **labels)
+        questionnaire = baker.make(Questionnaire, author=sales_manager)
+
+        send_response_alert_email(questionnaire.id, "Respondent")
+
+        assert len(mail.outbox) == 1
+        assert _sample("b2b_emails_total", **labels) == sent + 1
+
+    def test_failed_reminders_counted(self, monkeypatch):
+        """Test reminders failing to send are counted."""
+        labels = {"email": "QuestionnaireReminderEmail", "outcome": "failed"}
+        failed = _sample("b2b_emails_total", **labels)
+
+        def fail(self):
+            raise ValueError("Template error")
+
+        monkeypatch.setattr(QuestionnaireReminderEmail, "render", fail)
+        message = QuestionnaireReminderEmail(questionnaire_title="Title")
+
+        assert BulkEmailDispatcher().send([(message, ["a@example.com"])]) == (0, 1)
+        assert _sample("b2b_emails_total", **labels) == failed + 1
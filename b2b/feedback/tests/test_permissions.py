@@ -0,0 +1,65 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from feedback.models import CLIENT_REP_GROUP, SALES_MANAGER_GROUP
+from feedback.permissions import clear_local_roles, get_user_roles
+from rest_framework import status
+
+from .test_feedback_api import CLIENTS_URL
+
+
+@pytest.mark.django_db
+class TestRoleResolution:
+    """Tests on cached role resolution."""
+
+    def test_roles_resolved_without_writes(self, sales_manager):
+        """Test resolving roles runs a single read query."""
+        with CaptureQueriesContext(connection) as queries:
+            roles = get_user_roles(sales_manager)
+
+        assert roles == {SALES_MANAGER_GROUP}
+        assert len(queries) == 1
+        assert queries[0]["sql"].startswith("SELECT")
+
+    def test_roles_cached_across_requests(self, sales_manager):
+        """Test roles are served from the shared cache once resolved."""
+        get_user_roles(sales_manager)
+        clear_local_roles()
+
+        with CaptureQueriesContext(connection) as queries:
+            roles = get_user_roles(sales_manager)
+
+        assert roles == {SALES_MANAGER_GROUP}
+        assert len(queries) == 0
+
+    def test_roles_invalidated_on_membership_change(self, sales_manager):
+        """Test group membership changes invalidate cached roles."""
+        assert get_user_roles(sales_manager) == {SALES_MANAGER_GROUP}
+
+        client_reps = Group.objects.get(name=CLIENT_REP_GROUP)
+        client_reps.user_set.add(sales_manager)
+        assert get_user_roles(sales_manager) == {
+            SALES_MANAGER_GROUP,
+            CLIENT_REP_GROUP,
+        }
+
+        sales_manager.groups.clear()
+        assert get_user_roles(sales_manager) == frozenset()
+
+    def test_removed_sales_manager_loses_access(self, api_client, sales_manager):
+        """Test permissions follow group removal without waiting for expiry."""
+        api_client.force_authenticate(user=sales_manager)
+        assert api_client.get(CLIENTS_URL).status_code == status.HTTP_200_OK
+
+        sales_manager.groups.remove(Group.objects.get(name=SALES_MANAGER_GROUP))
+
+        response = api_client.get(CLIENTS_URL)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_anonymous_user_has_no_roles(self):
+        """Test anonymous users resolve to no roles without queries."""
+        with CaptureQueriesContext(connection) as queries:
+            assert get_user_roles(AnonymousUser()) == frozenset()
+        assert len(queries) == 0
@@ -0,0 +1,313 @@
+import logging
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from feedback import urls as feedback_urls
+from feedback.budgets import assert_query_budget, get_view_query_budget
+from feedback.models import (
+    CLIENT_REP_GROUP,
+    Answer,
+    AnswerChoice,
+    Client,
+    MonthlyFeedback,
+    Question,
+    QuestionChoice,
+    Questionnaire,
+    Response,
+)
+from feedback.views import (
+    ClientViewSet,
+    MonthlyFeedbackViewSet,
+    QuestionnaireViewSet,
+    ResponseViewSet,
+)
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from .test_feedback_api import CLIENTS_URL, MONTHLY_FEEDBACK_URL, QUESTIONNAIRES_URL
+
+SIZES = (1, 10, 30)
+
+
+class Seeded:
+    """Objects seeded for a data size."""
+
+    def __init__(self, size, sales_manager, client_rep):
+        """Seed size clients, questionnaires, responses and feedback."""
+        self.clients = baker.make(
+            Client,
+            sales_manager=sales_manager,
+            client_rep=client_rep,
+            _quantity=size,
+            _bulk_create=True,
+        )
+        self.questionnaires = baker.make(
+            Questionnaire,
+            author=sales_manager,
+            client_rep=client_rep,
+            _quantity=size,
+            _bulk_create=True,
+        )
+        self.questionnaire = self.questionnaires[0]
+        self.questions = baker.make(
+            Question,
+            questionnaire=self.questionnaire,
+            question_type="MULTIPLE_CHOICE",
+            required=False,
+            order=1,
+            _quantity=size,
+            _bulk_create=True,
+        )
+        self.choices = [
+            baker.make(QuestionChoice, question=question, order=1)
+            for question in self.questions
+        ]
+        responses = baker.make(
+            Response,
+            questionnaire=self.questionnaire,
+            respondent=client_rep,
+            _quantity=size,
+            _bulk_create=True,
+        )
+        for response in responses:
+            answers = baker.make(
+                Answer,
+                response=response,
+                question=self.questions[0],
+                _quantity=size,
+                _bulk_create=True,
+            )
+            baker.make(
+                AnswerChoice,
+                answer=iter(answers),
+                question_choice=self.choices[0],
+                _quantity=size,
+                _bulk_create=True,
+            )
+        baker.make(
+            MonthlyFeedback,
+            client_rep=client_rep,
+            month="2023-01",
+            _quantity=size,
+            _bulk_create=True,
+        )
+
+    def response_payload(self):
+        """Return a response answering every question."""
+        return {
+            "answers": [
+                {
+                    "question_id": question.id,
+                    "answer_text": "",
+                    "choices": [{"question_choice_id": choice.id}],
+                }
+                for question, choice in zip(self.questions, self.choices)
+            ]
+        }
+
+
+def _questionnaire_payload(seeded, client_rep):
+    return {
+        "client_rep": client_rep.id,
+        "title": "Budgeted",
+        "due_at": "2030-01-01T00:00:00Z",
+        "questions": [
+            {
+                "question_type": "DROPDOWN",
+                "question_text": "Question?",
+                "order": order,
+                "choices": [{"value": "Option", "order": 1}],
+            }
+            for order in range(len(seeded.questions))
+        ],
+    }
+
+
+def _import_file(seeded, client_rep):
+    rows = "".join(
+        f"client{i}@example.com,Client {i},{client_rep.email}\n"
+        for i in range(len(seeded.clients))
+    )
+    content = f"email,name,client_rep\n{rows}".encode()
+    return SimpleUploadedFile("clients.csv", content, "text/csv")
+
+
+def _responses_url(seeded, name="list"):
+    return reverse(
+        f"feedback:questionnaire-responses-{name}", args=[seeded.questionnaire.id]
+    )
+
+
+# (viewset, action, user, request(client, seeded, client_rep))
+CASES = [
+    (ClientViewSet, "list", "manager", lambda c, s, r: c.get(CLIENTS_URL)),
+    (
+        ClientViewSet,
+        "create",
+        "manager",
+        lambda c, s, r: c.post(CLIENTS_URL, {"email": "a@b.com", "name": "A"}),
+    ),
+    (
+        ClientViewSet,
+        "destroy",
+        "manager",
+        lambda c, s, r: c.delete(
+            reverse("feedback:client-detail", args=[s.clients[0].id])
+        ),
+    ),
+    (
+        ClientViewSet,
+        "bulk_import",
+        "manager",
+        lambda c, s, r: c.post(
+            reverse("feedback:client-import"),
+            {"file": _import_file(s, r)},
+            format="multipart",
+        ),
+    ),
+    (
+        QuestionnaireViewSet,
+        "list",
+        "manager",
+        lambda c, s, r: c.get(QUESTIONNAIRES_URL, {"sales_manager": 1}),
+    ),
+    (
+        QuestionnaireViewSet,
+        "create",
+        "manager",
+        lambda c, s, r: c.post(
+            QUESTIONNAIRES_URL, _questionnaire_payload(s, r), format="json"
+        ),
+    ),
+    (
+        QuestionnaireViewSet,
+        "retrieve",
+        "manager",
+        lambda c, s, r: c.get(
+            reverse("feedback:questionnaire-detail", args=[s.questionnaire.id])
+        ),
+    ),
+    (
+        QuestionnaireViewSet,
+        "results",
+        "manager",
+        lambda c, s, r: c.get(
+            reverse("feedback:questionnaire-results", args=[s.questionnaire.id])
+        ),
+    ),
+    (
+        ResponseViewSet,
+        "list",
+        "manager",
+        lambda c, s, r: c.get(_responses_url(s), {"page_size": 100}),
+    ),
+    (
+        ResponseViewSet,
+        "create",
+        "client_rep",
+        lambda c, s, r: c.post(_responses_url(s), s.response_payload(), format="json"),
+    ),
+    (
+        ResponseViewSet,
+        "bulk",
+        "client_rep",
+        lambda c, s, r: c.post(
+            _responses_url(s, "bulk"),
+            [s.response_payload()] * len(s.clients),
+            format="json",
+        ),
+    ),
+    (
+        ResponseViewSet,
+        "export",
+        "manager",
+        lambda c, s, r: c.get(_responses_url(s, "export"), {"format": "csv"}),
+    ),
+    (
+        MonthlyFeedbackViewSet,
+        "list",
+        "manager",
+        lambda c, s, r: c.get(MONTHLY_FEEDBACK_URL),
+    ),
+    (
+        MonthlyFeedbackViewSet,
+        "create",
+        "client_rep",
+        lambda c, s, r: c.post(MONTHLY_FEEDBACK_URL, {"feedback": "Fine"}),
+    ),
+]
+
+
+@pytest.fixture
+def client_rep(sales_manager, django_user_model):
+    """Return a client rep other than the sales manager."""
+    user = django_user_model.objects.create_user(email="rep@example.com")
+    user.groups.add(Group.objects.get_or_create(name=CLIENT_REP_GROUP)[0])
+    return user
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Tests viewset actions stay within their query budgets."""
+
+    @pytest.mark.parametrize("size", SIZES)
+    @pytest.mark.parametrize(
+        "viewset, action, user, send",
+        CASES,
+        ids=[f"{case[0].__name__}.{case[1]}" for case in CASES],
+    )
+    def test_action_within_budget(
+        self, api_client, sales_manager, client_rep, size, viewset, action, user, send
+    ):
+        """Test the action runs within budget with cold caches."""
+        seeded = Seeded(size, sales_manager, client_rep)
+        requester = sales_manager if user == "manager" else client_rep
+        token = Token.objects.create(user=requester)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        with assert_query_budget(viewset, action):
+            response = send(api_client, seeded, client_rep)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        assert response.status_code < 400, response.content
+
+    def test_every_action_has_a_budget(self):
+        """Test every routed viewset action declares a budget that is tested."""
+        tested = {(viewset, action) for viewset, action, _, _ in CASES}
+        for pattern in feedback_urls.urlpatterns:
+            for method, action in getattr(pattern.callback, "actions", {}).items():
+                view, budget = get_view_query_budget(pattern.callback, method)
+                assert budget is not None, f"{view} has no query budget"
+                assert (pattern.callback.cls, action) in tested, view
+
+
+@pytest.mark.django_db
+class TestQueryBudgetMiddleware:
+    """Tests on logging query budget violations."""
+
+    def test_violation_logged(self, api_client, sales_manager, caplog, monkeypatch):
+        """Test requests over budget are logged with their view and counts."""
+        monkeypatch.setattr(ClientViewSet, "query_budgets", {"list": 0})
+        api_client.force_authenticate(user=sales_manager)
+
+        with caplog.at_level(logging.WARNING, logger="feedback.middleware"):
+            response = api_client.get(CLIENTS_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        (record,) = caplog.records
+        assert record.view == "ClientViewSet.list"
+        assert record.queries > record.budget == 0
+
+    def test_requests_within_budget_not_logged(self, api_client, sales_manager, caplog):
+        """Test requests within budget are not logged."""
+        api_client.force_authenticate(user=sales_manager)
+
+        with caplog.at_level(logging.WARNING, logger="feedback.middleware"):
+            response = api_client.get(CLIENTS_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert caplog.records == []
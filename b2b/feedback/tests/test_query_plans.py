@@ -0,0 +1,191 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from feedback.models import (
+    Answer,
+    AnswerChoice,
+    Client,
+    MonthlyFeedback,
+    Question,
+    QuestionChoice,
+    Questionnaire,
+    Response,
+)
+from feedback.tasks import send_reminder_emails
+from rest_framework import status
+
+from .test_feedback_api import CLIENTS_URL, MONTHLY_FEEDBACK_URL, QUESTIONNAIRES_URL
+
+User = get_user_model()
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Query plans are PostgreSQL specific."
+)
+
+SEQ_SCAN = re.compile(r"Seq Scan on (feedback_\w+)")
+# Server side cursors are logged as DECLARE ... CURSOR ... FOR SELECT ...
+DECLARE_CURSOR = re.compile(r"^DECLARE .+? FOR (?=SELECT)", re.DOTALL)
+
+
+@pytest.fixture
+def seeded(client_rep, sales_manager):
+    """Seed the feedback tables and refresh the planner statistics.
+
+    Most rows belong to other users, so the planner picks the indexes on cost
+    alone and only scans a table when no index serves the query.
+    """
+    now = timezone.now()
+    users = User.objects.bulk_create(
+        User(email=f"user{i}@example.com", name=f"User {i}") for i in range(1000)
+    )
+    Client.objects.bulk_create(
+        Client(
+            email=f"client{i}@example.com",
+            name=f"Client {i}",
+            client_rep=users[i % len(users)] if i % 500 else client_rep,
+            sales_manager=users[i % len(users)] if i % 500 else sales_manager,
+        )
+        for i in range(5000)
+    )
+    questionnaires = Questionnaire.objects.bulk_create(
+        Questionnaire(
+            title=f"Questionnaire {i}",
+            author=users[i % len(users)] if i % 40 else sales_manager,
+            client_rep=users[i % len(users)] if i % 40 else client_rep,
+            is_active=bool(i % 2),
+            due_at=now + timedelta(days=i % 200 - 50),
+        )
+        for i in range(2000)
+    )
+    questions = Question.objects.bulk_create(
+        Question(
+            questionnaire=questionnaire,
+            question_type="MULTIPLE_CHOICE",
+            question_text="Question",
+            order=1,
+        )
+        for questionnaire in questionnaires
+    )
+    choices = QuestionChoice.objects.bulk_create(
+        QuestionChoice(question=question, value=f"Choice {i}", order=i)
+        for question in questions
+        for i in range(2)
+    )
+    responses = Response.objects.bulk_create(
+        Response(questionnaire=questionnaires[i % 1000], respondent=client_rep)
+        for i in range(5000)
+    )
+    answers = Answer.objects.bulk_create(
+        Answer(response=response, question=questions[i % 1000])
+        for i, response in enumerate(responses)
+    )
+    AnswerChoice.objects.bulk_create(
+        AnswerChoice(answer=answer, question_choice=choices[i % 1000 * 2])
+        for i, answer in enumerate(answers)
+    )
+    MonthlyFeedback.objects.bulk_create(
+        MonthlyFeedback(
+            client_rep=rep,
+            month=f"2022-{month + 1:02d}",
+            feedback="Feedback",
+        )
+        for rep in [client_rep, *users]
+        for month in range(12)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return questionnaires[0]
+
+
+def _explain(queries):
+    """Return the query plans of the select queries."""
+    plans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            sql = DECLARE_CURSOR.sub("", query["sql"])
+            if sql.startswith("SELECT"):
+                cursor.execute(f"EXPLAIN {sql}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+    return "\n".join(plans)
+
+
+def _assert_indexed(queries, index):
+    """Assert the queries avoid sequential scans and use the expected index."""
+    plan = _explain(queries)
+    assert SEQ_SCAN.findall(plan) == [], plan
+    assert index in plan, plan
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+    """Tests the hot feedback queries are served by indexes."""
+
+    @pytest.mark.parametrize(
+        "url, params, index",
+        [
+            (CLIENTS_URL, {}, "client_manager_created_idx"),
+            (CLIENTS_URL, {"cursor": ""}, "client_manager_created_idx"),
+            (QUESTIONNAIRES_URL, {"client_rep": 1}, "qnr_client_rep_created_idx"),
+            (
+                QUESTIONNAIRES_URL,
+                {"sales_manager": 1, "cursor": ""},
+                "qnr_author_created_idx",
+            ),
+            (MONTHLY_FEEDBACK_URL, {}, "monthly_feedback_rep_month_idx"),
+            (
+                MONTHLY_FEEDBACK_URL,
+                {"month_from": "2021-06", "month_to": "2022-06"},
+                "monthly_feedback_rep_month_idx",
+            ),
+        ],
+    )
+    def test_list_queries_use_indexes(
+        self, api_client, seeded, sales_manager, url, params, index
+    ):
+        """Test list endpoints do not scan the feedback tables."""
+        api_client.force_authenticate(user=sales_manager)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, params)
+
+        assert response.status_code == status.HTTP_200_OK
+        _assert_indexed(queries, index)
+
+    @pytest.mark.parametrize("params", [{}, {"cursor": "", "page_size": 50}])
+    def test_response_list_queries_use_indexes(
+        self, api_client, response_list_url, seeded, sales_manager, params
+    ):
+        """Test response listing does not scan the feedback tables."""
+        api_client.force_authenticate(user=sales_manager)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(response_list_url(seeded.id), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        _assert_indexed(queries, "response_questionnaire_id_idx")
+
+    def test_questionnaire_detail_queries_use_indexes(
+        self, api_client, seeded, sales_manager
+    ):
+        """Test questionnaire retrieval does not scan the feedback tables."""
+        api_client.force_authenticate(user=sales_manager)
+        url = reverse("feedback:questionnaire-detail", args=[seeded.id])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        _assert_indexed(queries, "feedback_questionnaire_pkey")
+
+    def test_reminder_queries_use_indexes(self, seeded):
+        """Test the reminder task does not scan the feedback tables."""
+        with CaptureQueriesContext(connection) as queries:
+            send_reminder_emails()
+
+        _assert_indexed(queries, "qnr_active_due_at_idx")
@@ -0,0 +1,283 @@
+from contextlib import contextmanager
+
+import pytest
+from django.conf import settings as django_settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from feedback import routers
+from feedback.models import Questionnaire, Response
+from feedback.permissions import get_user_roles
+from feedback.routers import (
+    PrimaryReplicaRouter,
+    choose_replica,
+    clear_replica_health,
+    get_read_database,
+    get_request_database,
+    is_sticky,
+    read_from,
+    stick_to_primary,
+    use_replica,
+)
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from .test_feedback_api import QUESTIONNAIRES_URL
+
+REPLICA = "replica1"
+
+requires_replica = pytest.mark.skipif(
+    REPLICA not in django_settings.DATABASES,
+    reason="Set DATABASE_REPLICA_URLS to test against a replica database",
+)
+
+
+@pytest.fixture(autouse=True)
+def _replica_health():
+    """Check the replicas' health afresh in every test."""
+    clear_replica_health()
+    yield
+    clear_replica_health()
+
+
+@pytest.fixture
+def replicas(settings):
+    """Route reads to the primary's connection standing in as a replica."""
+    settings.FEEDBACK_REPLICA_DATABASES = [DEFAULT_DB_ALIAS]
+    return settings.FEEDBACK_REPLICA_DATABASES
+
+
+def _request(method="get", authorization="Token abc"):
+    return getattr(RequestFactory(), method)("/", HTTP_AUTHORIZATION=authorization)
+
+
+@contextmanager
+def _lagging_replica():
+    """Keep the replica reading the data committed before the block."""
+    with transaction.atomic(using=REPLICA):
+        with connections[REPLICA].cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute("SELECT 1")
+        yield
+
+
+class TestPrimaryReplicaRouter:
+    """Tests on routing queries between the primary and the replicas."""
+
+    def test_reads_follow_read_database(self):
+        """Test reads go to the chosen replica, and writes to the primary."""
+        router = PrimaryReplicaRouter()
+
+        assert router.db_for_read(Questionnaire) is None
+        with read_from(REPLICA):
+            assert router.db_for_read(Questionnaire) == REPLICA
+            assert router.db_for_write(Questionnaire) == DEFAULT_DB_ALIAS
+            assert get_read_database() == REPLICA
+        assert get_read_database() == DEFAULT_DB_ALIAS
+
+    def test_tokens_read_from_primary(self):
+        """Test models read right after being written stay on the primary."""
+        with read_from(REPLICA):
+            assert PrimaryReplicaRouter().db_for_read(Token) == DEFAULT_DB_ALIAS
+
+    def test_only_primary_migrated(self):
+        """Test only the primary is migrated."""
+        router = PrimaryReplicaRouter()
+
+        assert router.allow_migrate(DEFAULT_DB_ALIAS, "feedback")
+        assert not router.allow_migrate(REPLICA, "feedback")
+
+
+@pytest.mark.django_db
+class TestReplicaSelection:
+    """Tests on choosing the database requests read from."""
+
+    def test_no_replicas_reads_primary(self, settings):
+        """Test requests read from the primary without replicas."""
+        settings.FEEDBACK_REPLICA_DATABASES = []
+
+        assert get_request_database(_request()) is None
+
+    def test_safe_requests_read_replica(self, replicas):
+        """Test only safe requests read from a replica."""
+        assert get_request_database(_request("get")) == DEFAULT_DB_ALIAS
+        assert get_request_database(_request("head")) == DEFAULT_DB_ALIAS
+        assert get_request_database(_request("post")) is None
+
+    def test_writer_sticks_to_primary(self, replicas):
+        """Test a client reads from the primary for a while after writing."""
+        stick_to_primary(_request("post"))
+
+        assert is_sticky(_request())
+        assert get_request_database(_request()) is None
+        assert get_request_database(_request(authorization="Token xyz")) is not None
+
+    def test_stickiness_expires(self, replicas, settings):
+        """Test clients read from the replicas again after the window."""
+        settings.FEEDBACK_READ_STICKINESS = 0
+
+        stick_to_primary(_request("post"))
+
+        assert not is_sticky(_request())
+
+    def test_lagging_replica_skipped(self, replicas, monkeypatch):
+        """Test replicas lagging too far behind fall back to the primary."""
+        monkeypatch.setattr(routers, "get_replica_lag", lambda alias: 60.0)
+
+        assert choose_replica() is None
+
+    def test_unreachable_replica_skipped(self, replicas, monkeypatch):
+        """Test replicas failing their lag check fall back to the primary."""
+
+        def get_replica_lag(alias):
+            raise OperationalError("connection refused")
+
+        monkeypatch.setattr(routers, "get_replica_lag", get_replica_lag)
+
+        assert choose_replica() is None
+
+    def test_health_checked_once_per_interval(self, replicas, monkeypatch):
+        """Test a replica's lag is checked at most once per interval."""
+        checks = []
+        monkeypatch.setattr(
+            routers, "get_replica_lag", lambda alias: checks.append(alias) or 0
+        )
+
+        for _ in range(3):
+            assert choose_replica() == DEFAULT_DB_ALIAS
+
+        assert checks == [DEFAULT_DB_ALIAS]
+
+    def test_primary_lag_is_zero(self):
+        """Test the lag check runs against a database outside recovery."""
+        assert routers.get_replica_lag(DEFAULT_DB_ALIAS) == 0
+
+
+@pytest.mark.django_db
+class TestReplicaRoutingMiddleware:
+    """Tests on routing the reads of requests."""
+
+    def test_successful_write_sticks(
+        self, api_client, sales_manager, questionnaire_payload, replicas
+    ):
+        """Test a successful write pins its client to the primary."""
+        token = Token.objects.create(user=sales_manager)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        read = _request(authorization=f"Token {token.key}")
+
+        api_client.get(QUESTIONNAIRES_URL)
+        assert not is_sticky(read)
+
+        response = api_client.post(
+            QUESTIONNAIRES_URL, questionnaire_payload, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert is_sticky(read)
+
+    def test_failed_write_does_not_stick(self, api_client, sales_manager, replicas):
+        """Test rejected writes leave their client on the replicas."""
+        token = Token.objects.create(user=sales_manager)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        response = api_client.post(QUESTIONNAIRES_URL, {}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not is_sticky(_request(authorization=f"Token {token.key}"))
+
+
+@requires_replica
+@pytest.mark.django_db(transaction=True, databases=[DEFAULT_DB_ALIAS, REPLICA])
+class TestReplicaDatabase:
+    """Tests reading from a second database configured as a replica."""
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        """Route reads to the replica."""
+        settings.FEEDBACK_REPLICA_DATABASES = [REPLICA]
+
+    @pytest.fixture
+    def token_client(self, api_client, sales_manager, client_rep):
+        """Return an API client authenticated with a token."""
+        token = Token.objects.create(user=sales_manager)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return api_client
+
+    def test_reads_served_by_replica(self, token_client, sales_manager):
+        """Test safe requests query the replica and not the primary."""
+        baker.make(Questionnaire, author=sales_manager, _quantity=3)
+        token_client.get(QUESTIONNAIRES_URL)
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                response = token_client.get(QUESTIONNAIRES_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        assert len(replica_queries) > 0
+        assert len(queries) == 0
+
+    def test_reads_after_write_served_by_primary(
+        self, token_client, questionnaire_payload
+    ):
+        """Test the writer's reads stay on the primary."""
+        token_client.post(QUESTIONNAIRES_URL, questionnaire_payload, format="json")
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            response = token_client.get(QUESTIONNAIRES_URL)
+
+        assert response.data["count"] == 1
+        assert len(replica_queries) == 0
+
+    def test_export_streamed_from_replica(self, token_client, sales_manager):
+        """Test exported rows streaming after the request read the replica."""
+        questionnaire = baker.make(Questionnaire, author=sales_manager)
+        baker.make(Response, questionnaire=questionnaire, _quantity=2)
+        url = reverse(
+            "feedback:questionnaire-responses-export", args=[questionnaire.id]
+        )
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            response = token_client.get(url, HTTP_ACCEPT="text/csv")
+            content = b"".join(response.streaming_content)
+
+        assert content.startswith(b"response_id,")
+        assert any("feedback_response" in q["sql"] for q in replica_queries)
+
+    def test_questionnaire_cached_from_primary(self, token_client, sales_manager):
+        """Test a stale replica's questionnaire is not cached after a bump."""
+        questionnaire = baker.make(Questionnaire, author=sales_manager, title="Old")
+        url = reverse("feedback:questionnaire-detail", args=[questionnaire.id])
+        assert token_client.get(url).data["title"] == "Old"
+
+        with _lagging_replica():
+            questionnaire.title = "New"
+            questionnaire.save()
+            assert Questionnaire.objects.using(REPLICA).get().title == "Old"
+            response = token_client.get(url)
+
+        assert response.data["title"] == "New"
+        assert token_client.get(url).data["title"] == "New"
+
+    def test_roles_cached_from_primary(self, token_client, sales_manager):
+        """Test a stale replica's group membership is not cached."""
+        assert token_client.get(QUESTIONNAIRES_URL).status_code == status.HTTP_200_OK
+
+        with _lagging_replica():
+            sales_manager.groups.clear()
+            response = token_client.get(QUESTIONNAIRES_URL)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert get_user_roles(sales_manager) == frozenset()
+
+    def test_analytics_read_replica(self, sales_manager):
+        """Test analytics blocks read from the replica."""
+        baker.make(Questionnaire, author=sales_manager)
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            with use_replica():
+                assert Questionnaire.objects.count() == 1
+
+        assert any("COUNT(*)" in q["sql"] for q in replica_queries)
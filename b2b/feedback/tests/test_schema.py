@@ -0,0 +1,192 @@
+import copy
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from feedback.cache import QUESTIONNAIRE_VERSION_KEY
+from feedback.models import Question, QuestionChoice, Questionnaire
+from feedback.permissions import get_user_roles
+from feedback.schema import get_questionnaire_schema
+from model_bakery import baker
+from rest_framework import status
+
+
+@pytest.fixture
+def questionnaire(client_rep, response_payload):
+    """Return the questionnaire the sample response answers."""
+    return Questionnaire.objects.get(pk=response_payload["questionnaire"])
+
+
+@pytest.mark.django_db
+class TestResponseValidation:
+    """Tests on validating responses against the questionnaire schema."""
+
+    def _post(self, api_client, client_rep, response_list_url, questionnaire, payload):
+        api_client.force_authenticate(user=client_rep)
+        return api_client.post(
+            response_list_url(questionnaire.id), payload, format="json"
+        )
+
+    def test_foreign_question_rejected(
+        self, api_client, client_rep, response_list_url, questionnaire, response_payload
+    ):
+        """Test answers to questions of other questionnaires are rejected."""
+        payload = copy.deepcopy(response_payload)
+        payload["answers"][0]["question_id"] = baker.make(Question).id
+
+        response = self._post(
+            api_client, client_rep, response_list_url, questionnaire, payload
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "question_id" in response.data["answers"][0]
+
+    def test_foreign_choice_rejected(
+        self, api_client, client_rep, response_list_url, questionnaire, response_payload
+    ):
+        """Test choices of other questions are rejected."""
+        payload = copy.deepcopy(response_payload)
+        payload["answers"][1]["choices"] = payload["answers"][3]["choices"]
+
+        response = self._post(
+            api_client, client_rep, response_list_url, questionnaire, payload
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "choices" in response.data["answers"][1]
+
+    @pytest.mark.parametrize("answer_index", [0, 1])
+    def test_unanswered_required_question_rejected(
+        self,
+        api_client,
+        client_rep,
+        response_list_url,
+        questionnaire,
+        response_payload,
+        answer_index,
+    ):
+        """Test required questions must be answered."""
+        payload = copy.deepcopy(response_payload)
+        payload["answers"][answer_index].update(answer_text="", choices=[])
+
+        response = self._post(
+            api_client, client_rep, response_list_url, questionnaire, payload
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "required" in str(response.data["answers"][0])
+
+    def test_duplicate_answers_rejected(
+        self, api_client, client_rep, response_list_url, questionnaire, response_payload
+    ):
+        """Test a question cannot be answered twice in one response."""
+        payload = copy.deepcopy(response_payload)
+        payload["answers"].append(copy.deepcopy(payload["answers"][0]))
+
+        response = self._post(
+            api_client, client_rep, response_list_url, questionnaire, payload
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "question_id" in response.data["answers"][-1]
+        assert not any(response.data["answers"][:-1])
+
+    def test_choice_counts_follow_question_types(
+        self, api_client, client_rep, response_list_url, questionnaire, response_payload
+    ):
+        """Test single choice questions reject several choices."""
+        payload = copy.deepcopy(response_payload)
+        choices = list(
+            QuestionChoice.objects.filter(
+                question_id=payload["answers"][3]["question_id"]
+            ).values_list("id", flat=True)
+        )
+        payload["answers"][3]["choices"] = [
+            {"question_choice_id": choice_id} for choice_id in choices
+        ]
+
+        response = self._post(
+            api_client, client_rep, response_list_url, questionnaire, payload
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "choices" in response.data["answers"][3]
+
+    def test_validation_runs_no_schema_queries(
+        self, api_client, client_rep, response_list_url, questionnaire, response_payload
+    ):
+        """Test cached schemas validate submissions without reading questions."""
+        self._post(
+            api_client, client_rep, response_list_url, questionnaire, response_payload
+        )
+        get_user_roles(client_rep)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._post(
+                api_client,
+                client_rep,
+                response_list_url,
+                questionnaire,
+                response_payload,
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("SELECT")
+            and (
+                'FROM "feedback_question' in query["sql"]
+                or 'FROM "feedback_questionnaire"' in query["sql"]
+            )
+        ]
+
+    def test_schema_recompiled_after_questionnaire_changes(
+        self,
+        api_client,
+        client_rep,
+        response_list_url,
+        questionnaire,
+        response_payload,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test new required questions apply to the next submission."""
+        self._post(
+            api_client, client_rep, response_list_url, questionnaire, response_payload
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(
+                Question,
+                questionnaire=questionnaire,
+                question_type="OPEN",
+                required=True,
+                order=5,
+            )
+        response = self._post(
+            api_client, client_rep, response_list_url, questionnaire, response_payload
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_schema_cache_evicts_least_recently_used(self, settings):
+        """Test the schema cache keeps at most the configured number of schemas."""
+        settings.FEEDBACK_SCHEMA_CACHE_SIZE = 1
+        first, second = baker.make(Questionnaire, _quantity=2)
+        get_questionnaire_schema(first.id)
+        get_questionnaire_schema(second.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            get_questionnaire_schema(second.id)
+        assert len(queries) == 0
+
+        with CaptureQueriesContext(connection) as queries:
+            get_questionnaire_schema(first.id)
+        assert len(queries) == 3
+
+    @pytest.mark.parametrize("questionnaire_id", [0, "abc"])
+    def test_unknown_questionnaire_not_versioned(self, questionnaire_id):
+        """Test looking up missing questionnaires leaves no version in the cache."""
+        assert get_questionnaire_schema(questionnaire_id) is None
+        assert cache.get(QUESTIONNAIRE_VERSION_KEY.format(questionnaire_id)) is None
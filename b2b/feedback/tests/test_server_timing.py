@@ -0,0 +1,131 @@
+import logging
+import re
+import time
+
+import pytest
+from django.db import connection
+from feedback.models import Questionnaire
+from feedback.timing import RequestTimer
+from rest_framework import status
+
+from .test_feedback_api import CLIENTS_URL, QUESTIONNAIRES_URL
+
+SERVER_TIMING = re.compile(r'(\w+);dur=([\d.]+);desc="([^"]*)"')
+
+
+def _parse(header):
+    """Return the {name: (duration, description)} metrics of a header."""
+    return {
+        name: (float(duration), desc)
+        for name, duration, desc in SERVER_TIMING.findall(header)
+    }
+
+
+@pytest.fixture
+def questionnaire(api_client, sales_manager, questionnaire_payload):
+    """Create a questionnaire through the API."""
+    api_client.force_authenticate(user=sales_manager)
+    response = api_client.post(QUESTIONNAIRES_URL, questionnaire_payload, format="json")
+    return Questionnaire.objects.get(pk=response.data["id"])
+
+
+@pytest.fixture
+def sampled(settings):
+    """Time every request."""
+    settings.FEEDBACK_SERVER_TIMING_SAMPLE_RATE = 1
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+    """Tests on the Server-Timing breakdown of sampled requests."""
+
+    def test_phases_reported(
+        self, api_client, questionnaire, questionnaire_detail_url, sampled
+    ):
+        """Test a questionnaire retrieval reports every phase and its queries."""
+        url = questionnaire_detail_url(questionnaire.id)
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        metrics = _parse(response["Server-Timing"])
+        assert set(metrics) == {
+            "auth",
+            "permission",
+            "view",
+            "serializer",
+            "render",
+            "db",
+            "total",
+        }
+        assert re.fullmatch(r"[1-9]\d* queries", metrics["db"][1])
+        assert metrics["total"][0] >= sum(
+            duration for name, (duration, _) in metrics.items() if name != "total"
+        )
+
+    def test_cached_retrieval_skips_serializer(
+        self, api_client, questionnaire, questionnaire_detail_url, sampled
+    ):
+        """Test cached questionnaires report no serialization."""
+        url = questionnaire_detail_url(questionnaire.id)
+        api_client.get(url)
+
+        response = api_client.get(url)
+
+        assert "serializer" not in _parse(response["Server-Timing"])
+
+    def test_timings_logged(self, api_client, sales_manager, sampled, caplog):
+        """Test sampled requests log their timings."""
+        api_client.force_authenticate(user=sales_manager)
+
+        with caplog.at_level(logging.INFO, logger="feedback.middleware"):
+            response = api_client.get(CLIENTS_URL)
+
+        (record,) = caplog.records
+        assert record.view == "feedback:client-list"
+        assert record.status == status.HTTP_200_OK
+        assert record.queries == int(
+            _parse(response["Server-Timing"])["db"][1].split()[0]
+        )
+        assert set(record.timings) >= {"auth", "permission", "db", "total"}
+
+    def test_unsampled_requests_untouched(
+        self, api_client, sales_manager, settings, caplog
+    ):
+        """Test requests outside the sample have no header and no log line."""
+        settings.FEEDBACK_SERVER_TIMING_SAMPLE_RATE = 0
+        api_client.force_authenticate(user=sales_manager)
+
+        with caplog.at_level(logging.INFO, logger="feedback.middleware"):
+            response = api_client.get(CLIENTS_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Server-Timing" not in response
+        assert caplog.records == []
+
+
+@pytest.mark.django_db
+class TestRequestTimer:
+    """Tests on attributing time to phases."""
+
+    def test_phases_exclude_nested_phases_and_queries(self):
+        """Test a phase's time excludes the phases and queries inside it."""
+        timer = RequestTimer()
+
+        def slow_query(execute, sql, params, many, context):
+            time.sleep(0.02)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(timer), connection.execute_wrapper(slow_query):
+            with timer.phase("view"):
+                time.sleep(0.02)
+                with timer.phase("serializer"):
+                    time.sleep(0.02)
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+
+        timings = timer.get_timings()
+        assert timer.queries == 1
+        assert 20 <= timings["view"] < 35
+        assert 20 <= timings["serializer"] < 35
+        assert timings["db"] >= 20
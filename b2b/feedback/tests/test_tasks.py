@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from feedback.models import Client, Questionnaire, Response
+from feedback.tasks import send_reminder_emails, send_response_alert_email
+from model_bakery import baker
+from rest_framework import status
+
+
+@pytest.mark.django_db
+class TestSendReminderEmails:
+    """Tests on the questionnaire reminder task."""
+
+    def _make_questionnaire(self, client_rep, days, **kwargs):
+        due_at = timezone.now() + timedelta(days=days)
+        return baker.make(Questionnaire, client_rep=client_rep, due_at=due_at, **kwargs)
+
+    def test_reminders_sent_for_unanswered_due_questionnaires(self, client_rep):
+        """Test clients of the rep are reminded of unanswered questionnaires."""
+        baker.make(Client, client_rep=client_rep, email="a@example.com")
+        baker.make(Client, client_rep=client_rep, email="b@example.com")
+        baker.make(Client, email="other@example.com")
+        questionnaire = self._make_questionnaire(client_rep, days=2)
+
+        send_reminder_emails()
+
+        assert len(mail.outbox) == 1
+        assert sorted(mail.outbox[0].to) == ["a@example.com", "b@example.com"]
+        assert questionnaire.title in mail.outbox[0].body
+
+    def test_no_reminders_for_skipped_questionnaires(self, client_rep):
+        """Test answered, inactive, overdue and later questionnaires are skipped."""
+        baker.make(Client, client_rep=client_rep)
+        answered = self._make_questionnaire(client_rep, days=1)
+        baker.make(Response, questionnaire=answered)
+        self._make_questionnaire(client_rep, days=1, is_active=False)
+        self._make_questionnaire(client_rep, days=-1)
+        self._make_questionnaire(client_rep, days=5)
+        self._make_questionnaire(None, days=1)
+
+        send_reminder_emails()
+
+        assert len(mail.outbox) == 0
+
+    def test_reminder_query_count_is_constant(self, client_rep, settings):
+        """Test the task runs a fixed number of queries per chunk."""
+        settings.FEEDBACK_REMINDER_CHUNK_SIZE = 100
+        baker.make(Client, client_rep=client_rep)
+        query_counts = []
+
+        for size in (1, 20):
+            Questionnaire.objects.all().delete()
+            for _ in range(size):
+                self._make_questionnaire(client_rep, days=1)
+
+            with CaptureQueriesContext(connection) as queries:
+                send_reminder_emails()
+
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+
+@pytest.mark.django_db
+class TestSendResponseAlertEmail:
+    """Tests on the response alert email task."""
+
+    def test_alert_sent_to_author(self, sales_manager):
+        """Test the alert is sent to the questionnaire author."""
+        questionnaire = baker.make(Questionnaire, author=sales_manager)
+
+        send_response_alert_email(questionnaire.id, "Respondent")
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [sales_manager.email]
+        assert mail.outbox[0].from_email == settings.DEFAULT_FROM_EMAIL
+        assert "Respondent" in mail.outbox[0].body
+
+    def test_alert_counts_batched_responses(self, sales_manager):
+        """Test batched alerts mention the number of responses."""
+        questionnaire = baker.make(Questionnaire, author=sales_manager)
+
+        send_response_alert_email(questionnaire.id, "Respondent", 3)
+
+        assert len(mail.outbox) == 1
+        assert "3 responses from Respondent" in mail.outbox[0].body
+
+    def test_no_alert_without_author(self):
+        """Test no alert is sent for questionnaires without an author."""
+        questionnaire = baker.make(Questionnaire, author=None)
+
+        send_response_alert_email(questionnaire.id, "Respondent")
+
+        assert len(mail.outbox) == 0
+
+    def test_alert_queued_after_commit(
+        self,
+        api_client,
+        client_rep,
+        django_capture_on_commit_callbacks,
+        response_list_url,
+        response_payload,
+    ):
+        """Test the alert is only queued once the response is committed."""
+        api_client.force_authenticate(user=client_rep)
+        questionnaire = Questionnaire.objects.get(client_rep=client_rep)
+        url = response_list_url(questionnaire.id)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = api_client.post(url, response_payload, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(mail.outbox) == 0
+        assert len(callbacks) == 1
+
+        callbacks[0]()
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [questionnaire.author.email]
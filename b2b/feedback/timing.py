@@ -0,0 +1,106 @@
+"""Per request timing breakdown for the ``Server-Timing`` header.
+
+``ServerTimingMiddleware`` attaches a ``RequestTimer`` to sampled requests.
+The timer also wraps database execution, so each phase it records excludes
+the database time and the nested phases spent inside it, and the database
+time is reported as a phase of its own.
+"""
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+SERVER_TIMING_DESCRIPTIONS = {
+    "auth": "Authentication",
+    "permission": "Permission checks",
+    "view": "View code",
+    "serializer": "Serialization",
+    "render": "Rendering",
+    "total": "Total",
+}
+
+
+class RequestTimer:
+    """Accumulate the time a request spends in each phase and in the database."""
+
+    def __init__(self):
+        """Start timing the request."""
+        self.started = time.perf_counter()
+        self.durations: dict = {}
+        self.db_time = 0.0
+        self.queries = 0
+        # Open phases as [name, start, db time at start, nested phase time]
+        self._open: list = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """Time and count a query as a database execute wrapper."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    def start(self, name):
+        """Open a phase, nested in the currently open one."""
+        self._open.append([name, time.perf_counter(), self.db_time, 0.0])
+
+    def stop(self):
+        """Close the innermost phase and add its own time to its duration."""
+        name, start, db_time, nested = self._open.pop()
+        elapsed = time.perf_counter() - start - (self.db_time - db_time)
+        self.durations[name] = self.durations.get(name, 0.0) + elapsed - nested
+        if self._open:
+            self._open[-1][3] += elapsed
+
+    @contextmanager
+    def phase(self, name):
+        """Time the wrapped block as the named phase."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def wrap(self, name, func):
+        """Return func timed as the named phase."""
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def get_timings(self):
+        """Return the phase durations and total in milliseconds."""
+        timings = {name: seconds * 1000 for name, seconds in self.durations.items()}
+        timings["db"] = self.db_time * 1000
+        timings["total"] = (time.perf_counter() - self.started) * 1000
+        return timings
+
+    def get_header(self, timings):
+        """Return the ``Server-Timing`` header value of the timings."""
+        metrics = []
+        for name, duration in timings.items():
+            if name == "db":
+                desc = f"{self.queries} queries"
+            else:
+                desc = SERVER_TIMING_DESCRIPTIONS.get(name, name)
+            metrics.append(f'{name};dur={duration:.2f};desc="{desc}"')
+        return ", ".join(metrics)
+
+
+def get_request_timer(request):
+    """Return the timer of a sampled request, or None."""
+    return getattr(request, "_server_timer", None)
+
+
+@contextmanager
+def timed(request, name):
+    """Time the wrapped block as a phase of the request if it is sampled."""
+    timer = get_request_timer(request)
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
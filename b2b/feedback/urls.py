@@ -1,6 +1,8 @@
 """Feedback app url configuration."""
+from django.conf import settings
 from rest_framework_nested.routers import DefaultRouter, NestedDefaultRouter
 
+from .async_views import as_async_urlpatterns
 from .views import (
     ClientViewSet,
     MonthlyFeedbackViewSet,
@@ -24,3 +26,6 @@ questionnaires_router.register(
 app_name = "feedback"
 
 urlpatterns = router.urls + questionnaires_router.urls
+
+if settings.FEEDBACK_ASYNC_VIEWS:
+    urlpatterns = as_async_urlpatterns(urlpatterns)
@@ -1,15 +1,40 @@
 """Views for the feedback app."""
+import csv
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
     RetrieveModelMixin,
 )
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response as DRFResponse
 from rest_framework.viewsets import GenericViewSet
 
-from .email import ResponseAlertEmail
+from .async_views import AsyncReadMixin
+from .cache import (
+    acache_questionnaire,
+    aget_cached_questionnaire,
+    aget_questionnaire_version,
+    cache_questionnaire,
+    get_cached_questionnaire,
+    get_questionnaire_etag,
+    get_questionnaire_version,
+)
+from .export import EXPORTERS
+from .imports import import_clients, iter_rows
 from .models import Client, MonthlyFeedback, Questionnaire, Response
 from .pagination import (
     ClientPagination,
@@ -22,18 +47,162 @@ from .permissions import (
     IsSalesManager,
     IsSalesManagerOrClientRep,
 )
+from .renderers import CSVRenderer, NDJSONRenderer
+from .results import get_questionnaire_results
+from .routers import get_read_database, read_from
+from .schema import get_questionnaire_schema
 from .serializers import (
     ClientSerializer,
     MonthlyFeedbackSerializer,
     QuestionnaireListSerializer,
     QuestionnaireSerializer,
     ResponseSerializer,
+    create_responses,
+    get_questions_prefetch,
 )
+from .tasks import send_response_alert_email
+from .timing import get_request_timer, timed
+from .validators import validate_month_format
 
 User = get_user_model()
 
 
+class ServerTimingMixin:
+    """Time the authentication, permission, view, serializer and render phases.
+
+    Phases are only timed on requests sampled by ``ServerTimingMiddleware``.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Time the view and the rendering of its response."""
+        timer = get_request_timer(request)
+        if timer is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        with timer.phase("view"):
+            response = super().dispatch(request, *args, **kwargs)
+        return self._time_rendering(timer, response)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Time the async view and the rendering of its response."""
+        timer = get_request_timer(request)
+        if timer is None:
+            return await super().adispatch(request, *args, **kwargs)
+
+        with timer.phase("view"):
+            response = await super().adispatch(request, *args, **kwargs)
+        return self._time_rendering(timer, response)
+
+    def _time_rendering(self, timer, response):
+        if hasattr(response, "add_post_render_callback") and not response.is_rendered:
+            timer.start("render")
+            response.add_post_render_callback(lambda response: timer.stop())
+        return response
+
+    def perform_authentication(self, request):
+        """Time authenticating the request."""
+        with timed(request, "auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        """Time the permission checks."""
+        with timed(request, "permission"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        """Time the object permission checks."""
+        with timed(request, "permission"):
+            super().check_object_permissions(request, obj)
+
+    def get_serializer(self, *args, **kwargs):
+        """Time the serializer's representation of the data."""
+        serializer = super().get_serializer(*args, **kwargs)
+        timer = get_request_timer(self.request)
+        if timer is not None:
+            serializer.to_representation = timer.wrap(
+                "serializer", serializer.to_representation
+            )
+        return serializer
+
+
+class SparseFieldsetMixin:
+    """Serialize and load only the fields named in the ``fields`` query parameter.
+
+    Reads by ``sparse_actions`` without the parameter serialize every field.
+    Either way only the columns behind the serialized fields are loaded, and
+    nested fields are prefetched with their ``sparse_prefetches`` lookup, or
+    the ``Prefetch`` its callable returns, only when they are serialized.
+    """
+
+    fields_query_param = "fields"
+    sparse_actions = ("list", "retrieve")
+    sparse_prefetches: dict = {}
+
+    def _get_serializer_fields(self):
+        serializer_class = self.get_serializer_class()
+        return serializer_class(context=self.get_serializer_context()).fields
+
+    def _get_ordering_fields(self):
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return {field.lstrip("-") for field in ordering}
+
+    def get_sparse_fields(self):
+        """Return the requested serializer field names, or None for all of them."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = None
+            param = self.request.query_params.get(self.fields_query_param)
+            if self.action in self.sparse_actions and param is not None:
+                requested = {name.strip() for name in param.split(",")} - {""}
+                available = list(self._get_serializer_fields())
+                unknown = requested.difference(available)
+                if not requested or unknown:
+                    raise ValidationError(
+                        {
+                            self.fields_query_param: [
+                                "Choose from: {}.".format(", ".join(available))
+                            ]
+                        }
+                    )
+                self._sparse_fields = [name for name in available if name in requested]
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        """Limit the serializer to the requested fields."""
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """Only load the columns and relations of the serialized fields."""
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions:
+            return queryset
+
+        serializer_fields = self._get_serializer_fields()
+        model = queryset.model
+        columns = {model._meta.pk.name, *self._get_ordering_fields()}
+        for name in self.get_sparse_fields() or serializer_fields:
+            if name in self.sparse_prefetches:
+                lookup = self.sparse_prefetches[name]
+                queryset = queryset.prefetch_related(
+                    lookup() if callable(lookup) else lookup
+                )
+                continue
+            try:
+                model_field = model._meta.get_field(serializer_fields[name].source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete:
+                columns.add(model_field.name)
+        return queryset.only(*columns)
+
+
 class ClientViewSet(
+    ServerTimingMixin,
+    SparseFieldsetMixin,
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
@@ -45,6 +214,7 @@ class ClientViewSet(
     serializer_class = ClientSerializer
     pagination_class = ClientPagination
     permission_classes = [IsSalesManager]
+    query_budgets = {"list": 4, "create": 3, "destroy": 4, "bulk_import": 6}
 
     def get_queryset(self):
         """Return queryset of only clients the current user is a sales manager of."""
@@ -57,8 +227,44 @@ class ClientViewSet(
         """Assign current user as the manager on client creation."""
         serializer.save(sales_manager=self.request.user)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=[MultiPartParser],
+    )
+    def bulk_import(self, request):
+        """Import clients from an uploaded CSV or NDJSON file."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+
+        try:
+            with transaction.atomic():
+                report = import_clients(
+                    iter_rows(upload),
+                    request.user,
+                    settings.FEEDBACK_CLIENT_IMPORT_BATCH_SIZE,
+                    settings.FEEDBACK_CLIENT_IMPORT_MAX_ERRORS,
+                )
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError(
+                {"file": ["Upload a UTF-8 encoded CSV or NDJSON file."]}
+            )
+
+        return DRFResponse(
+            report,
+            status=status.HTTP_201_CREATED
+            if report["created"]
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
 
 class QuestionnaireViewSet(
+    ServerTimingMixin,
+    AsyncReadMixin,
+    SparseFieldsetMixin,
     CreateModelMixin,
     RetrieveModelMixin,
     ListModelMixin,
@@ -66,13 +272,12 @@ class QuestionnaireViewSet(
 ):
     """The questionnaire viewset."""
 
-    queryset = (
-        Questionnaire.objects.prefetch_related("questions__choices")
-        .all()
-        .order_by("-created_at")
-    )
+    queryset = Questionnaire.objects.all().order_by("-created_at")
     pagination_class = QuestionnairePagination
     serializer_class = QuestionnaireSerializer
+    sparse_prefetches = {"questions": get_questions_prefetch}
+    query_budgets = {"list": 4, "create": 10, "retrieve": 6, "results": 5}
+    async_actions = ("list", "retrieve")
 
     def _fetch_params(self):
         query_params = self.request.query_params
@@ -83,16 +288,20 @@ class QuestionnaireViewSet(
     def get_queryset(self):
         """Filter queryset with params."""
         user = self.request.user
+        queryset = self.queryset
+        if self.action == "results":
+            queryset = queryset.prefetch_related(get_questions_prefetch())
+
         client_rep, sales_manager = self._fetch_params()
         if client_rep:
-            return self.queryset.filter(client_rep=user)
+            return queryset.filter(client_rep=user)
         elif sales_manager:
-            return self.queryset.filter(author=user)
-        return self.queryset
+            return queryset.filter(author=user)
+        return queryset
 
     def get_permissions(self):
         """Return appropriate permissions."""
-        if self.request.method in SAFE_METHODS:
+        if self.request.method in SAFE_METHODS and self.action != "results":
             return [IsSalesManagerOrClientRep()]
         return [IsSalesManager()]
 
@@ -102,12 +311,92 @@ class QuestionnaireViewSet(
             return QuestionnaireListSerializer
         return QuestionnaireSerializer
 
+    def _get_etag_headers(self, questionnaire_id, version):
+        """Return the field variant and ETag headers of a questionnaire version."""
+        variant = "+".join(self.get_sparse_fields() or ())
+        etag = get_questionnaire_etag(questionnaire_id, version, variant)
+        return variant, {"ETag": etag}
+
+    def _is_not_modified(self, headers):
+        if_none_match = parse_etags(self.request.headers.get("If-None-Match", ""))
+        return headers["ETag"] in if_none_match or "*" in if_none_match
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the cached questionnaire, or 304 if the client's copy is current."""
+        questionnaire_id = get_object_or_404(
+            self.get_queryset().values_list("pk", flat=True), pk=kwargs["pk"]
+        )
+        version = get_questionnaire_version(questionnaire_id)
+        variant, headers = self._get_etag_headers(questionnaire_id, version)
+        if self._is_not_modified(headers):
+            return DRFResponse(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = get_cached_questionnaire(questionnaire_id, version, variant)
+        if data is None:
+            # A lagging replica would cache its stale copy under the new version
+            with read_from(None):
+                data = self.get_serializer(self.get_object()).data
+            cache_questionnaire(
+                questionnaire_id,
+                version,
+                variant,
+                data,
+                settings.FEEDBACK_QUESTIONNAIRE_CACHE_TIMEOUT,
+            )
+        return DRFResponse(data, headers=headers)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """Retrieve the questionnaire like ``retrieve``, without blocking."""
+        try:
+            questionnaire_id = await (
+                self.get_queryset()
+                .values_list("pk", flat=True)
+                .filter(pk=kwargs["pk"])
+                .afirst()
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            questionnaire_id = None
+        if questionnaire_id is None:
+            raise Http404()
+
+        version = await aget_questionnaire_version(questionnaire_id)
+        variant, headers = self._get_etag_headers(questionnaire_id, version)
+        if self._is_not_modified(headers):
+            return DRFResponse(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = await aget_cached_questionnaire(questionnaire_id, version, variant)
+        if data is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            with read_from(None):
+                try:
+                    questionnaire = await queryset.aget(pk=questionnaire_id)
+                except Questionnaire.DoesNotExist:
+                    raise Http404()
+                self.check_object_permissions(request, questionnaire)
+                data = self.get_serializer(questionnaire).data
+            await acache_questionnaire(
+                questionnaire_id,
+                version,
+                variant,
+                data,
+                settings.FEEDBACK_QUESTIONNAIRE_CACHE_TIMEOUT,
+            )
+        return DRFResponse(data, headers=headers)
+
     def perform_create(self, serializer):
         """Set current user as questionnaire author."""
         serializer.save(author=self.request.user)
 
+    @action(detail=True)
+    def results(self, request, pk=None):
+        """Return aggregated per question results of the questionnaire."""
+        return DRFResponse(get_questionnaire_results(self.get_object()))
+
 
 class ResponseViewSet(
+    ServerTimingMixin,
+    AsyncReadMixin,
+    SparseFieldsetMixin,
     CreateModelMixin,
     ListModelMixin,
     GenericViewSet,
@@ -117,6 +406,9 @@ class ResponseViewSet(
     queryset = Response.objects.all()
     serializer_class = ResponseSerializer
     pagination_class = ResponsePagination
+    sparse_prefetches = {"answers": "answers__choices"}
+    query_budgets = {"list": 6, "create": 15, "bulk": 13, "export": 7}
+    async_actions = ("list",)
 
     def get_queryset(self):
         """Filter responses with questionnaire id in url."""
@@ -137,23 +429,91 @@ class ResponseViewSet(
             "questionnaire_id": self.kwargs["questionnaire_pk"],
         }
 
+    @action(detail=False, renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, questionnaire_pk=None):
+        """Stream every response of the questionnaire as CSV or NDJSON."""
+        get_object_or_404(Questionnaire, pk=questionnaire_pk)
+        renderer = request.accepted_renderer
+        # Rows stream after the request, so read them from its database
+        rows = EXPORTERS[renderer.format](
+            self.get_queryset().using(get_read_database())
+        )
+        response = StreamingHttpResponse(rows, content_type=renderer.media_type)
+        filename = f"questionnaire-{questionnaire_pk}-responses.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, questionnaire_pk=None):
+        """Create a batch of responses, reporting invalid items without aborting."""
+        items = request.data
+        max_items = settings.FEEDBACK_BULK_RESPONSE_MAX_ITEMS
+        if not isinstance(items, list) or not 0 < len(items) <= max_items:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Expected a list of 1 to {max_items} responses."
+                    ]
+                }
+            )
+
+        schema = get_questionnaire_schema(questionnaire_pk)
+        if schema is None or schema.client_rep_id != request.user.pk:
+            raise Http404()
+        context = {**self.get_serializer_context(), "schema": schema}
+
+        indexes, responses_data, errors = [], [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item, context=context)
+            if not serializer.is_valid():
+                errors.append({"index": index, "errors": serializer.errors})
+                continue
+            indexes.append(index)
+            responses_data.append(
+                {
+                    **serializer.validated_data,
+                    "questionnaire_id": schema.questionnaire_id,
+                    "respondent": request.user,
+                }
+            )
+
+        responses = create_responses(responses_data) if responses_data else []
+        if responses:
+            questionnaire_id = schema.questionnaire_id
+            user = request.user
+            count = len(responses)
+            # One alert for the whole batch once it is committed
+            transaction.on_commit(
+                lambda: send_response_alert_email.delay(
+                    questionnaire_id, user.name, count
+                )
+            )
+
+        created = [
+            {"index": index, "id": response.id}
+            for index, response in zip(indexes, responses)
+        ]
+        return DRFResponse(
+            {"created": created, "errors": errors},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
     def perform_create(self, serializer):
         """Add response relationships."""
         questionnaire_id = self.kwargs["questionnaire_pk"]
         user = self.request.user
-        response = serializer.save(questionnaire_id=questionnaire_id, respondent=user)
-
-        # Send alert to author
-        author = response.questionnaire.author
-        message = ResponseAlertEmail(
-            questionnaire_title=response.questionnaire.title,
-            recipient=author,
-            respondent=user.name,
+        serializer.save(questionnaire_id=questionnaire_id, respondent=user)
+
+        # Alert the author once the response is committed
+        transaction.on_commit(
+            lambda: send_response_alert_email.delay(questionnaire_id, user.name)
         )
-        message.send([author.email])
 
 
 class MonthlyFeedbackViewSet(
+    ServerTimingMixin,
+    AsyncReadMixin,
+    SparseFieldsetMixin,
     CreateModelMixin,
     ListModelMixin,
     GenericViewSet,
@@ -163,6 +523,8 @@ class MonthlyFeedbackViewSet(
     queryset = MonthlyFeedback.objects.all()
     serializer_class = MonthlyFeedbackSerializer
     pagination_class = MonthlyFeedbackPagination
+    query_budgets = {"list": 4, "create": 3}
+    async_actions = ("list",)
 
     def get_permissions(self):
         """Return the appropriate permission."""
@@ -170,14 +532,33 @@ class MonthlyFeedbackViewSet(
             return [IsSalesManager()]
         return [IsClientRepresentative()]
 
+    def _fetch_params(self):
+        query_params = self.request.query_params
+        months = {}
+        for param in ("month_from", "month_to"):
+            month = query_params.get(param)
+            if month is None:
+                continue
+            try:
+                validate_month_format(month)
+            except DjangoValidationError as error:
+                raise ValidationError({param: error.messages})
+            months[param] = month
+        return months.get("month_from"), months.get("month_to")
+
     def get_queryset(self):
         """Filter feedback for the current user."""
-        current_user_clients = Client.objects.select_related(
-            "client_rep", "sales_manager"
-        ).filter(sales_manager=self.request.user)
-        return self.queryset.filter(
-            client_rep__in=[client.client_rep for client in current_user_clients]
-        ).order_by("-month")
+        client_reps = Client.objects.filter(
+            sales_manager=self.request.user, client_rep__isnull=False
+        ).values("client_rep")
+        queryset = self.queryset.filter(client_rep__in=client_reps)
+
+        month_from, month_to = self._fetch_params()
+        if month_from:
+            queryset = queryset.filter(month__gte=month_from)
+        if month_to:
+            queryset = queryset.filter(month__lte=month_to)
+        return queryset.order_by("-month")
 
     def perform_create(self, serializer):
         """Assign current user as the client rep."""
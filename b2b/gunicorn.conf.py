@@ -0,0 +1,23 @@
+"""Gunicorn settings sharing the Prometheus metrics of every worker."""
+import os
+import shutil
+import socket
+
+# Workers write their samples here for /metrics to aggregate, which must be
+# set before prometheus_client is imported
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/b2b-metrics")
+
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    """Empty the metrics directory of the previous run's processes."""
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of an exited worker."""
+    # Sample files are named as in feedback.metrics
+    multiprocess.mark_process_dead(f"{socket.gethostname()}-{worker.pid}")